@@ -0,0 +1,197 @@
+"""
+Regressão e benchmark da desambiguação de municípios (`auxiliar.desambiguacao`).
+Gera um corpus de títulos com municípios simples, compostos e nomes ambíguos em vários contextos,
+confere que `DesambiguadorMunicipios.filtrar` devolve exatamente o mesmo que a implementação
+original (laço sobre MULTI_WORD_MUNICIPIOS e regex recompiladas a cada nome) e mede as duas.
+Os municípios saem na ordem em que aparecem no título (a original os juntava em um set, com a ordem
+variando de um processo para outro); a ordem também é conferida à parte.
+
+Os candidatos de cada título são os nomes da lista de municípios presentes no texto, o que dispensa
+o modelo do spaCy.
+
+Exemplo: python benchmarks/desambiguacao.py -n 20000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from auxiliar.desambiguacao import DesambiguadorMunicipios, normalize_text, pre_process_text_for_municipality_detection
+from auxiliar.municipios import get_municipios_metadata
+
+PALAVRAS_AMBIGUAS = {
+    "saude", "gloria", "vitoria", "esperanca", "nazaré", "america",
+    "campo", "alegre", "formosa", "nova",  "belo", "bonito", "feira", "central",
+    "santana", "wagner", "Wagner"
+}
+
+MODELOS_TITULO = [
+    "Prefeitura de {m} é alvo de operação da PF",
+    "MP investiga fraude em licitação em {m} (BA)",
+    "Ex-prefeito de {m} é condenado por desvio - BA",
+    "{m} prefeitura anuncia auditoria",
+    "Câmara de {m} aprova contas, BA",
+    "Operação apura desvios na saúde de {m} e {m2}",
+    "{m} e {m2} recebem recursos para obras",
+    "Secretário de {a} é afastado",
+    "Feira de {a} movimenta a cidade de {m}",
+    "Glória e vitória: {a} vence campeonato em {m}",
+    "Wagner visita {m} e anuncia obras",
+    "Justiça bloqueia bens em {m}; município de {m2} também é citado",
+]
+
+
+def implementacao_original(potential_municipios_raw, context_text, tabelas):
+    """
+    Filtro de municípios como era antes do desambiguador pré-compilado, com uma única mudança: os nomes
+    aceitos ficam na ordem do título (dicionário) em vez de um set.
+    """
+    MUNICIPIO_LOOKUP, NORMALIZED_MUNICIPIO_NAMES, MULTI_WORD_MUNICIPIOS = tabelas
+
+    def is_geographical_context(name, text):
+        if not isinstance(name, str) or not isinstance(text, str):
+            return False
+        processed_text = pre_process_text_for_municipality_detection(text)
+        normalized_name_escaped = re.escape(normalize_text(name))
+        padroes_geograficos = [
+            rf"\b(prefeitura|município|cidade|câmara)\s+(?:de|do|da|d[oa]s?)\s+{normalized_name_escaped}\b",
+            rf"\b(?:em|na|no|de|do|da|para|às?)\s+{normalized_name_escaped}\b",
+            rf"\b{normalized_name_escaped}\s+(?:prefeitura|município|cidade)\b"
+        ]
+        for pattern in padroes_geograficos:
+            if re.search(pattern, processed_text, re.IGNORECASE):
+                return True
+        return False
+
+    def should_ignore_municipality(name, text):
+        if not isinstance(name, str):
+            return True
+        normalized_name = normalize_text(name)
+        if normalized_name == 'bahia':
+            return True
+        if normalized_name in PALAVRAS_AMBIGUAS:
+            return not is_geographical_context(name, text)
+        return False
+
+    potential_normalized_set = {normalize_text(name) for name in potential_municipios_raw if isinstance(name, str)}
+    filtered_municipios_normalized = {}
+    for nome_raw in potential_municipios_raw:
+        if not isinstance(nome_raw, str) or not nome_raw.strip():
+            continue
+        normalized_name = normalize_text(nome_raw)
+        if normalized_name in NORMALIZED_MUNICIPIO_NAMES and normalized_name != 'bahia':
+            if not should_ignore_municipality(nome_raw, context_text):
+                is_component_of_detected_multi_word = False
+                for multi_word_normalized, components_normalized in MULTI_WORD_MUNICIPIOS.items():
+                    if normalized_name in components_normalized:
+                        if multi_word_normalized in potential_normalized_set:
+                            is_component_of_detected_multi_word = True
+                            break
+                if not is_component_of_detected_multi_word:
+                    filtered_municipios_normalized[normalized_name] = None
+
+    mapped_list = []
+    for normalized_filtered_name in filtered_municipios_normalized:
+        if normalized_filtered_name in MUNICIPIO_LOOKUP:
+            mapped_list.append(MUNICIPIO_LOOKUP[normalized_filtered_name])
+    return list(dict.fromkeys(mapped_list))
+
+
+def na_ordem_do_titulo(candidatos, municipios_filtrados):
+    """Se os municípios ("Nome-Codigo") estão na ordem da primeira ocorrência do nome entre os candidatos."""
+    posicoes = {}
+    for posicao, nome in enumerate(candidatos):
+        posicoes.setdefault(normalize_text(nome), posicao)
+    ordem = [posicoes[normalize_text(municipio.rsplit('-', 1)[0])] for municipio in municipios_filtrados]
+    return ordem == sorted(ordem)
+
+
+def conferir_ordem(desambiguador, corpus, novos):
+    """Encerra com erro se algum resultado não estiver na ordem do título."""
+    contexto = "prefeituras de salvador e ilheus"
+    direta = desambiguador.filtrar(['Salvador', 'Ilhéus'], contexto)
+    inversa = desambiguador.filtrar(['Ilhéus', 'Salvador'], contexto)
+    if len(direta) != 2 or direta != inversa[::-1]:
+        print(f"Ordem dos municípios não segue o título: {direta} / {inversa}")
+        sys.exit(1)
+    fora_de_ordem = [i for i, resultado in enumerate(novos) if not na_ordem_do_titulo(corpus[i][0], resultado)]
+    if fora_de_ordem:
+        i = fora_de_ordem[0]
+        print(f"{len(fora_de_ordem)} resultados fora da ordem do título. Primeiro: {corpus[i]} -> {novos[i]}")
+        sys.exit(1)
+
+
+def tabelas_originais(municipios):
+    municipio_lookup = {normalize_text(nome): f"{nome}-{codigo}" for nome, codigo in municipios.items()}
+    nomes = set(municipio_lookup)
+    multi_word = {}
+    for nome in municipios:
+        if ' ' in nome:
+            normalized_name = normalize_text(nome)
+            for comp in normalized_name.split():
+                if comp in nomes:
+                    multi_word.setdefault(normalized_name, [])
+                    if comp not in multi_word[normalized_name]:
+                        multi_word[normalized_name].append(comp)
+    return municipio_lookup, nomes, multi_word
+
+
+def gerar_corpus(municipios, quantidade, semente=0):
+    """Gera (candidatos, contexto) para títulos sintéticos."""
+    aleatorio = random.Random(semente)
+    nomes = list(municipios)
+    ambiguos = ['Santana', 'Glória', 'Vitória', 'Saúde', 'Central', 'Bonito', 'Wagner', 'Nova', 'Feira']
+    padrao_nomes = re.compile(
+        r"\b(" + "|".join(re.escape(n) for n in sorted(nomes, key=len, reverse=True)) + r")\b", re.IGNORECASE
+    )
+    corpus = []
+    for _ in range(quantidade):
+        titulo = aleatorio.choice(MODELOS_TITULO).format(
+            m=aleatorio.choice(nomes), m2=aleatorio.choice(nomes), a=aleatorio.choice(ambiguos)
+        )
+        processado = pre_process_text_for_municipality_detection(titulo)
+        candidatos = padrao_nomes.findall(processado)
+        # Inclui também os componentes dos compostos, como o PhraseMatcher faz
+        for nome in list(candidatos):
+            candidatos.extend(parte for parte in nome.split() if parte in municipios)
+        corpus.append((candidatos, processado))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regressão e benchmark da desambiguação de municípios.")
+    parser.add_argument("-n", "--titulos", type=int, default=20_000, help="Quantidade de títulos sintéticos (padrão: 20000).")
+    args = parser.parse_args()
+
+    municipios = get_municipios_metadata()
+    corpus = gerar_corpus(municipios, args.titulos)
+    tabelas = tabelas_originais(municipios)
+    desambiguador = DesambiguadorMunicipios(municipios, PALAVRAS_AMBIGUAS)
+
+    inicio = time.perf_counter()
+    originais = [implementacao_original(candidatos, contexto, tabelas) for candidatos, contexto in corpus]
+    tempo_original = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    novos = [desambiguador.filtrar(candidatos, contexto) for candidatos, contexto in corpus]
+    tempo_novo = time.perf_counter() - inicio
+
+    divergencias = [i for i, (a, b) in enumerate(zip(originais, novos)) if a != b]
+    if divergencias:
+        i = divergencias[0]
+        print(f"{len(divergencias)} divergências. Primeira: {corpus[i]} -> {originais[i]} != {novos[i]}")
+        sys.exit(1)
+    conferir_ordem(desambiguador, corpus, novos)
+
+    print(f"{args.titulos} títulos: resultados idênticos, na ordem do título "
+          f"({sum(1 for r in novos if r)} com município detectado).")
+    print(f"original:       {tempo_original / args.titulos * 1e6:8.1f} µs por título")
+    print(f"pré-compilado:  {tempo_novo / args.titulos * 1e6:8.1f} µs por título")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark do agrupamento de quase duplicatas (`auxiliar.duplicatas`).
+Gera um corpus sintético em que cada matéria é republicada algumas vezes com pequenas variações
+(uma palavra trocada no trecho, às vezes com o fim cortado), mede o tempo por notícia em tamanhos
+crescentes (deve ficar estável, ou seja, custo linear) e confere os grupos encontrados com os reais.
+
+Exemplo: python benchmarks/duplicatas.py --tamanhos 10000 50000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from auxiliar.duplicatas import AgrupadorDuplicatas
+
+PALAVRAS = (
+    "prefeitura operação fraude licitação desvio recursos contratos ministério público polícia federal "
+    "ex-prefeito vereadores secretaria saúde educação merenda escolar obras pavimentação empresa investigação "
+    "mandados busca apreensão superfaturamento convênio fundeb câmara municipal denúncia tribunal contas "
+    "município bahia servidores afastados justiça bloqueio bens milhões reais esquema organização criminosa"
+).split()
+MUNICIPIOS = ("Feira de Santana", "Ilhéus", "Juazeiro", "Barreiras", "Jequié", "Alagoinhas", "Porto Seguro", "Irecê")
+FONTES = ("G1", "A Tarde", "Bahia Notícias", "Correio", "Metro1", "BNews")
+
+
+def gerar_corpus(quantidade, copias=3, semente=0):
+    """Lista de (grupo_real, notícia) com `quantidade` notícias, cerca de `copias` por matéria."""
+    aleatorio = random.Random(semente)
+    corpus = []
+    grupo = 0
+    while len(corpus) < quantidade:
+        municipio = aleatorio.choice(MUNICIPIOS)
+        titulo = " ".join(aleatorio.choices(PALAVRAS, k=10)) + f" em {municipio}"
+        conteudo = " ".join(aleatorio.choices(PALAVRAS, k=25))
+        for copia in range(aleatorio.randint(1, 2 * copias - 1)):
+            fonte = aleatorio.choice(FONTES)
+            palavras = conteudo.split()
+            if copia:
+                # Republicação: troca uma palavra e às vezes corta o fim do trecho
+                palavras[aleatorio.randrange(len(palavras))] = aleatorio.choice(PALAVRAS)
+                if aleatorio.random() < 0.3:
+                    palavras = palavras[:-2]
+            corpus.append((grupo, {
+                'titulo': titulo,
+                'conteudo': " ".join(palavras),
+                'fonte': fonte,
+                'link': f"https://{fonte.lower().replace(' ', '')}.com.br/noticia/{grupo}/{copia}",
+            }))
+        grupo += 1
+    return corpus[:quantidade]
+
+
+def medir(corpus):
+    agrupador = AgrupadorDuplicatas()
+    inicio = time.perf_counter()
+    atribuidos = [agrupador.agrupar(noticia)[0] for _, noticia in corpus]
+    tempo = time.perf_counter() - inicio
+
+    # Matérias divididas em mais de um grupo e grupos que misturam matérias diferentes
+    reais, encontrados = {}, {}
+    for (grupo, _), cluster_id in zip(corpus, atribuidos):
+        reais.setdefault(grupo, set()).add(cluster_id)
+        encontrados.setdefault(cluster_id, set()).add(grupo)
+    divididos = sum(1 for clusters in reais.values() if len(clusters) > 1)
+    misturados = sum(1 for grupos in encontrados.values() if len(grupos) > 1)
+    return tempo, len(encontrados), len(reais), divididos, misturados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o agrupamento de quase duplicatas em corpora sintéticos.")
+    parser.add_argument("--tamanhos", type=int, nargs='+', default=[10000, 50000, 100000],
+                        help="Quantidades de notícias a testar (padrão: 10000 50000 100000).")
+    args = parser.parse_args()
+
+    for quantidade in args.tamanhos:
+        corpus = gerar_corpus(quantidade)
+        tempo, grupos, grupos_reais, divididos, misturados = medir(corpus)
+        print(
+            f"{quantidade:>8} notícias: {tempo:7.2f}s ({tempo / quantidade * 1e6:6.1f} µs/notícia), "
+            f"{grupos} grupos (reais: {grupos_reais}; matérias divididas: {divididos}, grupos misturados: {misturados})"
+        )
+
+
+if __name__ == "__main__":
+    main()
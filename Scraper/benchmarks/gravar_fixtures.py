@@ -0,0 +1,151 @@
+"""
+Grava o corpus usado por `benchmarks/suite.py` em `benchmarks/fixtures/`:
+
+- `termos.txt`: os termos do corpus, um por linha;
+- `paginas/<termo>.html`: uma página de resultados do Google News por termo (mesmo nome usado pelo
+  backend 'arquivos', ver `coletores.nome_arquivo_termo`);
+- `titulos.txt`: manchetes avulsas, uma por linha, para as etapas de identificação dos municípios.
+
+Com `--cache <diretório>`, as páginas vêm de buscas reais guardadas pelo `--cache` do main.py (as
+páginas de `--termos` que estiverem no cache). Sem ele, são geradas páginas sintéticas, com a
+marcação da busca do Google News (ver `parsers_html.py`) e manchetes no estilo das notícias
+monitoradas. Depois de trocar o corpus, grave uma nova linha de base com
+`python benchmarks/suite.py --gravar-linha-base`.
+
+Exemplo: python benchmarks/gravar_fixtures.py --cache cache_paginas --termos src/termos_pesquisa/termos_para_pesquisa_ilicitos.txt
+"""
+import argparse
+import html
+import os
+import random
+import shutil
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+from auxiliar.coletores import montar_url_busca, nome_arquivo_termo, root_url
+from auxiliar.municipios import carregar_municipios
+from parsers_html import MODELO_ITEM, MODELO_ITEM_SIMPLES
+
+DIRETORIO_FIXTURES = os.path.join(RAIZ, 'benchmarks', 'fixtures')
+
+TERMOS = [
+    "Desvio de Recursos Bahia",
+    "Lavagem de Dinheiro Bahia",
+    "Peculato Bahia",
+    "Operação Polícia Federal Bahia",
+    "Superfaturamento Contratos Bahia",
+    "Auditoria TCM Bahia",
+]
+
+MANCHETES = [
+    "Prefeitura de {m} é alvo de operação da PF contra fraude em licitação",
+    "MP-BA investiga desvio de recursos da saúde em {m}",
+    "Ex-prefeito de {m} (BA) é condenado por improbidade administrativa",
+    "TCM rejeita contas da Câmara de {m} e aplica multa ao presidente",
+    "Operação prende servidores em {m} e {m2} por superfaturamento de merenda",
+    "Polícia Federal cumpre mandados em {m} - BA; contratos somam R$ {valor} milhões",
+    "{m}: vereadores são investigados por peculato",
+    "Justiça bloqueia bens do prefeito de {m} por fraude no transporte escolar",
+    "Festa de São João em {m} tem contratos de shows questionados",
+    "Lavagem de dinheiro: empresários de {m} e {m2} são denunciados",
+    "Governo da Bahia anuncia obras em {m}",
+    "Feira livre de {m} é interditada pela vigilância sanitária",
+    "Nova escola em {m} recebe investimento de R$ {valor} milhões",
+]
+CONTEUDOS = [
+    "Segundo o Ministério Público, o esquema movimentou R$ {valor} milhões entre 2021 e 2024.",
+    "A prefeitura informou que colabora com as investigações.",
+    "Os mandados foram expedidos pela Justiça Federal em Salvador.",
+    "Conteúdo não encontrado",
+]
+FONTES = ['G1', 'A Tarde', 'Bahia Notícias', 'Correio', 'Metro1', 'BNews', 'TV Bahia']
+
+
+def gerar_manchete(aleatorio, nomes):
+    modelo = aleatorio.choice(MANCHETES)
+    return modelo.format(m=aleatorio.choice(nomes), m2=aleatorio.choice(nomes), valor=aleatorio.randint(1, 90))
+
+
+def gerar_pagina(aleatorio, nomes, quantidade):
+    partes = ['<html><head><script>var dados = "<article>não é notícia</article>";</script></head><body><main>']
+    for i in range(quantidade):
+        identificador = f"{aleatorio.getrandbits(48):012x}"
+        modelo = MODELO_ITEM if aleatorio.random() < 0.85 else MODELO_ITEM_SIMPLES
+        ano = aleatorio.choice((2021, 2022, 2023, 2024, 2024, 2025, 2025))
+        partes.append(modelo.format(
+            i=identificador,
+            titulo=html.escape(gerar_manchete(aleatorio, nomes)),
+            conteudo=html.escape(aleatorio.choice(CONTEUDOS).format(valor=aleatorio.randint(1, 90))),
+            fonte=html.escape(aleatorio.choice(FONTES)),
+            data=f"{ano}-{aleatorio.randint(1, 12):02d}-{aleatorio.randint(1, 28):02d}T12:00:00Z",
+        ))
+    partes.append('</main></body></html>')
+    return "".join(partes)
+
+
+def gravar_sinteticas(destino, itens_por_pagina, quantidade_titulos, semente):
+    aleatorio = random.Random(semente)
+    # Municípios com nomes ambíguos aparecem mais, para exercitar a desambiguação
+    nomes = [municipio.nome for municipio in carregar_municipios(ufs={'BA'})]
+    nomes += ['Feira de Santana', 'Santana', 'Glória', 'Central', 'Wagner', 'Salvador', 'Riacho de Santana'] * 10
+
+    paginas = os.path.join(destino, 'paginas')
+    for termo in TERMOS:
+        with open(os.path.join(paginas, nome_arquivo_termo(termo) + '.html'), 'w', encoding='utf-8') as f:
+            f.write(gerar_pagina(aleatorio, nomes, itens_por_pagina))
+    with open(os.path.join(destino, 'titulos.txt'), 'w', encoding='utf-8') as f:
+        f.writelines(gerar_manchete(aleatorio, nomes) + "\n" for _ in range(quantidade_titulos))
+    return TERMOS
+
+
+def gravar_do_cache(destino, diretorio_cache, caminho_termos, base_url):
+    from auxiliar.agendador import ler_termos
+    from auxiliar.cache_paginas import CachePaginas
+
+    cache = CachePaginas(diretorio_cache)
+    gravados = []
+    try:
+        for termo in ler_termos(caminho_termos):
+            conteudo = cache.obter(montar_url_busca(termo, base_url), ignorar_ttl=True)
+            if conteudo is None:
+                print(f" Sem página em cache para '{termo}'.")
+                continue
+            with open(os.path.join(destino, 'paginas', nome_arquivo_termo(termo) + '.html'), 'wb') as f:
+                f.write(conteudo)
+            gravados.append(termo)
+    finally:
+        cache.fechar()
+    return gravados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grava o corpus de páginas e manchetes dos benchmarks.")
+    parser.add_argument("--destino", default=DIRETORIO_FIXTURES, help="Diretório do corpus (padrão: benchmarks/fixtures).")
+    parser.add_argument("--cache", help="Diretório do cache de páginas (--cache do main.py) com buscas reais.")
+    parser.add_argument("--termos", help="Arquivo de termos cujas páginas são copiadas do --cache.")
+    parser.add_argument("--base-url", default=root_url, help="URL base usada nas buscas guardadas no cache.")
+    parser.add_argument("--itens", type=int, default=80, help="Notícias por página sintética (padrão: 80).")
+    parser.add_argument("--titulos", type=int, default=2000, help="Manchetes avulsas sintéticas (padrão: 2000).")
+    parser.add_argument("--semente", type=int, default=19, help="Semente do corpus sintético (padrão: 19).")
+    args = parser.parse_args()
+    if args.cache and not args.termos:
+        parser.error("--cache exige o arquivo de termos (--termos).")
+
+    paginas = os.path.join(args.destino, 'paginas')
+    shutil.rmtree(paginas, ignore_errors=True)
+    os.makedirs(paginas)
+    if args.cache:
+        termos = gravar_do_cache(args.destino, args.cache, args.termos, args.base_url)
+        if not termos:
+            sys.exit("Nenhuma página encontrada no cache.")
+    else:
+        termos = gravar_sinteticas(args.destino, args.itens, args.titulos, args.semente)
+    with open(os.path.join(args.destino, 'termos.txt'), 'w', encoding='utf-8') as f:
+        f.writelines(termo + "\n" for termo in termos)
+    print(f"{len(termos)} páginas gravadas em '{paginas}'.")
+
+
+if __name__ == "__main__":
+    main()
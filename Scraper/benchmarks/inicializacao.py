@@ -0,0 +1,71 @@
+"""
+Benchmark do tempo de inicialização do scraper.
+Mede:
+  1. `python src/main.py --help` (importações do módulo principal);
+  2. leitura do gazetteer de municípios (CSV) e montagem da trie usada na busca dos nomes;
+  3. carga do modelo do spaCy e criação do PhraseMatcher, usados só com --matcher spacy (use --sem-spacy para pular).
+
+Exemplo: python benchmarks/inicializacao.py -n 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRETORIO_SRC = os.path.join(RAIZ, 'src')
+sys.path.insert(0, DIRETORIO_SRC)
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def relatar(nome, tempos):
+    print(f"{nome:<45} mediana {statistics.median(tempos) * 1000:9.1f} ms   "
+          f"min {min(tempos) * 1000:9.1f} ms   ({len(tempos)} execuções)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o tempo de inicialização do scraper.")
+    parser.add_argument("-n", "--repeticoes", type=int, default=5, help="Execuções por medição (padrão: 5).")
+    parser.add_argument("--sem-spacy", action="store_true", help="Não mede a carga do modelo do spaCy.")
+    args = parser.parse_args()
+
+    def ajuda():
+        subprocess.run([sys.executable, 'main.py', '--help'], cwd=DIRETORIO_SRC, check=True,
+                       stdout=subprocess.DEVNULL)
+
+    relatar("main.py --help (processo novo)", medir(ajuda, args.repeticoes))
+
+    from auxiliar import matcher_municipios, municipios
+
+    def carregar_trie():
+        municipios.get_municipios.cache_clear()
+        matcher_municipios.get_matcher_trie.cache_clear()
+        matcher_municipios.get_matcher_trie()
+
+    relatar("municípios: leitura do CSV", medir(municipios.carregar_municipios, args.repeticoes))
+    relatar("municípios: CSV + trie", medir(carregar_trie, args.repeticoes))
+
+    if not args.sem_spacy:
+        from auxiliar import spacy_extract
+
+        def carregar_spacy():
+            spacy_extract.get_nlp.cache_clear()
+            spacy_extract.get_matcher.cache_clear()
+            municipios.get_municipios.cache_clear()
+            spacy_extract.get_matcher()
+
+        relatar("spaCy: modelo (só tokenizer) + PhraseMatcher", medir(carregar_spacy, args.repeticoes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark da busca dos nomes de municípios nos títulos: trie (`auxiliar.matcher_municipios`) contra
+o PhraseMatcher do spaCy, com os municípios do gazetteer e com um gazetteer do tamanho do Brasil
+(5.570 nomes, completado com nomes sintéticos).
+O PhraseMatcher usa um tokenizer em branco de português (`spacy.blank('pt')`), sem precisar do modelo;
+a primeira montagem inclui a importação do spaCy. Com --sem-spacy só a trie é medida.
+
+Exemplo: python benchmarks/matcher_municipios.py -n 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+from auxiliar.matcher_municipios import MatcherMunicipios
+from auxiliar.municipios import carregar_municipios
+
+TOTAL_BRASIL = 5570
+PALAVRAS = [
+    "Prefeitura", "de", "é", "alvo", "operação", "da", "PF", "em", "MP", "investiga", "contrato", "fraude",
+    "na", "câmara", "desvio", "verbas", "cidade", "Bahia", "(BA)", "licitação", "ex-prefeito", "preso",
+]
+
+
+def nomes_brasil(nomes):
+    """Completa a lista com nomes sintéticos de 1 a 4 palavras até o total de municípios do Brasil."""
+    aleatorio = random.Random(7)
+    partes = sorted({parte for nome in nomes for parte in nome.split()})
+    existentes = set(nomes)
+    extras = set()
+    while len(nomes) + len(extras) < TOTAL_BRASIL:
+        nome = " ".join(aleatorio.choice(partes) for _ in range(aleatorio.randint(1, 4)))
+        if nome not in existentes:
+            extras.add(nome)
+    return list(nomes) + sorted(extras)
+
+
+def gerar_titulos(nomes, quantidade):
+    aleatorio = random.Random(1)
+    titulos = []
+    for _ in range(quantidade):
+        palavras = [aleatorio.choice(PALAVRAS) for _ in range(aleatorio.randint(6, 14))]
+        for _ in range(aleatorio.randint(0, 2)):
+            palavras.insert(aleatorio.randrange(len(palavras) + 1), aleatorio.choice(nomes))
+        titulos.append(" ".join(palavras))
+    return titulos
+
+
+def medir(nome, funcao, titulos):
+    inicio = time.perf_counter()
+    montado = funcao()
+    montagem = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    encontrados = sum(len(montado(titulo)) for titulo in titulos)
+    busca = time.perf_counter() - inicio
+    print(f"  {nome:<14} montagem {montagem * 1000:8.1f} ms   busca {busca / len(titulos) * 1e6:7.1f} µs/título   "
+          f"({encontrados} ocorrências)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a trie e o PhraseMatcher na busca dos municípios.")
+    parser.add_argument("-n", "--titulos", type=int, default=20_000, help="Quantidade de títulos sintéticos (padrão: 20000).")
+    parser.add_argument("--sem-spacy", action="store_true", help="Mede só a trie.")
+    args = parser.parse_args()
+
+    nomes_gazetteer = [municipio.nome for municipio in carregar_municipios()]
+    for rotulo, nomes in (("gazetteer", nomes_gazetteer), ("Brasil", nomes_brasil(nomes_gazetteer))):
+        titulos = gerar_titulos(nomes, args.titulos)
+        print(f"{rotulo}: {len(nomes)} nomes, {len(titulos)} títulos")
+        medir("trie", lambda: MatcherMunicipios(nomes).encontrar, titulos)
+        if args.sem_spacy:
+            continue
+
+        def phrase_matcher():
+            import spacy
+            from spacy.matcher import PhraseMatcher
+
+            nlp = spacy.blank('pt')
+            matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+            matcher.add("MUNICIPIO", list(nlp.tokenizer.pipe(nomes)))
+            return lambda titulo: matcher(nlp.make_doc(titulo))
+
+        medir("PhraseMatcher", phrase_matcher, titulos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark de memória das notícias mantidas em memória: as mesmas notícias lidas da base SQLite (como
+na exportação completa e no modo serviço) em um dicionário por notícia, como antes, e em registros
+`registros.Noticia` (`__slots__` e campos repetidos internados); e o DataFrame com colunas `object`
+contra `registros.noticias_para_dataframe` (categorias), também no DataFrame da exportação do acervo em
+Parquet (`AcervoNoticias.exportar_parquet`, antes lido com `pd.read_sql_query`).
+As notícias são as do corpus de `benchmarks/fixtures/`, repetidas com links diferentes até -n.
+
+Exemplo: python benchmarks/memoria_noticias.py -n 100000
+"""
+import argparse
+import contextlib
+import gc
+import glob
+import io
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+import pandas as pd
+
+from auxiliar.acervo import COLUNAS_CATEGORICAS_ACERVO, AcervoNoticias
+from auxiliar.armazenamento import CAMPOS_NOTICIA, BaseNoticias
+from auxiliar.coletores import root_url
+from auxiliar.extracao import PARSERS_HTML
+from auxiliar.municipios import carregar_municipios
+from auxiliar.pos_processamento import explodir_noticia
+from auxiliar.registros import noticias_para_dataframe
+
+DIRETORIO_FIXTURES = os.path.join(RAIZ, 'benchmarks', 'fixtures')
+
+
+def preencher_base(base, quantidade, fixtures):
+    """Grava na base `quantidade` notícias do corpus, com links únicos e 0 a 3 municípios cada."""
+    aleatorio = random.Random(22)
+    municipios = [f"{m.nome}-{m.codigo}" for m in carregar_municipios(ufs={'BA'})]
+    itens = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for caminho in sorted(glob.glob(os.path.join(fixtures, 'paginas', '*.html'))):
+            with open(caminho, 'r', encoding='utf-8') as f:
+                termo = os.path.splitext(os.path.basename(caminho))[0]
+                itens.extend((termo, item) for item in PARSERS_HTML['html.parser'](f.read(), root_url))
+    for i in range(quantidade):
+        termo, item = itens[i % len(itens)]
+        base.registrar(dict(
+            item, link=f"{item['link']}?n={i}", palavra_chave=termo,
+            municipios_citados=",".join(aleatorio.sample(municipios, aleatorio.choice((0, 1, 1, 2, 3)))),
+        ))
+    base.salvar()
+
+
+def medir(funcao):
+    """Resultado de `funcao()` e a memória que ele ocupa (alocada e não liberada), em bytes."""
+    gc.collect()
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    resultado = funcao()
+    gc.collect()
+    ocupada = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    return resultado, ocupada
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a memória de dicionários e registros Noticia.")
+    parser.add_argument("-n", "--noticias", type=int, default=100_000, help="Quantidade de notícias (padrão: 100000).")
+    parser.add_argument("--fixtures", default=DIRETORIO_FIXTURES, help="Diretório do corpus (padrão: benchmarks/fixtures).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        base = BaseNoticias(os.path.join(diretorio, 'base.sqlite3'))
+        preencher_base(base, args.noticias, args.fixtures)
+
+        def ler_dicionarios():
+            cursor = base.conexao.execute(f"SELECT {', '.join(CAMPOS_NOTICIA)} FROM noticias ORDER BY rowid")
+            return [dict(zip(CAMPOS_NOTICIA, linha)) for linha in cursor]
+
+        dicionarios, memoria_dicionarios = medir(ler_dicionarios)
+        del dicionarios
+        noticias, memoria_noticias = medir(base.todas_noticias)
+        base.fechar()
+
+        acervo = AcervoNoticias(os.path.join(diretorio, 'acervo.sqlite3'))
+        acervo.adicionar([linha for noticia in noticias for linha in explodir_noticia(noticia)], 'benchmark')
+        linhas_acervo = acervo.conexao.execute("SELECT COUNT(*) FROM linhas").fetchone()[0]
+        sql = pd.read_sql_query("SELECT * FROM linhas", acervo.conexao).memory_usage(deep=True).sum()
+        cursor = acervo.conexao.execute("SELECT * FROM linhas")
+        colunas = [descricao[0] for descricao in cursor.description]
+        acervo_categorias = noticias_para_dataframe(
+            (dict(zip(colunas, linha)) for linha in cursor), COLUNAS_CATEGORICAS_ACERVO, colunas=colunas
+        ).memory_usage(deep=True).sum()
+        acervo.fechar()
+
+    n = len(noticias)
+    print(f"{n} notícias")
+    print(f"  dict                {memoria_dicionarios / n:8.0f} bytes/notícia   {memoria_dicionarios / 1e6:8.1f} MB")
+    print(f"  Noticia             {memoria_noticias / n:8.0f} bytes/notícia   {memoria_noticias / 1e6:8.1f} MB   "
+          f"({1 - memoria_noticias / memoria_dicionarios:.0%} menos)")
+
+    objetos = pd.DataFrame([dict(noticia) for noticia in noticias]).memory_usage(deep=True).sum()
+    categorias = noticias_para_dataframe(noticias).memory_usage(deep=True).sum()
+    print(f"  DataFrame object    {objetos / n:8.0f} bytes/notícia   {objetos / 1e6:8.1f} MB")
+    print(f"  DataFrame category  {categorias / n:8.0f} bytes/notícia   {categorias / 1e6:8.1f} MB   "
+          f"({1 - categorias / objetos:.0%} menos)")
+
+    print(f"{linhas_acervo} linhas do acervo (exportação em Parquet)")
+    print(f"  read_sql_query      {sql / linhas_acervo:8.0f} bytes/linha     {sql / 1e6:8.1f} MB")
+    print(f"  category            {acervo_categorias / linhas_acervo:8.0f} bytes/linha     "
+          f"{acervo_categorias / 1e6:8.1f} MB   ({1 - acervo_categorias / sql:.0%} menos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark dos parsers da página de resultados do Google News (`auxiliar.extracao.PARSERS_HTML`).
+Confere que todos devolvem exatamente os mesmos itens e mede o tempo de cada um, em páginas
+salvas (`--paginas <diretório com .html>`) ou, sem elas, em uma página sintética com a mesma
+estrutura de marcação da busca do Google News.
+
+Exemplo: python benchmarks/parsers_html.py --itens 500
+"""
+import argparse
+import contextlib
+import glob
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from auxiliar.coletores import root_url
+from auxiliar.extracao import PARSERS_HTML
+
+MODELO_ITEM = """
+<c-wiz><div class="UW0SDc"><article class="IFHyqb">
+  <figure><img class="Quavad vwBmvb" src="/api/attachments/{i}-w200" srcset="/api/attachments/{i}-w200 1x, /api/attachments/{i}-w400 2x"></figure>
+  <div class="vr1PYe">{fonte}</div>
+  <a class="JtKRv" href="./read/CBMi{i}?hl=pt-BR">{titulo}</a>
+  <div class="GI74Re nDgy9d">{conteudo}</div>
+  <div class="UOVeFe"><time class="hvbAAd" datetime="{data}">há {i} dias</time></div>
+  <a class="WwrzSb" href="./read/CBMi{i}?hl=pt-BR" aria-label="{titulo}"></a>
+</article></div></c-wiz>
+"""
+
+MODELO_ITEM_SIMPLES = """
+<article><h4><a href="./articles/CAI{i}">{titulo}</a></h4><img src="/thumb/{i}.jpg"><div class="wsLqz">{fonte}</div></article>
+"""
+
+
+def gerar_pagina(quantidade, semente=0):
+    """Página sintética com `quantidade` notícias, misturando os dois layouts e campos ausentes."""
+    aleatorio = random.Random(semente)
+    partes = ['<html><head><script>var dados = "<article>não é notícia</article>";</script></head><body><main>']
+    for i in range(quantidade):
+        modelo = MODELO_ITEM if aleatorio.random() < 0.8 else MODELO_ITEM_SIMPLES
+        partes.append(modelo.format(
+            i=i,
+            titulo=f"Operação &amp; fraude em licitação nº {i} &ndash; Prefeitura de Feira de Santana",
+            conteudo=f"MP investiga contratos <b>superfaturados</b> ({i})",
+            fonte=aleatorio.choice(('G1', 'A Tarde', 'Bahia Notícias', 'Correio')),
+            data=f"202{aleatorio.randint(0, 5)}-0{aleatorio.randint(1, 9)}-1{aleatorio.randint(0, 9)}T12:00:00Z",
+        ))
+    partes.append('<div class="UW0SDc"><span>sem link</span></div></main></body></html>')
+    return "".join(partes)
+
+
+def medir(parser, html, repeticoes):
+    tempos = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            itens = PARSERS_HTML[parser](html, root_url)
+            tempos.append(time.perf_counter() - inicio)
+    return itens, min(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os parsers da página de resultados do Google News.")
+    parser.add_argument("--paginas", help="Diretório com páginas de busca salvas (.html).")
+    parser.add_argument("--itens", type=int, default=500, help="Notícias na página sintética (padrão: 500).")
+    parser.add_argument("-n", "--repeticoes", type=int, default=3, help="Execuções por parser (padrão: 3).")
+    args = parser.parse_args()
+
+    if args.paginas:
+        paginas = {}
+        for caminho in sorted(glob.glob(os.path.join(args.paginas, '*.html'))):
+            with open(caminho, 'rb') as f:
+                paginas[os.path.basename(caminho)] = f.read().decode('utf-8', errors='replace')
+    else:
+        paginas = {f"sintética ({args.itens} notícias)": gerar_pagina(args.itens)}
+
+    for nome, html in paginas.items():
+        print(f"{nome}: {len(html) / 1e6:.2f} MB")
+        referencia = None
+        for nome_parser in PARSERS_HTML:
+            itens, tempo = medir(nome_parser, html, args.repeticoes)
+            if referencia is None:
+                referencia = itens
+            elif itens != referencia:
+                print(f"  {nome_parser}: resultado diferente de {next(iter(PARSERS_HTML))}!")
+                sys.exit(1)
+            print(f"  {nome_parser:<12} {tempo * 1000:9.1f} ms  ({len(itens)} itens)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark do pipeline de `main.main` (ver `auxiliar.pipeline`): tempo total da execução sobre o
+corpus de `benchmarks/fixtures/` com a identificação dos municípios na thread principal
+(`--processos-nlp 0`) e em pools de processos, com uma latência simulada em cada busca (no lugar do
+Chrome). Confere também que as saídas são iguais em todas as configurações.
+
+Exemplo: python benchmarks/pipeline_nlp.py --latencia 0.5 --processos 0 1 2 4
+"""
+import argparse
+import contextlib
+import functools
+import glob
+import io
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+import main as scraper
+from auxiliar.agendador import ler_termos
+from auxiliar.coletores import criar_coletor
+from auxiliar.spacy_extract import MATCHERS
+
+DIRETORIO_FIXTURES = os.path.join(RAIZ, 'benchmarks', 'fixtures')
+
+
+class ColetorComLatencia:
+    """Coletor do backend 'arquivos' que espera `latencia` segundos a cada busca, como o navegador."""
+
+    def __init__(self, latencia, **kwargs):
+        self.coletor = criar_coletor('arquivos', **kwargs)
+        self.latencia = latencia
+
+    def coletar(self, palavra):
+        time.sleep(self.latencia)
+        return self.coletor.coletar(palavra)
+
+    def fechar(self):
+        self.coletor.fechar()
+
+
+def executar(termos, processos, args, diretorio):
+    scraper.seen_links.clear()
+    scraper.news.clear()
+    prefixo = os.path.join(diretorio, f"saida_{processos}")
+    fabrica = functools.partial(
+        ColetorComLatencia, args.latencia, diretorio_fixtures=os.path.join(args.fixtures, 'paginas')
+    )
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scraper.main(termos, prefixo, workers=args.workers, fabrica_coletor=fabrica, formato='csv',
+                     caminho_relatorio=os.path.join(diretorio, f"relatorio_{processos}.json"),
+                     matcher=args.matcher, processos_nlp=processos, tamanho_fila=args.fila)
+    duracao = time.perf_counter() - inicio
+    with open(glob.glob(prefixo + '_*.csv')[0], 'r', encoding='utf-8-sig') as f:
+        return duracao, f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o main.main com a identificação dos municípios em processos.")
+    parser.add_argument("--fixtures", default=DIRETORIO_FIXTURES, help="Diretório do corpus (padrão: benchmarks/fixtures).")
+    parser.add_argument("--latencia", type=float, default=0.5, help="Segundos de espera simulada por busca (padrão: 0.5).")
+    parser.add_argument("--processos", type=int, nargs="+", default=[0, 1, 2, 4], help="Valores de --processos-nlp.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Threads de coleta (padrão: 1).")
+    parser.add_argument("--fila", type=int, default=2, help="Termos buscados à frente do processamento (padrão: 2).")
+    parser.add_argument("--matcher", choices=MATCHERS, default="trie", help="Mecanismo de busca dos nomes (padrão: trie).")
+    args = parser.parse_args()
+
+    logging_nivel = scraper.logging.getLogger().level
+    scraper.logging.getLogger().setLevel(scraper.logging.WARNING)
+    termos = ler_termos(os.path.join(args.fixtures, 'termos.txt'))
+    print(f"{len(termos)} termos, latência de {args.latencia:.2f} s por busca, {args.workers} thread(s) de coleta")
+    referencia = None
+    with tempfile.TemporaryDirectory() as diretorio:
+        for processos in args.processos:
+            duracao, saida = executar(termos, processos, args, diretorio)
+            referencia = saida if referencia is None else referencia
+            igual = "igual" if saida == referencia else "DIFERENTE"
+            print(f"  processos_nlp={processos:<3} {duracao:8.2f} s   saída {igual}")
+    scraper.logging.getLogger().setLevel(logging_nivel)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark de `pos_processamento.processar_linhas`: compara a implementação vetorizada com a
+implementação original (duas passadas com `iterrows`), em linhas sintéticas, e confere que as
+duas saídas são idênticas.
+
+Exemplo: python benchmarks/processar_linhas.py -n 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from auxiliar.pos_processamento import processar_linhas
+
+MUNICIPIOS = ['Salvador-2927408', 'Feira de Santana-2910800', 'Xique-Xique-2933604', 'Riacho de Santana-2926400',
+              'Vitória da Conquista-2933307', 'Ilhéus-2913606', 'Juazeiro-2918407']
+
+
+def processar_linhas_iterrows(df):
+    """Implementação original de `processar_linhas`, mantida aqui como referência."""
+    novas_linhas_etapa1 = []
+
+    for index, row in df.iterrows():
+        municipios_original_str = row.get('municipios_citados', '')
+
+        if isinstance(municipios_original_str, str) and ',' in municipios_original_str:
+            municipio_code_pairs = [pair.strip() for pair in municipios_original_str.split(',')]
+
+            for pair_str in municipio_code_pairs:
+                nova_linha = row.copy()
+                nova_linha['municipios_citados_temp'] = pair_str
+                novas_linhas_etapa1.append(nova_linha)
+        else:
+            nova_linha = row.copy()
+            nova_linha['municipios_citados_temp'] = municipios_original_str
+            novas_linhas_etapa1.append(nova_linha)
+
+    if not novas_linhas_etapa1:
+        expected_cols = df.columns.tolist()
+        if 'codigo_municipio' not in expected_cols:
+            expected_cols.append('codigo_municipio')
+        return pd.DataFrame(columns=expected_cols)
+
+    df_etapa1_concluida = pd.DataFrame(novas_linhas_etapa1).reset_index(drop=True)
+
+    nomes_finais = []
+    codigos_finais = []
+
+    for _, row_etapa1 in df_etapa1_concluida.iterrows():
+        municipio_code_str = row_etapa1.get('municipios_citados_temp', '')
+
+        if isinstance(municipio_code_str, str) and '-' in municipio_code_str:
+            partes = municipio_code_str.split('-', 1)
+            nome = partes[0].strip()
+            codigo = partes[1].strip() if len(partes) > 1 else ""
+            nomes_finais.append(nome)
+            codigos_finais.append(codigo)
+        else:
+            nomes_finais.append(str(municipio_code_str).strip())
+            codigos_finais.append("")
+
+    df_etapa1_concluida['municipios_citados_final'] = nomes_finais
+    df_etapa1_concluida['codigo_municipio_final'] = codigos_finais
+
+    colunas_para_remover = ['municipios_citados_temp']
+    if 'municipios_citados' in df_etapa1_concluida.columns:
+         colunas_para_remover.append('municipios_citados')
+
+    df_final = df_etapa1_concluida.drop(columns=colunas_para_remover, errors='ignore')
+
+    df_final = df_final.rename(columns={
+        'municipios_citados_final': 'municipios_citados',
+        'codigo_municipio_final': 'codigo_municipio'
+    })
+
+    if not df.empty:
+        original_cols_base = [col for col in df.columns if col != 'municipios_citados']
+        final_cols_order = original_cols_base + ['municipios_citados', 'codigo_municipio']
+        final_cols_order_existing = [col for col in final_cols_order if col in df_final.columns]
+        df_final = df_final[final_cols_order_existing] if final_cols_order_existing else df_final
+
+    return df_final
+
+
+def gerar_noticias(quantidade, semente=0):
+    """Gera notícias sintéticas com 0 a 3 municípios citados, no formato produzido por main.py."""
+    aleatorio = random.Random(semente)
+    linhas = []
+    for i in range(quantidade):
+        citados = aleatorio.sample(MUNICIPIOS, aleatorio.choice((0, 1, 1, 2, 3)))
+        linhas.append({
+            'titulo': f"Notícia {i}",
+            'conteudo': f"Conteúdo da notícia {i}",
+            'fonte': aleatorio.choice(('Fonte A', 'Fonte B', 'Fonte C')),
+            'datetime': '01/01/2024',
+            'link': f"https://news.google.com/read/{i}",
+            'img_url': 'https://news.google.comImagem não encontrada',
+            'palavra_chave': 'Fraude Licitação Bahia',
+            'municipios_citados': ",".join(citados),
+        })
+    return pd.DataFrame(linhas)
+
+
+def casos_limite():
+    """DataFrames com valores fora do padrão usados para conferir a equivalência."""
+    return [
+        pd.DataFrame(columns=['titulo', 'municipios_citados']),
+        pd.DataFrame({'titulo': ['a', 'b', 'c', 'd'],
+                      'municipios_citados': [' X - 1 , Y-2,,', None, float('nan'), 'sem codigo ']}),
+        pd.DataFrame({'titulo': ['a'], 'municipios_citados': [123]}),
+        pd.DataFrame({'titulo': ['a', 'b']}),
+        pd.DataFrame({'municipios_citados': ['Z-3', 'W']}),
+    ]
+
+
+def medir(funcao, df):
+    inicio = time.perf_counter()
+    resultado = funcao(df)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara as implementações de processar_linhas.")
+    parser.add_argument("-n", "--linhas", type=int, default=100_000, help="Quantidade de notícias sintéticas (padrão: 100000).")
+    args = parser.parse_args()
+
+    for caso in casos_limite():
+        pd.testing.assert_frame_equal(processar_linhas(caso), processar_linhas_iterrows(caso))
+    print("Casos limite: saídas idênticas.")
+
+    df = gerar_noticias(args.linhas)
+    vetorizado, tempo_vetorizado = medir(processar_linhas, df)
+    original, tempo_original = medir(processar_linhas_iterrows, df)
+    pd.testing.assert_frame_equal(vetorizado, original)
+
+    print(f"{args.linhas} notícias -> {len(vetorizado)} linhas (saídas idênticas)")
+    print(f"iterrows (original): {tempo_original:8.2f} s")
+    print(f"vetorizado:          {tempo_vetorizado:8.2f} s  ({tempo_original / tempo_vetorizado:.0f}x mais rápido)")
+
+
+if __name__ == "__main__":
+    main()
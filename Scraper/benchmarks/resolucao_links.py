@@ -0,0 +1,141 @@
+"""
+Benchmark da resolução dos links do Google News (`auxiliar.links_canonicos`) contra um stub local, sem
+rede. O stub responde em 127.0.0.1 como se fosse o Google: cada '/articles/<id>' redireciona, depois
+de uma latência simulada, para a notícia em 'localhost' (outro host, como o site do jornal), com
+parâmetros de rastreamento e, em metade dos casos, na versão AMP. Cada notícia aparece com vários
+ids diferentes, como a mesma matéria em vários termos e execuções; um quarto das notícias usa ids
+do formato antigo, resolvidos sem requisição.
+
+Mede o tempo com uma requisição por vez e com requisições simultâneas, e com o cache SQLite já
+preenchido (nova execução), e quantos links distintos sobram para a deduplicação.
+
+Exemplo: python benchmarks/resolucao_links.py --noticias 200 --ids-por-noticia 3 --latencia 0.05
+"""
+import argparse
+import base64
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+from auxiliar.instrumentacao import metricas
+from auxiliar.links_canonicos import ResolvedorLinks
+
+
+def id_formato_antigo(url):
+    """Id do Google News no formato antigo, com a URL codificada (ver `decodificar_link_google`)."""
+    dados = url.encode('utf-8')
+    return base64.urlsafe_b64encode(b'\x08\x13"' + bytes([len(dados)]) + dados + b'\xd2\x01\x00').decode().rstrip('=')
+
+
+def criar_stub(latencia):
+    """Servidor local do Google e dos sites; devolve o servidor e a lista dos redirecionamentos feitos."""
+    redirecionamentos = []
+
+    class Stub(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if self.path.startswith('/articles/'):
+                # '/articles/AU_<noticia>_<variante>'
+                _, noticia, variante = self.path.rsplit('/', 1)[-1].split('_')
+                redirecionamentos.append(self.path)
+                time.sleep(latencia)
+                amp = '/amp' if int(variante) % 2 else ''
+                destino = (f"http://localhost:{self.server.server_port}{amp}/noticias/{noticia}.html"
+                           f"?utm_source=google&utm_medium=news&ocid={variante}")
+                self.send_response(302)
+                self.send_header('Location', destino)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            corpo = b'<html><body><article><p>Noticia</p></article></body></html>'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    class Servidor(ThreadingHTTPServer):
+        daemon_threads = True
+
+        def handle_error(self, request, client_address):
+            # O resolvedor fecha a conexão sem ler a página da notícia: não é um erro
+            pass
+
+    servidor = Servidor(('127.0.0.1', 0), Stub)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, redirecionamentos
+
+
+def montar_links(base_url, porta, noticias, ids_por_noticia):
+    links = []
+    for variante in range(ids_por_noticia):
+        for noticia in range(noticias):
+            if noticia % 4 == 0:
+                url = f"http://localhost:{porta}/noticias/{noticia}.html?utm_campaign=rss{variante}"
+                links.append(f"{base_url}/rss/articles/{id_formato_antigo(url)}?oc=5")
+            else:
+                links.append(f"{base_url}/articles/AU_{noticia}_{variante}")
+    return links
+
+
+def medir(links, redirecionamentos, **kwargs):
+    redirecionamentos.clear()
+    metricas.reiniciar()
+    resolvedor = ResolvedorLinks(**kwargs)
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        canonicos = resolvedor.resolver(links)
+    duracao = time.perf_counter() - inicio
+    resolvedor.fechar()
+    return duracao, len(redirecionamentos), canonicos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a resolução dos links do Google News contra um stub local.")
+    parser.add_argument("--noticias", type=int, default=200, help="Notícias distintas (padrão: 200).")
+    parser.add_argument("--ids-por-noticia", type=int, default=3, help="Links diferentes para cada notícia (padrão: 3).")
+    parser.add_argument("--latencia", type=float, default=0.05, help="Segundos de espera por redirecionamento (padrão: 0.05).")
+    parser.add_argument("--concorrencia", type=int, default=16, help="Requisições simultâneas (padrão: 16).")
+    args = parser.parse_args()
+
+    servidor, redirecionamentos = criar_stub(args.latencia)
+    base_url = f"http://127.0.0.1:{servidor.server_port}"
+    links = montar_links(base_url, servidor.server_port, args.noticias, args.ids_por_noticia)
+    print(f"{len(links)} links do Google para {args.noticias} notícias, latência de {args.latencia:.3f} s")
+    try:
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'links.sqlite3')
+            medicoes = (
+                ('sequencial', dict(concorrencia=1)),
+                (f'{args.concorrencia} simultâneas', dict(concorrencia=args.concorrencia)),
+                ('cache preenchido', dict(concorrencia=args.concorrencia, caminho_cache=caminho)),
+            )
+            # A primeira passada com o cache em disco só o preenche
+            medir(links, redirecionamentos, base_url=base_url, caminho_cache=caminho)
+            for nome, kwargs in medicoes:
+                duracao, requisicoes, canonicos = medir(links, redirecionamentos, base_url=base_url, **kwargs)
+                print(f"  {nome:<18} {duracao:8.2f} s   {requisicoes:5d} requisições   "
+                      f"{len(links) / duracao:9,.0f} links/s")
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    distintos = len(set(canonicos.values()))
+    print(f"Links distintos para a deduplicação: {len(set(links))} antes, {distintos} depois "
+          f"({1 - distintos / len(set(links)):.0%} menos)")
+
+
+if __name__ == "__main__":
+    main()
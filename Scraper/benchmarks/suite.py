@@ -0,0 +1,352 @@
+"""
+Suíte de benchmarks offline: passa o corpus gravado em `benchmarks/fixtures/` (páginas de resultados
+do Google News e manchetes, ver `gravar_fixtures.py`) por cada etapa do scraper, sem navegador nem
+rede, e compara com uma linha de base gravada.
+
+Etapas:
+  parse              montagem da árvore do HTML (BeautifulSoup ou lxml, conforme --parser)
+  extracao           extração dos itens da página (`extracao.PARSERS_HTML`, inclui o parse)
+  deteccao           busca dos nomes de municípios nos títulos (`extrair_municipios_batch`)
+  desambiguacao      filtro dos candidatos com o contexto (`main.get_municipios_from_title`)
+  pos_processamento  uma linha por município (`pos_processamento.processar_linhas`)
+  exportacao_<fmt>   gravação das notícias em cada formato de saída (`saidas.criar_saida`)
+  pipeline           `main.main` inteiro com o backend 'arquivos' sobre as páginas do corpus
+
+Para cada etapa são medidos a vazão (unidades por segundo), a latência por chamada (p50 e p95) e o
+pico de memória alocada pelo Python durante a etapa (tracemalloc, em uma passada à parte). O
+resultado de cada etapa é resumido em um hash: a comparação com a linha de base
+(`benchmarks/linha_base.json`) acusa saídas diferentes e etapas mais lentas ou com mais memória que
+a tolerância. Os tempos só são comparáveis na mesma máquina; em outra, use --so-resultados.
+
+Exemplos:
+  python benchmarks/suite.py
+  python benchmarks/suite.py --etapas deteccao desambiguacao --matcher spacy
+  python benchmarks/suite.py --gravar-linha-base
+"""
+import argparse
+import contextlib
+import functools
+import glob
+import hashlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+import pandas as pd
+
+import main as scraper
+from auxiliar.coletores import criar_coletor, nome_arquivo_termo, root_url
+from auxiliar.desambiguacao import pre_process_text_for_municipality_detection
+from auxiliar.extracao import PARSERS_HTML, verificar_parser_html
+from auxiliar.pos_processamento import processar_linhas
+from auxiliar.saidas import FORMATOS, criar_saida
+from auxiliar.spacy_extract import MATCHERS, extrair_municipios_batch
+
+DIRETORIO_FIXTURES = os.path.join(RAIZ, 'benchmarks', 'fixtures')
+CAMINHO_LINHA_BASE = os.path.join(RAIZ, 'benchmarks', 'linha_base.json')
+ETAPAS = ('parse', 'extracao', 'deteccao', 'desambiguacao', 'pos_processamento', 'exportacao', 'pipeline')
+TITULOS_POR_LOTE = 100
+
+
+def resumo_hash(valor):
+    """Hash estável de um resultado (listas e dicionários serializados em JSON)."""
+    texto = json.dumps(valor, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()[:16]
+
+
+def percentil(valores, fracao):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(fracao * (len(ordenados) - 1))))]
+
+
+def medir_etapa(funcao, entradas, unidades, repeticoes, resumir):
+    """
+    Chama `funcao` para cada entrada, `repeticoes` vezes, e uma vez mais com o tracemalloc ligado.
+    `unidades` é a quantidade de itens processados em uma passada (para a vazão) e `resumir`
+    transforma os resultados da última passada no que é comparado com a linha de base.
+    """
+    latencias = []
+    resultados = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeticoes):
+            resultados = []
+            for entrada in entradas:
+                inicio = time.perf_counter()
+                resultados.append(funcao(entrada))
+                latencias.append(time.perf_counter() - inicio)
+
+        tracemalloc.start()
+        for entrada in entradas:
+            funcao(entrada)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    segundos_por_passada = sum(latencias) / repeticoes
+    return {
+        'chamadas': len(entradas),
+        'unidades': unidades,
+        'por_segundo': round(unidades / segundos_por_passada, 1) if segundos_por_passada else None,
+        'p50_ms': round(percentil(latencias, 0.5) * 1000, 3),
+        'p95_ms': round(percentil(latencias, 0.95) * 1000, 3),
+        'memoria_pico_mb': round(pico / (1024 * 1024), 2),
+        'resultado': resumo_hash(resumir(resultados)),
+    }
+
+
+def carregar_corpus(diretorio):
+    """Termos, páginas ({termo: html}) e manchetes avulsas do corpus."""
+    caminho_termos = os.path.join(diretorio, 'termos.txt')
+    with open(caminho_termos, 'r', encoding='utf-8') as f:
+        termos = [linha.strip() for linha in f if linha.strip()]
+    paginas = {}
+    for termo in termos:
+        with open(os.path.join(diretorio, 'paginas', nome_arquivo_termo(termo) + '.html'), 'rb') as f:
+            paginas[termo] = f.read().decode('utf-8', errors='replace')
+    titulos = []
+    caminho_titulos = os.path.join(diretorio, 'titulos.txt')
+    if os.path.exists(caminho_titulos):
+        with open(caminho_titulos, 'r', encoding='utf-8') as f:
+            titulos = [linha.strip() for linha in f if linha.strip()]
+    return termos, paginas, titulos
+
+
+def montar_arvore(parser, html):
+    if parser == 'lxml':
+        import lxml.html
+
+        return lxml.html.fromstring(html.encode('utf-8'), parser=lxml.html.HTMLParser(encoding='utf-8'))
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, 'html.parser')
+
+
+def contar_elementos(parser, arvore):
+    if parser == 'lxml':
+        return sum(1 for _ in arvore.iter())
+    return len(arvore.find_all(True))
+
+
+def noticias_do_corpus(itens_por_pagina, municipios_por_item):
+    """Notícias no formato da saída (como em `main.processar_itens`), para as etapas seguintes."""
+    noticias = []
+    for (termo, itens), municipios in zip(itens_por_pagina.items(), municipios_por_item):
+        for item, citados in zip(itens, municipios):
+            noticias.append({
+                'titulo': item['titulo'], 'conteudo': item['conteudo'], 'fonte': item['fonte'],
+                'datetime': item['datetime'], 'link': item['link'], 'img_url': item['img_url'],
+                'palavra_chave': termo, 'municipios_citados': ",".join(sorted(citados)),
+            })
+    return noticias
+
+
+def exportar(formato, diretorio, noticias):
+    prefixo = os.path.join(diretorio, f"exportacao_{formato}_{time.perf_counter_ns()}")
+    saida = criar_saida(formato, prefixo)
+    for noticia in noticias:
+        saida.escrever(noticia)
+    saida.fechar()
+    return saida.caminho, saida.linhas
+
+
+def ler_exportacao(formato, caminho):
+    """Linhas gravadas por uma saída, lidas de volta (como texto) para comparar o conteúdo."""
+    leitores = {
+        'csv': lambda: pd.read_csv(caminho, dtype=str, keep_default_na=False, encoding='utf-8-sig'),
+        'jsonl': lambda: pd.read_json(caminho, lines=True, dtype=False),
+        'xlsx': lambda: pd.read_excel(caminho, dtype=str, keep_default_na=False),
+        'parquet': lambda: pd.read_parquet(caminho),
+    }
+    return leitores[formato]().astype(str).to_dict('records')
+
+
+def formatos_disponiveis():
+    formatos = [formato for formato in FORMATOS if formato != 'parquet']
+    try:
+        import pyarrow  # noqa: F401
+        formatos.append('parquet')
+    except ImportError:
+        pass
+    return formatos
+
+
+def executar_pipeline(termos, diretorio_paginas, diretorio_saida, parser):
+    """Roda `main.main` sobre as páginas do corpus e devolve as linhas do CSV gerado."""
+    scraper.seen_links.clear()
+    scraper.news.clear()
+    prefixo = os.path.join(diretorio_saida, f"pipeline_{time.perf_counter_ns()}")
+    fabrica = functools.partial(criar_coletor, 'arquivos', diretorio_fixtures=diretorio_paginas, parser_html=parser)
+    scraper.main(termos, prefixo, fabrica_coletor=fabrica, formato='csv',
+                 caminho_relatorio=os.path.join(diretorio_saida, 'relatorio.json'))
+    linhas = []
+    for caminho in glob.glob(prefixo + '_*.csv'):
+        with open(caminho, 'r', encoding='utf-8-sig') as f:
+            linhas.extend(f.read().splitlines())
+    return linhas
+
+
+def executar(args):
+    termos, paginas, titulos_avulsos = carregar_corpus(args.fixtures)
+    etapas = args.etapas or list(ETAPAS)
+    resultados = {}
+    repeticoes = args.repeticoes
+    scraper.ufs_monitoradas = scraper.normalizar_ufs(args.ufs)
+    scraper.matcher_municipios = args.matcher
+
+    def registrar(nome, medicao, unidade):
+        medicao['unidade'] = unidade
+        resultados[nome] = medicao
+        print(f"  {nome:<20} {medicao['por_segundo'] or 0:>11,.0f} {unidade}/s   p50 {medicao['p50_ms']:9.3f} ms   "
+              f"p95 {medicao['p95_ms']:9.3f} ms   memória {medicao['memoria_pico_mb']:8.2f} MB")
+
+    # Entradas de cada etapa: o resultado da anterior, calculado uma vez fora da medição
+    with contextlib.redirect_stdout(io.StringIO()):
+        itens_por_pagina = {termo: PARSERS_HTML[args.parser](html, root_url) for termo, html in paginas.items()}
+    total_itens = sum(len(itens) for itens in itens_por_pagina.values())
+    titulos_paginas = [item['titulo'] for itens in itens_por_pagina.values() for item in itens]
+    titulos = [pre_process_text_for_municipality_detection(t) for t in titulos_paginas + titulos_avulsos]
+    lotes = [titulos[i:i + TITULOS_POR_LOTE] for i in range(0, len(titulos), TITULOS_POR_LOTE)]
+    candidatos = extrair_municipios_batch(titulos, ufs=scraper.ufs_monitoradas, matcher=args.matcher)
+    contextos = [item['conteudo'] for itens in itens_por_pagina.values() for item in itens]
+    contextos += [''] * len(titulos_avulsos)
+    entradas_desambiguacao = list(zip(titulos_paginas + titulos_avulsos, contextos, candidatos))
+    municipios = [scraper.get_municipios_from_title(*entrada) for entrada in entradas_desambiguacao]
+    municipios_por_item = []
+    inicio = 0
+    for itens in itens_por_pagina.values():
+        municipios_por_item.append(municipios[inicio:inicio + len(itens)])
+        inicio += len(itens)
+    noticias = noticias_do_corpus(itens_por_pagina, municipios_por_item)
+
+    print(f"Corpus: {len(paginas)} páginas ({sum(map(len, paginas.values())) / 1e6:.2f} MB), {total_itens} notícias, "
+          f"{len(titulos)} títulos | parser {args.parser}, matcher {args.matcher}, {repeticoes} repetições")
+
+    if 'parse' in etapas:
+        registrar('parse', medir_etapa(
+            functools.partial(montar_arvore, args.parser), list(paginas.values()), len(paginas), repeticoes,
+            lambda arvores: [contar_elementos(args.parser, arvore) for arvore in arvores],
+        ), 'páginas')
+    if 'extracao' in etapas:
+        registrar('extracao', medir_etapa(
+            lambda html: PARSERS_HTML[args.parser](html, root_url), list(paginas.values()), total_itens, repeticoes,
+            lambda listas: [[dict(item) for item in itens] for itens in listas],
+        ), 'notícias')
+    if 'deteccao' in etapas:
+        registrar('deteccao', medir_etapa(
+            lambda lote: extrair_municipios_batch(lote, ufs=scraper.ufs_monitoradas, matcher=args.matcher),
+            lotes, len(titulos), repeticoes, lambda listas: listas,
+        ), 'títulos')
+    if 'desambiguacao' in etapas:
+        registrar('desambiguacao', medir_etapa(
+            lambda entrada: scraper.get_municipios_from_title(*entrada), entradas_desambiguacao, len(titulos),
+            repeticoes, lambda listas: [sorted(municipios) for municipios in listas],
+        ), 'títulos')
+    if 'pos_processamento' in etapas:
+        quadros = [pd.DataFrame([n for n in noticias if n['palavra_chave'] == termo]) for termo in termos]
+        registrar('pos_processamento', medir_etapa(
+            processar_linhas, quadros, len(noticias), repeticoes,
+            lambda finais: [quadro.to_dict('records') for quadro in finais],
+        ), 'notícias')
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        if 'exportacao' in etapas:
+            for formato in formatos_disponiveis():
+                registrar(f'exportacao_{formato}', medir_etapa(
+                    lambda lote, formato=formato: exportar(formato, diretorio, lote), [noticias], len(noticias),
+                    repeticoes, lambda gravados, formato=formato: [ler_exportacao(formato, caminho) for caminho, _ in gravados],
+                ), 'notícias')
+        if 'pipeline' in etapas:
+            diretorio_paginas = os.path.join(args.fixtures, 'paginas')
+            registrar('pipeline', medir_etapa(
+                lambda _: executar_pipeline(termos, diretorio_paginas, diretorio, args.parser), [None], total_itens,
+                repeticoes, lambda execucoes: [sorted(linhas) for linhas in execucoes],
+            ), 'notícias')
+
+    return {
+        'configuracao': {'parser': args.parser, 'matcher': args.matcher, 'ufs': list(scraper.ufs_monitoradas)},
+        'corpus': {'paginas': len(paginas), 'noticias': total_itens, 'titulos': len(titulos)},
+        'ambiente': {'python': platform.python_version(), 'plataforma': platform.platform()},
+        'etapas': resultados,
+    }
+
+
+def comparar(atual, base, tolerancia, so_resultados):
+    """Lista as regressões em relação à linha de base: resultado diferente, latência ou memória acima da tolerância."""
+    if atual['configuracao'] != base.get('configuracao') or atual['corpus'] != base.get('corpus'):
+        print(f"Aviso: a linha de base foi gravada com outra configuração ou corpus ({base.get('configuracao')}, "
+              f"{base.get('corpus')}); nada é comparado.")
+        return []
+
+    regressoes = []
+    for nome, medicao in atual['etapas'].items():
+        referencia = base.get('etapas', {}).get(nome)
+        if referencia is None:
+            continue
+        if medicao['resultado'] != referencia['resultado']:
+            regressoes.append(f"{nome}: resultado diferente da linha de base")
+        if so_resultados:
+            continue
+        # Diferenças abaixo de 1 ms / 0,1 MB são ruído de medição
+        for campo, rotulo, ruido in (('p50_ms', 'p50', 1.0), ('p95_ms', 'p95', 1.0), ('memoria_pico_mb', 'memória', 0.1)):
+            limite = referencia[campo] * (1 + tolerancia)
+            if medicao[campo] > limite and medicao[campo] - referencia[campo] > ruido:
+                regressoes.append(f"{nome}: {rotulo} {medicao[campo]} > {referencia[campo]} (+{tolerancia:.0%})")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks offline das etapas do scraper, com comparação a uma linha de base.")
+    parser.add_argument("--fixtures", default=DIRETORIO_FIXTURES, help="Diretório do corpus (padrão: benchmarks/fixtures).")
+    parser.add_argument("--etapas", nargs="+", choices=ETAPAS, help="Etapas a medir (padrão: todas).")
+    parser.add_argument("--parser", choices=list(PARSERS_HTML), default="html.parser", help="Parser HTML (padrão: html.parser).")
+    parser.add_argument("--matcher", choices=MATCHERS, default="trie", help="Busca dos municípios (padrão: trie).")
+    parser.add_argument("--ufs", default="BA", help="UFs dos municípios procurados (padrão: BA).")
+    parser.add_argument("-n", "--repeticoes", type=int, default=5, help="Passadas por etapa (padrão: 5).")
+    parser.add_argument("--linha-base", default=CAMINHO_LINHA_BASE, help="Arquivo da linha de base (padrão: benchmarks/linha_base.json).")
+    parser.add_argument("--gravar-linha-base", action="store_true", help="Grava os números desta execução como nova linha de base.")
+    parser.add_argument("--tolerancia", type=float, default=0.3, help="Piora aceita em latência e memória (padrão: 0.3 = 30%%).")
+    parser.add_argument("--so-resultados", action="store_true", help="Compara só os resultados (ex.: em outra máquina).")
+    parser.add_argument("--json", help="Grava também as medições desta execução neste arquivo.")
+    args = parser.parse_args()
+    try:
+        verificar_parser_html(args.parser)
+    except ValueError as e:
+        parser.error(str(e))
+
+    atual = executar(args)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(atual, f, ensure_ascii=False, indent=2)
+
+    if args.gravar_linha_base:
+        if args.etapas:
+            parser.error("grave a linha de base com todas as etapas (sem --etapas).")
+        with open(args.linha_base, 'w', encoding='utf-8') as f:
+            json.dump(atual, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Linha de base gravada em '{args.linha_base}'.")
+        return
+
+    if not os.path.exists(args.linha_base):
+        print(f"Sem linha de base em '{args.linha_base}' (grave uma com --gravar-linha-base).")
+        return
+    with open(args.linha_base, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    regressoes = comparar(atual, base, args.tolerancia, args.so_resultados)
+    if regressoes:
+        print("Regressões em relação à linha de base:")
+        for regressao in regressoes:
+            print(f"  - {regressao}")
+        sys.exit(1)
+    print("Sem regressões em relação à linha de base.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Acervo consolidado (SQLite) com as linhas exportadas por todas as execuções, uma por notícia e
+município, para responder consultas como "notícias por município por mês" sem reabrir cada planilha.
+
+Toda execução acrescenta as suas linhas ao acervo (ver `SaidaAcervo` e `saidas.SaidaMultipla`) e
+as planilhas antigas podem ser importadas com `importar_arquivo`. A mesma notícia exportada de novo
+(mesmo link, termo e município) não é duplicada. As colunas usadas nos filtros (`codigo_municipio`,
+`palavra_chave`, `data` e `fonte`) têm índices, e as agregações contam notícias distintas (links).
+As consultas ficam em `consultar_acervo.py`.
+"""
+import math
+import os
+import sqlite3
+from datetime import datetime
+
+from auxiliar.registros import noticias_para_dataframe
+
+# Agrupamentos aceitos em `consultar`: nome -> expressão SQL
+DIMENSOES = {
+    'municipio': 'municipio',
+    'codigo_municipio': 'codigo_municipio',
+    'palavra_chave': 'palavra_chave',
+    'fonte': 'fonte',
+    'ano': "substr(data, 1, 4)",
+    'mes': "substr(data, 1, 7)",
+    'dia': 'data',
+}
+COLUNAS_NOTICIA = ('data', 'titulo', 'fonte', 'palavra_chave', 'municipio', 'codigo_municipio', 'link')
+# Colunas com poucos valores distintos, exportadas como categorias
+COLUNAS_CATEGORICAS_ACERVO = ('palavra_chave', 'municipio', 'codigo_municipio', 'data', 'fonte', 'origem', 'incluido_em')
+
+
+def data_iso(data_publicacao):
+    """'dd/mm/aaaa' (formato da saída) -> 'aaaa-mm-dd'; None se não for uma data."""
+    try:
+        return datetime.strptime(str(data_publicacao).strip(), '%d/%m/%Y').strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def codigo_inteiro(codigo):
+    """Código IBGE como inteiro ('2928000', 2928000.0 -> 2928000); None para vazio ou NaN."""
+    if codigo is None or codigo == '':
+        return None
+    try:
+        valor = float(codigo)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(valor) else int(valor)
+
+
+def texto(valor):
+    """Valor de uma célula como texto, com vazio e NaN (pandas) virando None."""
+    if valor is None or (isinstance(valor, float) and math.isnan(valor)):
+        return None
+    valor = str(valor).strip()
+    return valor or None
+
+
+class AcervoNoticias:
+    """Acervo em um arquivo SQLite."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS linhas (
+                link TEXT NOT NULL,
+                palavra_chave TEXT,
+                municipio TEXT,
+                codigo_municipio INTEGER,
+                data TEXT,
+                fonte TEXT,
+                titulo TEXT,
+                conteudo TEXT,
+                img_url TEXT,
+                origem TEXT,
+                incluido_em TEXT NOT NULL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS linhas_unicas
+                ON linhas (link, IFNULL(palavra_chave, ''), IFNULL(codigo_municipio, 0));
+            -- Com o link nos índices, as contagens por município, termo, fonte ou período não leem as linhas
+            CREATE INDEX IF NOT EXISTS linhas_municipio ON linhas (codigo_municipio, data, link);
+            CREATE INDEX IF NOT EXISTS linhas_palavra_chave ON linhas (palavra_chave, data, link);
+            CREATE INDEX IF NOT EXISTS linhas_data ON linhas (data, link);
+            CREATE INDEX IF NOT EXISTS linhas_fonte ON linhas (fonte, data, link);
+            CREATE TABLE IF NOT EXISTS arquivos (
+                caminho TEXT PRIMARY KEY,
+                tamanho INTEGER NOT NULL,
+                modificado_em REAL NOT NULL,
+                linhas INTEGER NOT NULL,
+                importado_em TEXT NOT NULL
+            );
+            """
+        )
+        self.conexao.commit()
+
+    @staticmethod
+    def _registro(linha, origem, agora):
+        return (
+            texto(linha.get('link')), texto(linha.get('palavra_chave')), texto(linha.get('municipios_citados')),
+            codigo_inteiro(linha.get('codigo_municipio')), data_iso(linha.get('datetime')), texto(linha.get('fonte')),
+            texto(linha.get('titulo')), texto(linha.get('conteudo')), texto(linha.get('img_url')), origem, agora,
+        )
+
+    def adicionar(self, linhas, origem=None):
+        """
+        Acrescenta linhas no formato da saída (uma por município, ver `pos_processamento.explodir_noticia`).
+        Retorna quantas eram novas.
+        """
+        agora = datetime.now().isoformat(timespec='seconds')
+        registros = [self._registro(linha, origem, agora) for linha in linhas]
+        registros = [registro for registro in registros if registro[0]]
+        with self.conexao:
+            antes = self.conexao.total_changes
+            self.conexao.executemany(
+                """
+                INSERT OR IGNORE INTO linhas (link, palavra_chave, municipio, codigo_municipio, data, fonte, titulo,
+                                              conteudo, img_url, origem, incluido_em)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                registros
+            )
+            return self.conexao.total_changes - antes
+
+    def saida(self, origem=None, linhas_por_lote=500):
+        """Saída (ver `auxiliar.saidas`) que grava as notícias no acervo, em lotes."""
+        return SaidaAcervo(self, origem, linhas_por_lote)
+
+    def importar_arquivo(self, caminho, forcar=False):
+        """
+        Importa uma saída antiga (.xlsx, .csv, .jsonl ou diretório .parquet). Arquivos já importados e
+        sem alteração desde então são pulados (retorna None), a não ser com `forcar`.
+        Retorna a quantidade de linhas novas.
+        """
+        import pandas as pd
+
+        estado = os.stat(caminho)
+        caminho_absoluto = os.path.abspath(caminho)
+        anterior = self.conexao.execute(
+            "SELECT tamanho, modificado_em FROM arquivos WHERE caminho = ?", (caminho_absoluto,)
+        ).fetchone()
+        if anterior == (estado.st_size, estado.st_mtime) and not forcar:
+            return None
+
+        extensao = os.path.splitext(caminho.rstrip('/\\'))[1].lower()
+        if extensao == '.xlsx':
+            df = pd.read_excel(caminho, dtype=object)
+        elif extensao == '.csv':
+            df = pd.read_csv(caminho, dtype=object, encoding='utf-8-sig')
+        elif extensao == '.jsonl':
+            df = pd.read_json(caminho, lines=True, dtype=False)
+        elif extensao == '.parquet':
+            df = pd.read_parquet(caminho)
+        else:
+            raise ValueError(f"Formato não suportado: {caminho}")
+
+        novas = self.adicionar(df.to_dict('records'), origem=os.path.basename(caminho.rstrip('/\\')))
+        with self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO arquivos (caminho, tamanho, modificado_em, linhas, importado_em) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (caminho_absoluto, estado.st_size, estado.st_mtime, len(df), datetime.now().isoformat(timespec='seconds'))
+            )
+        return novas
+
+    @staticmethod
+    def _filtros(municipio=None, palavra_chave=None, fonte=None, de=None, ate=None):
+        """
+        Cláusula WHERE e parâmetros. `municipio` é o código IBGE (int ou só dígitos) ou o nome (sem
+        diferenciar maiúsculas); `de`/`ate` são datas 'aaaa-mm-dd' (ou prefixos como 'aaaa-mm').
+        """
+        condicoes, parametros = [], []
+        if municipio is not None:
+            if str(municipio).isdigit():
+                condicoes.append("codigo_municipio = ?")
+                parametros.append(int(municipio))
+            else:
+                condicoes.append("municipio = ? COLLATE NOCASE")
+                parametros.append(municipio)
+        if palavra_chave is not None:
+            condicoes.append("palavra_chave = ?")
+            parametros.append(palavra_chave)
+        if fonte is not None:
+            condicoes.append("fonte = ?")
+            parametros.append(fonte)
+        if de is not None:
+            condicoes.append("data >= ?")
+            parametros.append(de)
+        if ate is not None:
+            # 'aaaa-mm' inclui o mês inteiro
+            condicoes.append("data <= ?")
+            parametros.append(ate if len(ate) == 10 else ate + '\uffff')
+        return (" WHERE " + " AND ".join(condicoes) if condicoes else ""), parametros
+
+    def consultar(self, agrupar_por=('municipio', 'codigo_municipio'), limite=None, **filtros):
+        """
+        Quantidade de notícias distintas por combinação de `agrupar_por` (nomes de DIMENSOES),
+        da maior para a menor. Filtros: ver `_filtros`. Retorna uma lista de dicionários.
+        """
+        desconhecidas = [dimensao for dimensao in agrupar_por if dimensao not in DIMENSOES]
+        if desconhecidas:
+            raise ValueError(f"Agrupamento desconhecido: {', '.join(desconhecidas)} (opções: {', '.join(DIMENSOES)})")
+        where, parametros = self._filtros(**filtros)
+        colunas = [f"{DIMENSOES[dimensao]} AS {dimensao}" for dimensao in agrupar_por]
+        sql = f"SELECT {', '.join(colunas + ['COUNT(DISTINCT link) AS noticias'])} FROM linhas{where}"
+        if agrupar_por:
+            sql += f" GROUP BY {', '.join(agrupar_por)} ORDER BY noticias DESC, {', '.join(agrupar_por)}"
+        if limite:
+            sql += f" LIMIT {int(limite)}"
+        cursor = self.conexao.execute(sql, parametros)
+        nomes = [descricao[0] for descricao in cursor.description]
+        return [dict(zip(nomes, linha)) for linha in cursor]
+
+    def noticias(self, limite=100, **filtros):
+        """Linhas do acervo que atendem aos filtros, das mais recentes para as mais antigas."""
+        where, parametros = self._filtros(**filtros)
+        sql = f"SELECT {', '.join(COLUNAS_NOTICIA)} FROM linhas{where} ORDER BY data DESC, link"
+        if limite:
+            sql += f" LIMIT {int(limite)}"
+        return [dict(zip(COLUNAS_NOTICIA, linha)) for linha in self.conexao.execute(sql, parametros)]
+
+    def resumo(self):
+        linhas, noticias, municipios, inicio, fim = self.conexao.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT link), COUNT(DISTINCT codigo_municipio), MIN(data), MAX(data) FROM linhas"
+        ).fetchone()
+        arquivos = self.conexao.execute("SELECT COUNT(*) FROM arquivos").fetchone()[0]
+        return {'linhas': linhas, 'noticias': noticias, 'municipios': municipios, 'data_inicial': inicio,
+                'data_final': fim, 'arquivos_importados': arquivos}
+
+    def exportar_parquet(self, diretorio):
+        """
+        Grava o acervo como Parquet particionado por ano e mês (requer pyarrow), para outras ferramentas.
+        As colunas repetidas (termo, município, fonte...) vão como categorias, na memória e no arquivo.
+        """
+        cursor = self.conexao.execute("SELECT * FROM linhas")
+        colunas = [descricao[0] for descricao in cursor.description]
+        df = noticias_para_dataframe(
+            (dict(zip(colunas, linha)) for linha in cursor), COLUNAS_CATEGORICAS_ACERVO, colunas=colunas
+        )
+        df['ano'] = df['data'].str[:4].fillna('sem_data')
+        df['mes'] = df['data'].str[5:7].fillna('sem_data')
+        df.to_parquet(diretorio, partition_cols=['ano', 'mes'], index=False)
+        return len(df)
+
+    def fechar(self):
+        self.conexao.close()
+
+
+class SaidaAcervo:
+    """Saída que acrescenta as notícias ao acervo, em lotes (mesma interface de `auxiliar.saidas`)."""
+
+    def __init__(self, acervo, origem=None, linhas_por_lote=500):
+        from auxiliar.pos_processamento import explodir_noticia
+
+        self._explodir = explodir_noticia
+        self.acervo = acervo
+        self.origem = origem
+        self.linhas_por_lote = linhas_por_lote
+        self.novas = 0
+        self._pendentes = []
+
+    def escrever(self, noticia):
+        self._pendentes.extend(self._explodir(noticia))
+        if len(self._pendentes) >= self.linhas_por_lote:
+            self.flush()
+
+    def flush(self):
+        if self._pendentes:
+            self.novas += self.acervo.adicionar(self._pendentes, self.origem)
+            self._pendentes = []
+
+    def fechar(self):
+        self.flush()
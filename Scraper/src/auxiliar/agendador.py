@@ -0,0 +1,145 @@
+"""
+Agenda do modo serviço (`--servico`): cada termo é buscado de novo a cada `intervalo` segundos, com
+uma prioridade, em vez de todos os termos na mesma frequência a cada execução do cron.
+
+A agenda é um JSON com uma lista de entradas; cada entrada tem um arquivo de termos (`termos`, um
+termo por linha, como no `-t`) ou um único `termo`, o intervalo em minutos e a prioridade (menor
+primeiro quando vários termos vencem juntos):
+
+    [
+        {"termos": "termos_para_pesquisa_ilicitos.txt", "intervalo_min": 60, "prioridade": 0},
+        {"termos": "termos_para_pesquisa_eventos.txt", "intervalo_min": 360, "prioridade": 2},
+        {"termo": "Operação Overclean Bahia", "intervalo_min": 15}
+    ]
+
+Caminhos relativos são resolvidos a partir do diretório do JSON. Os intervalos recebem uma variação
+aleatória (`jitter`) para os termos não vencerem sempre juntos, e todas as buscas passam por um
+`LimitadorTaxa` global.
+"""
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+
+TermoAgendado = namedtuple('TermoAgendado', ['palavra', 'intervalo', 'prioridade'])
+
+PRIORIDADE_PADRAO = 1
+
+
+def ler_termos(caminho):
+    """Termos de um arquivo .txt, um por linha (linhas vazias são ignoradas)."""
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return [linha.strip() for linha in f if linha.strip()]
+
+
+def carregar_agenda(caminho):
+    """Lê a agenda JSON e retorna a lista de `TermoAgendado` (intervalo em segundos)."""
+    with open(caminho, 'r', encoding='utf-8') as f:
+        entradas = json.load(f)
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+
+    agenda = {}
+    for entrada in entradas:
+        intervalo = float(entrada.get('intervalo_min', 0)) * 60
+        if intervalo <= 0:
+            raise ValueError(f"Entrada da agenda sem 'intervalo_min' positivo: {entrada}")
+        prioridade = int(entrada.get('prioridade', PRIORIDADE_PADRAO))
+        if 'termo' in entrada:
+            palavras = [entrada['termo'].strip()]
+        elif 'termos' in entrada:
+            palavras = ler_termos(os.path.join(diretorio, entrada['termos']))
+        else:
+            raise ValueError(f"Entrada da agenda sem 'termo' nem 'termos': {entrada}")
+        for palavra in palavras:
+            # Um termo repetido em várias entradas fica com a mais frequente
+            anterior = agenda.get(palavra)
+            if anterior is None or intervalo < anterior.intervalo:
+                agenda[palavra] = TermoAgendado(palavra, intervalo, prioridade)
+    return list(agenda.values())
+
+
+class Agendador:
+    """
+    Fila dos termos pela próxima busca (heap por horário, prioridade e ordem da agenda).
+
+    Args:
+        termos (list): `TermoAgendado`s; todos vencem no início.
+        jitter (float): variação aleatória dos intervalos, como fração (0.1 = ±10%).
+        espera_falha (float): segundos até tentar de novo um termo cuja busca falhou (limitado ao intervalo).
+    """
+
+    def __init__(self, termos, jitter=0.1, espera_falha=300, relogio=time.time, semente=None):
+        self.jitter = jitter
+        self.espera_falha = espera_falha
+        self.relogio = relogio
+        self._aleatorio = random.Random(semente)
+        self._ordem = itertools.count()
+        agora = relogio()
+        self._fila = [(agora, termo.prioridade, next(self._ordem), termo) for termo in termos]
+        heapq.heapify(self._fila)
+
+    def __len__(self):
+        return len(self._fila)
+
+    def __contains__(self, termo):
+        return any(entrada[3] is termo for entrada in self._fila)
+
+    def proximo_horario(self):
+        return self._fila[0][0] if self._fila else None
+
+    def vencidos(self):
+        """Retira da fila os termos já vencidos, em ordem de prioridade (e de horário, entre iguais)."""
+        agora = self.relogio()
+        vencidos = []
+        while self._fila and self._fila[0][0] <= agora:
+            vencidos.append(heapq.heappop(self._fila))
+        vencidos.sort(key=lambda entrada: (entrada[1], entrada[0], entrada[2]))
+        return [termo for _, _, _, termo in vencidos]
+
+    def reagendar(self, termo, sucesso=True):
+        """Recoloca o termo na fila: depois do seu intervalo (com jitter) ou, se falhou, de `espera_falha`."""
+        intervalo = termo.intervalo if sucesso else min(termo.intervalo, self.espera_falha)
+        if self.jitter:
+            intervalo *= 1 + self._aleatorio.uniform(-self.jitter, self.jitter)
+        heapq.heappush(self._fila, (self.relogio() + intervalo, termo.prioridade, next(self._ordem), termo))
+
+
+class LimitadorTaxa:
+    """
+    Limite global de buscas (balde de fichas): no máximo `requisicoes_por_minuto` em média, com
+    rajadas de até `rajada`, mais uma espera aleatória de até `jitter` segundos antes de cada busca.
+    Pode ser compartilhado entre threads.
+    """
+
+    def __init__(self, requisicoes_por_minuto, rajada=1, jitter=0.0, relogio=time.monotonic, dormir=time.sleep):
+        self.taxa = requisicoes_por_minuto / 60
+        self.rajada = rajada
+        self.jitter = jitter
+        self.relogio = relogio
+        self.dormir = dormir
+        self._fichas = float(rajada)
+        self._ultimo = relogio()
+        self._lock = threading.Lock()
+        self.espera_total = 0.0
+
+    def aguardar(self):
+        """Bloqueia até a próxima busca ser permitida; retorna o tempo esperado, em segundos."""
+        with self._lock:
+            agora = self.relogio()
+            self._fichas = min(self.rajada, self._fichas + (agora - self._ultimo) * self.taxa)
+            self._ultimo = agora
+            espera = 0.0
+            if self._fichas < 1:
+                espera = (1 - self._fichas) / self.taxa
+            # A ficha é reservada já, então as próximas chamadas esperam depois desta
+            self._fichas -= 1
+            if self.jitter:
+                espera += random.uniform(0, self.jitter)
+            self.espera_total += espera
+        if espera > 0:
+            self.dormir(espera)
+        return espera
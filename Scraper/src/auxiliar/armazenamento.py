@@ -0,0 +1,79 @@
+"""
+Base persistente (SQLite) das notícias já processadas, usada no modo incremental.
+Guarda cada link processado junto com os campos extraídos e os municípios, para que execuções
+seguintes só processem notícias novas e possam exportar tanto o delta quanto a base completa.
+"""
+import sqlite3
+from datetime import datetime
+
+from auxiliar.registros import Noticia
+
+CAMPOS_NOTICIA = (
+    'titulo', 'conteudo', 'fonte', 'datetime', 'link', 'img_url', 'palavra_chave', 'municipios_citados'
+)
+
+
+class BaseNoticias:
+    """
+    Base de notícias em um arquivo SQLite.
+    As quase duplicadas de outras notícias também são registradas (com `descartada=1`) para não serem
+    reprocessadas, mas não entram na exportação completa. Notícias fora da janela de datas não chegam
+    à base: são descartadas antes, em `main.preparar_itens`.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute(
+            """
+            CREATE TABLE IF NOT EXISTS noticias (
+                link TEXT PRIMARY KEY,
+                titulo TEXT,
+                conteudo TEXT,
+                fonte TEXT,
+                datetime TEXT,
+                img_url TEXT,
+                palavra_chave TEXT,
+                municipios_citados TEXT,
+                descartada INTEGER NOT NULL DEFAULT 0,
+                coletado_em TEXT NOT NULL
+            )
+            """
+        )
+        self.conexao.commit()
+
+    def links_processados(self):
+        """Retorna o conjunto de todos os links já processados em execuções anteriores."""
+        return {linha[0] for linha in self.conexao.execute("SELECT link FROM noticias")}
+
+    def registrar(self, item_dict, descartada=False):
+        """Registra uma notícia processada. Links já existentes são mantidos como estão."""
+        self.conexao.execute(
+            """
+            INSERT OR IGNORE INTO noticias
+                (link, titulo, conteudo, fonte, datetime, img_url, palavra_chave, municipios_citados,
+                 descartada, coletado_em)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                item_dict['link'], item_dict.get('titulo'), item_dict.get('conteudo'), item_dict.get('fonte'),
+                item_dict.get('datetime'), item_dict.get('img_url'), item_dict.get('palavra_chave'),
+                item_dict.get('municipios_citados'), int(descartada), datetime.now().isoformat(timespec='seconds'),
+            )
+        )
+
+    def salvar(self):
+        """Confirma as notícias registradas desde a última chamada."""
+        self.conexao.commit()
+
+    def todas_noticias(self):
+        """Retorna todas as notícias não descartadas (`registros.Noticia`), na ordem em que foram coletadas."""
+        cursor = self.conexao.execute(
+            f"SELECT {', '.join(CAMPOS_NOTICIA)} FROM noticias WHERE descartada = 0 ORDER BY rowid"
+        )
+        return [Noticia(**dict(zip(CAMPOS_NOTICIA, linha))) for linha in cursor]
+
+    def fechar(self):
+        self.conexao.commit()
+        self.conexao.close()
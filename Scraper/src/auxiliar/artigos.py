@@ -0,0 +1,180 @@
+"""
+Enriquecimento opcional: baixa o texto completo das notícias novas para servir de contexto na
+desambiguação dos municípios (o trecho da página de busca costuma ser curto demais para decidir
+nomes ambíguos como "Santana" ou "Feira").
+
+Os links das páginas de busca são intermediários do Google News, então antes do download eles são
+trocados pelos endereços das notícias nos sites (ver `auxiliar.links_canonicos`): o que se baixa é a
+notícia, e o limite por host vale para cada site, não para o Google.
+Os downloads de uma página de resultados rodam em paralelo com asyncio, limitados no total e por
+host, reaproveitando as conexões de uma `requests.Session` (cada requisição roda em uma thread via
+`asyncio.to_thread`). Os textos extraídos ficam em cache em memória (limitado aos mais recentes) e,
+opcionalmente, em disco; com um `CachePaginas` o HTML das notícias também é guardado, para repetir a
+execução offline. Downloads que falharam não entram no cache e são tentados de novo na próxima vez.
+"""
+import asyncio
+import hashlib
+import os
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from auxiliar.coletores import USER_AGENT
+from auxiliar.instrumentacao import metricas
+
+# Tags que não fazem parte do texto principal da notícia
+TAGS_IGNORADAS = ('script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'iframe', 'svg')
+
+
+def extrair_texto_principal(html, tamanho_maximo=20000):
+    """
+    Extrai o texto principal de uma página de notícia: o conteúdo de <article> (ou, sem ele, os
+    parágrafos <p> da página), sem menus, rodapés e scripts.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup(TAGS_IGNORADAS):
+        tag.decompose()
+
+    raiz = soup.find('article') or soup.body or soup
+    paragrafos = [p.get_text(" ", strip=True) for p in raiz.find_all('p')]
+    texto = "\n".join(p for p in paragrafos if p)
+    if not texto:
+        texto = raiz.get_text(" ", strip=True)
+    return texto[:tamanho_maximo]
+
+
+class BuscadorArtigos:
+    """
+    Baixa e extrai o texto das notícias em paralelo.
+
+    Args:
+        concorrencia_total (int): downloads simultâneos no total.
+        concorrencia_por_host (int): downloads simultâneos para um mesmo site.
+        timeout (float): tempo máximo (s) de cada requisição.
+        diretorio_cache (str | None): diretório para guardar os textos extraídos entre execuções.
+        cache_paginas (CachePaginas | None): cache do HTML das notícias (ver `auxiliar.cache_paginas`).
+        offline (bool): não acessa a rede; só usa as notícias que estão em cache.
+        resolvedor_links (ResolvedorLinks | None): troca os links do Google News pelos das notícias antes
+            do download (None: os links são baixados como vieram).
+        max_cache_memoria (int): textos mantidos no cache em memória; os mais antigos saem primeiro.
+    """
+
+    def __init__(self, concorrencia_total=16, concorrencia_por_host=4, timeout=10, diretorio_cache=None,
+                 cache_paginas=None, offline=False, resolvedor_links=None, max_cache_memoria=2000):
+        self.concorrencia_total = concorrencia_total
+        self.concorrencia_por_host = concorrencia_por_host
+        self.timeout = timeout
+        self.diretorio_cache = diretorio_cache
+        if diretorio_cache:
+            os.makedirs(diretorio_cache, exist_ok=True)
+        self.cache = {}
+        self.max_cache_memoria = max_cache_memoria
+        self.cache_paginas = cache_paginas
+        self.offline = offline
+        self.resolvedor_links = resolvedor_links
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Language': 'pt-BR,pt;q=0.9',
+        })
+        adapter = HTTPAdapter(pool_connections=concorrencia_total, pool_maxsize=concorrencia_total, max_retries=1)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _caminho_cache(self, link):
+        return os.path.join(self.diretorio_cache, hashlib.sha1(link.encode('utf-8')).hexdigest() + '.txt')
+
+    def _ler_cache(self, link):
+        if link in self.cache:
+            return self.cache[link]
+        if self.diretorio_cache:
+            try:
+                with open(self._caminho_cache(link), 'r', encoding='utf-8') as f:
+                    texto = f.read()
+            except OSError:
+                return None
+            if texto:
+                self._guardar_em_memoria(link, texto)
+                return texto
+        return None
+
+    def _guardar_em_memoria(self, link, texto):
+        self.cache[link] = texto
+        # Dicionários mantêm a ordem de inserção: os primeiros são os mais antigos
+        while len(self.cache) > self.max_cache_memoria:
+            del self.cache[next(iter(self.cache))]
+
+    def _gravar_cache(self, link, texto):
+        # Falhas não vão para o cache, para serem tentadas de novo (no modo serviço, no próximo ciclo)
+        if not texto:
+            return
+        self._guardar_em_memoria(link, texto)
+        if self.diretorio_cache:
+            with open(self._caminho_cache(link), 'w', encoding='utf-8') as f:
+                f.write(texto)
+
+    def _baixar_texto(self, link):
+        if self.cache_paginas is not None:
+            html = self.cache_paginas.obter(link, ignorar_ttl=self.offline)
+            if html is not None:
+                return extrair_texto_principal(html.decode('utf-8', errors='replace'))
+        if self.offline:
+            return ''
+        try:
+            resposta = self.session.get(link, timeout=self.timeout)
+            resposta.raise_for_status()
+        except requests.RequestException as e:
+            print(f" Erro ao baixar a notícia '{link}': {e}")
+            return ''
+        if 'html' not in resposta.headers.get('Content-Type', 'text/html'):
+            return ''
+        if self.cache_paginas is not None:
+            self.cache_paginas.guardar(link, resposta.text)
+        return extrair_texto_principal(resposta.text)
+
+    async def _buscar(self, link, limite_total, limites_por_host):
+        host = urlsplit(link).netloc
+        async with limites_por_host[host], limite_total:
+            texto = await asyncio.to_thread(self._baixar_texto, link)
+        self._gravar_cache(link, texto)
+        metricas.contar('artigos_baixados' if texto else 'artigos_sem_texto')
+        return link, texto
+
+    async def _buscar_todos(self, links):
+        limite_total = asyncio.Semaphore(self.concorrencia_total)
+        limites_por_host = defaultdict(lambda: asyncio.Semaphore(self.concorrencia_por_host))
+        return await asyncio.gather(*(self._buscar(link, limite_total, limites_por_host) for link in links))
+
+    def buscar_textos(self, links):
+        """
+        Retorna {link: texto} para os links informados ('' quando não foi possível obter o texto).
+        Com `resolvedor_links`, cada link é baixado (e guardado no cache) pelo endereço da notícia no
+        site; links do Google que não puderam ser resolvidos não são baixados, porque o que viria é a
+        página intermediária do Google. Links já em cache não são baixados de novo.
+        """
+        links = list(dict.fromkeys(links))
+        if self.resolvedor_links is not None:
+            destinos = self.resolvedor_links.resolver(links)
+        else:
+            destinos = {link: link for link in links}
+        textos = {}
+        pendentes = []
+        for destino in dict.fromkeys(destinos.values()):
+            texto = self._ler_cache(destino)
+            if texto is not None:
+                textos[destino] = texto
+                metricas.contar('artigos_em_cache')
+            elif self.resolvedor_links is not None and self.resolvedor_links.link_google(destino):
+                metricas.contar('artigos_sem_link_canonico')
+            else:
+                pendentes.append(destino)
+        if pendentes:
+            textos.update(asyncio.run(self._buscar_todos(pendentes)))
+        return {link: textos.get(destinos[link], '') for link in links}
+
+    def fechar(self):
+        self.session.close()
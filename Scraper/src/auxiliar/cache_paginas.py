@@ -0,0 +1,128 @@
+"""
+Cache em disco das páginas baixadas (buscas do Google News e notícias), para repetir uma execução
+sem acessar a rede: com `--offline` a saída inteira é reconstruída a partir das páginas em cache,
+o que permite ajustar as regras de extração e de municípios e rodar de novo em segundos.
+
+Cada página é guardada comprimida (gzip) em um arquivo cujo nome é o sha256 da URL. Um índice
+SQLite guarda a URL, o tamanho e as datas de criação e de último acesso, usadas para expirar as
+páginas (TTL) e para remover as menos usadas quando o cache passa do tamanho máximo (LRU).
+"""
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from auxiliar.instrumentacao import metricas
+
+
+class CachePaginas:
+    """
+    Cache de páginas indexado pela URL.
+
+    Args:
+        diretorio (str): onde ficam as páginas e o índice.
+        ttl (float | None): validade das páginas, em segundos (None: não expiram).
+        tamanho_maximo (int | None): tamanho máximo do cache, em bytes comprimidos (None: sem limite).
+    """
+
+    def __init__(self, diretorio, ttl=None, tamanho_maximo=None):
+        self.diretorio = diretorio
+        self.ttl = ttl
+        self.tamanho_maximo = tamanho_maximo
+        os.makedirs(diretorio, exist_ok=True)
+        # Os coletores e o download das notícias usam o cache a partir de várias threads
+        self._lock = threading.Lock()
+        self.conexao = sqlite3.connect(os.path.join(diretorio, 'indice.sqlite3'), check_same_thread=False)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute(
+            """
+            CREATE TABLE IF NOT EXISTS paginas (
+                chave TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                tamanho INTEGER NOT NULL,
+                criado_em REAL NOT NULL,
+                acessado_em REAL NOT NULL
+            )
+            """
+        )
+        self.conexao.commit()
+
+    @staticmethod
+    def chave(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave[:2], chave + '.gz')
+
+    def _remover(self, chave):
+        self.conexao.execute("DELETE FROM paginas WHERE chave = ?", (chave,))
+        try:
+            os.remove(self._caminho(chave))
+        except OSError:
+            pass
+
+    def obter(self, url, ignorar_ttl=False):
+        """Retorna o conteúdo (bytes) guardado para a URL, ou None se não estiver no cache ou tiver expirado."""
+        chave = self.chave(url)
+        with self._lock:
+            linha = self.conexao.execute("SELECT criado_em FROM paginas WHERE chave = ?", (chave,)).fetchone()
+            agora = time.time()
+            if linha is None or (self.ttl is not None and not ignorar_ttl and agora - linha[0] > self.ttl):
+                metricas.contar('cache_faltas')
+                return None
+            try:
+                with gzip.open(self._caminho(chave), 'rb') as f:
+                    conteudo = f.read()
+            except OSError:
+                self._remover(chave)
+                self.conexao.commit()
+                metricas.contar('cache_faltas')
+                return None
+            self.conexao.execute("UPDATE paginas SET acessado_em = ? WHERE chave = ?", (agora, chave))
+            self.conexao.commit()
+        metricas.contar('cache_acertos')
+        return conteudo
+
+    def guardar(self, url, conteudo):
+        """Guarda a página (str ou bytes) da URL, substituindo a anterior."""
+        if isinstance(conteudo, str):
+            conteudo = conteudo.encode('utf-8')
+        chave = self.chave(url)
+        caminho = self._caminho(chave)
+        comprimido = gzip.compress(conteudo)
+        with self._lock:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f"{caminho}.{threading.get_ident()}.tmp"
+            with open(temporario, 'wb') as f:
+                f.write(comprimido)
+            os.replace(temporario, caminho)
+            agora = time.time()
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO paginas (chave, url, tamanho, criado_em, acessado_em) VALUES (?, ?, ?, ?, ?)",
+                (chave, url, len(comprimido), agora, agora)
+            )
+            self._aplicar_limite()
+            self.conexao.commit()
+
+    def _aplicar_limite(self):
+        """Remove as páginas acessadas há mais tempo até o cache caber em `tamanho_maximo`."""
+        if self.tamanho_maximo is None:
+            return
+        total = self.conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM paginas").fetchone()[0]
+        if total <= self.tamanho_maximo:
+            return
+        for chave, tamanho in self.conexao.execute(
+            "SELECT chave, tamanho FROM paginas ORDER BY acessado_em"
+        ).fetchall():
+            self._remover(chave)
+            metricas.contar('cache_removidas')
+            total -= tamanho
+            if total <= self.tamanho_maximo:
+                break
+
+    def fechar(self):
+        with self._lock:
+            self.conexao.commit()
+            self.conexao.close()
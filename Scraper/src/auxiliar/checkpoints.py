@@ -0,0 +1,106 @@
+"""
+Checkpoints por termo de busca, para retomar uma execução interrompida (queda do Chrome, reinício
+da máquina, Ctrl-C) sem refazer os termos já concluídos.
+
+Cada execução tem um identificador (`run_id`) e um arquivo SQLite `<diretorio>/<run_id>.sqlite3` com
+os termos concluídos, as notícias processadas em cada um (aceitas ou quase duplicadas) e os links já
+vistos. Notícias fora da janela de datas não são registradas: são descartadas antes, em
+`main.preparar_itens`. Tudo o que um termo produziu é gravado em uma única
+transação quando ele termina: um termo interrompido no meio não deixa nada pela metade e é refeito
+por inteiro na retomada (`--resume <run_id>`).
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from auxiliar.registros import Noticia
+
+# 'descartada' só aparece em checkpoints gravados antes da janela de datas (filtro de ano)
+SITUACOES = ('aceita', 'descartada', 'duplicata')
+
+
+def novo_run_id():
+    return datetime.now().strftime('%Y-%m-%d_%H%M%S')
+
+
+def caminho_checkpoint(diretorio, run_id):
+    return os.path.join(diretorio, f"{run_id}.sqlite3")
+
+
+class CheckpointExecucao:
+    """Checkpoint de uma execução, guardado em `<diretorio>/<run_id>.sqlite3`."""
+
+    def __init__(self, diretorio, run_id):
+        self.run_id = run_id
+        os.makedirs(diretorio, exist_ok=True)
+        self.caminho = caminho_checkpoint(diretorio, run_id)
+        self.conexao = sqlite3.connect(self.caminho)
+        self.conexao.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT);
+            CREATE TABLE IF NOT EXISTS termos (palavra TEXT PRIMARY KEY, concluido_em TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS itens (
+                ordem INTEGER PRIMARY KEY AUTOINCREMENT,
+                palavra TEXT NOT NULL,
+                situacao TEXT NOT NULL,
+                dados TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS links (link TEXT PRIMARY KEY);
+            """
+        )
+        self.conexao.commit()
+        # Notícias registradas por termo: com o pipeline, um termo pode ser preparado antes de os anteriores terminarem
+        self._pendentes = {}
+
+    def obter(self, chave, padrao=None):
+        linha = self.conexao.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+        return json.loads(linha[0]) if linha else padrao
+
+    def definir(self, chave, valor):
+        with self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", (chave, json.dumps(valor, ensure_ascii=False))
+            )
+
+    def termos_concluidos(self):
+        return {palavra for (palavra,) in self.conexao.execute("SELECT palavra FROM termos")}
+
+    def links(self):
+        return {link for (link,) in self.conexao.execute("SELECT link FROM links")}
+
+    def itens(self):
+        """Notícias dos termos concluídos, na ordem em que foram processadas: (palavra, situacao, noticia)."""
+        cursor = self.conexao.execute("SELECT palavra, situacao, dados FROM itens ORDER BY ordem")
+        return [(palavra, situacao, Noticia(**json.loads(dados))) for palavra, situacao, dados in cursor]
+
+    def registrar(self, palavra, noticia, situacao='aceita'):
+        """Guarda uma notícia do termo em andamento; só é gravada no `concluir_termo` do termo."""
+        if situacao not in SITUACOES:
+            raise ValueError(f"Situação desconhecida: {situacao}")
+        self._pendentes.setdefault(palavra, []).append((palavra, situacao, json.dumps(dict(noticia), ensure_ascii=False)))
+
+    def concluir_termo(self, palavra, links):
+        """
+        Grava, em uma transação, o termo como concluído, as notícias registradas para ele e os links
+        vistos. As notícias registradas para outros termos continuam pendentes.
+        """
+        with self.conexao:
+            self.conexao.executemany(
+                "INSERT INTO itens (palavra, situacao, dados) VALUES (?, ?, ?)", self._pendentes.get(palavra, [])
+            )
+            self.conexao.executemany("INSERT OR IGNORE INTO links (link) VALUES (?)", ((link,) for link in links))
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO termos (palavra, concluido_em) VALUES (?, ?)",
+                (palavra, datetime.now().isoformat(timespec='seconds'))
+            )
+        self._pendentes.pop(palavra, None)
+
+    def fechar(self):
+        self._pendentes = {}
+        self.conexao.close()
+
+    def remover(self):
+        """Apaga o checkpoint (usado quando a execução termina sem erros)."""
+        self.fechar()
+        os.remove(self.caminho)
@@ -0,0 +1,303 @@
+"""
+Coletores das páginas de busca do Google News.
+Todos expõem `coletar(palavra)`, que devolve a lista de itens extraídos (ver `auxiliar.extracao`),
+ou None quando a página não pôde ser obtida (erro de rede, timeout, queda do navegador), e `fechar()`,
+que libera os recursos (navegador, conexões).
+
+- ColetorSelenium: abre a busca no Chrome headless e faz scroll (comportamento original).
+- ColetorHttp: baixa a busca HTML ou o feed RSS via requests, com conexões keep-alive reaproveitadas.
+- ColetorArquivos: lê páginas salvas em disco, para testes offline.
+- ColetorCache: reconstrói a coleta só com as páginas do cache (`auxiliar.cache_paginas`), sem rede.
+
+ColetorSelenium e ColetorHttp aceitam um `CachePaginas`: a página de busca é guardada já renderizada
+(depois do scroll) e, enquanto estiver válida, é usada no lugar de um novo acesso.
+Com uma `JanelaDatas` (ver `auxiliar.janela_datas`), a busca é restrita ao período e o scroll para
+quando a página passa a trazer só notícias anteriores a ele.
+"""
+import os
+import re
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from auxiliar.extracao import extrair_itens_html, extrair_itens_rss, verificar_parser_html
+from auxiliar.instrumentacao import metricas
+from auxiliar.navegador import GerenciadorNavegador
+
+# URL raiz do Google News
+root_url = 'https://news.google.com'
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+BACKENDS = ('selenium', 'http', 'rss', 'arquivos')
+
+
+def montar_url_busca(palavra, base_url=root_url, formato='html', janela=None):
+    """
+    Monta a URL da busca (HTML) ou do feed RSS do Google News para um termo.
+    Com `janela` (JanelaDatas), os operadores de data dela são acrescentados à consulta.
+    """
+    operadores = janela.operadores_busca() if janela is not None else ''
+    query_text = f"{palavra} {operadores}".strip().replace(' ', '+')
+    if formato == 'rss':
+        return f"{base_url}/rss/search?q={query_text}&hl=pt-BR&gl=BR&ceid=BR:pt-419"
+    return f"{base_url}/search?q={query_text}&hl=pt-BR&gl=BR&ceid=BR%3Apt-419"
+
+
+def nome_arquivo_termo(palavra):
+    """Nome de arquivo estável para um termo de busca (usado pelas fixtures salvas)."""
+    return re.sub(r'[^\w]+', '_', palavra.strip().lower()).strip('_')
+
+
+def pagina_em_cache(cache, link, ignorar_ttl=False):
+    """Conteúdo da página em cache para o link (bytes), ou None sem cache ou sem página válida."""
+    if cache is None:
+        return None
+    conteudo = cache.obter(link, ignorar_ttl=ignorar_ttl)
+    if conteudo is not None:
+        print(f"Usando página em cache: {link}")
+    return conteudo
+
+
+class ColetorSelenium:
+    """
+    Abre a busca no Chrome headless, faz scroll até a página parar de trazer notícias novas
+    (ver `auxiliar.rolagem`) e extrai os itens do HTML renderizado.
+    `tempo_limite` é o orçamento de tempo de scroll por termo, em segundos.
+    O navegador é reciclado pelo `GerenciadorNavegador` (ver `auxiliar.navegador`); buscas em que o
+    navegador falha são repetidas, com um navegador novo, mais `tentativas` vezes, com espera crescente
+    a partir de `espera_tentativa` segundos.
+    Com `janela`, o scroll também para quando um scroll só traz notícias anteriores a ela.
+    """
+
+    def __init__(self, base_url=root_url, max_scrolls=20, tempo_limite=None, parser_html='html.parser', cache=None,
+                 max_consultas_navegador=50, memoria_max_navegador=None, bloquear_recursos=True, tentativas=2,
+                 espera_tentativa=5.0, janela=None):
+        self.base_url = base_url
+        self.janela = janela
+        self.parser_html = parser_html
+        self.cache = cache
+        self.max_scrolls = max_scrolls
+        self.tempo_limite = tempo_limite
+        self.tentativas = tentativas
+        self.espera_tentativa = espera_tentativa
+        self.estatisticas_scroll = []
+        self.navegador = GerenciadorNavegador(
+            max_consultas=max_consultas_navegador, memoria_max_mb=memoria_max_navegador,
+            bloquear_recursos=bloquear_recursos
+        )
+
+    @property
+    def estatisticas_navegadores(self):
+        return self.navegador.resumo()
+
+    def coletar(self, palavra):
+        from selenium.common.exceptions import TimeoutException
+
+        link = montar_url_busca(palavra, self.base_url, janela=self.janela)
+        conteudo = pagina_em_cache(self.cache, link)
+        if conteudo is not None:
+            return extrair_itens_html(conteudo.decode('utf-8', errors='replace'), self.base_url, self.parser_html)
+
+        for tentativa in range(self.tentativas + 1):
+            if tentativa:
+                espera = self.espera_tentativa * 2 ** (tentativa - 1)
+                print(f" Nova tentativa ({tentativa + 1}/{self.tentativas + 1}) para '{palavra}' em {espera:.0f}s.")
+                metricas.contar('tentativas_repetidas', termo=palavra)
+                time.sleep(espera)
+
+            try:
+                # Dentro do try: uma falha ao abrir o Chrome (ou o chromedriver) também é repetida
+                pagina = self._carregar(self.navegador.obter(), palavra, link)
+            except TimeoutException:
+                # A página abriu mas não mostrou notícias (busca vazia ou bloqueio): repetir não adianta
+                print(f" Timeout ao carregar a página de busca para: {palavra}. Pulando.")
+                self.navegador.registrar_falha(None, reiniciar=False)
+                return None
+            except Exception as e:
+                # Erros do WebDriver, inclusive a queda do Chrome ou do chromedriver ao abrir ou no meio do scroll
+                print(f" Erro ao acessar ou carregar a página de busca para '{palavra}': {e}")
+                self.navegador.registrar_falha(e)
+            else:
+                if self.cache is not None:
+                    self.cache.guardar(link, pagina)
+                return extrair_itens_html(pagina, self.base_url, self.parser_html)
+
+        print(f" Não foi possível carregar a busca para '{palavra}' após {self.tentativas + 1} tentativas. Pulando.")
+        return None
+
+    def _carregar(self, driver, palavra, link):
+        """Abre a busca, faz o scroll e devolve o HTML renderizado."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        from auxiliar.rolagem import rolar_ate_saturar
+
+        inicio = time.perf_counter()
+        print(f"Acessando: {link}")
+        with metricas.etapa('carregar_pagina', termo=palavra):
+            driver.get(link)
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "div.UW0SDc, article"))
+            )
+        print("Página carregada e elementos de notícias encontrados.")
+
+        print(f"Iniciando scroll para carregar mais notícias (max {self.max_scrolls} scrolls)...")
+        with metricas.etapa('scroll', termo=palavra):
+            estatisticas = rolar_ate_saturar(
+                driver, max_scrolls=self.max_scrolls, tempo_limite=self.tempo_limite,
+                data_minima=self.janela.limites()[0] if self.janela is not None else None
+            )
+        metricas.contar('scrolls', estatisticas['scrolls'], termo=palavra)
+        self.estatisticas_scroll.append(dict(estatisticas, palavra=palavra))
+        print(
+            f"Scroll concluído: {estatisticas['scrolls']} scrolls, {estatisticas['total_links']} links "
+            f"(novos por scroll: {estatisticas['itens_por_scroll']}), {estatisticas['tempo']:.1f}s ({estatisticas['motivo']})."
+        )
+
+        pagina = driver.page_source
+        self.navegador.registrar_consulta(time.perf_counter() - inicio)
+        return pagina
+
+    def fechar(self):
+        self.navegador.fechar()
+
+
+class ColetorHttp:
+    """
+    Baixa a busca do Google News sem navegador, usando uma `requests.Session` com pool de conexões
+    keep-alive. Com formato='rss' usa o feed /rss/search, que é mais leve e estável que o HTML.
+    `base_url` pode apontar para um servidor local (stub) em testes offline.
+    """
+
+    def __init__(self, base_url=root_url, formato='html', timeout=15, tamanho_pool=10, parser_html='html.parser',
+                 cache=None, janela=None):
+        self.base_url = base_url.rstrip('/')
+        self.janela = janela
+        self.parser_html = parser_html
+        self.cache = cache
+        self.formato = formato
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Language': 'pt-BR,pt;q=0.9',
+        })
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool, max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def coletar(self, palavra):
+        link = montar_url_busca(palavra, self.base_url, self.formato, self.janela)
+        conteudo = pagina_em_cache(self.cache, link)
+        if conteudo is None:
+            print(f"Acessando: {link}")
+            try:
+                with metricas.etapa('carregar_pagina', termo=palavra):
+                    resposta = self.session.get(link, timeout=self.timeout)
+                resposta.raise_for_status()
+            except requests.RequestException as e:
+                print(f" Erro ao acessar a busca para '{palavra}': {e}. Pulando.")
+                return None
+            # O HTML vai para o cache já decodificado (em utf-8); o RSS, como veio
+            conteudo = resposta.content if self.formato == 'rss' else resposta.text.encode('utf-8')
+            if self.cache is not None:
+                self.cache.guardar(link, conteudo)
+
+        if self.formato == 'rss':
+            return extrair_itens_rss(conteudo, self.base_url)
+        return extrair_itens_html(conteudo.decode('utf-8', errors='replace'), self.base_url, self.parser_html)
+
+    def fechar(self):
+        self.session.close()
+
+
+class ColetorArquivos:
+    """
+    Lê páginas de busca salvas em disco em vez de acessar a rede.
+    Para cada termo procura `<diretorio>/<termo_normalizado>.html` (ou `.xml` para feeds RSS).
+    """
+
+    def __init__(self, diretorio, base_url=root_url, parser_html='html.parser'):
+        self.diretorio = diretorio
+        self.base_url = base_url
+        self.parser_html = parser_html
+
+    def coletar(self, palavra):
+        nome = nome_arquivo_termo(palavra)
+        for extensao in ('.html', '.xml'):
+            caminho = os.path.join(self.diretorio, nome + extensao)
+            if os.path.exists(caminho):
+                print(f"Lendo página salva: {caminho}")
+                with open(caminho, 'rb') as f:
+                    conteudo = f.read()
+                if extensao == '.html':
+                    return extrair_itens_html(conteudo.decode('utf-8', errors='replace'), self.base_url, self.parser_html)
+                return extrair_itens_rss(conteudo, self.base_url)
+
+        print(f" Nenhuma página salva para '{palavra}' em {self.diretorio}. Pulando.")
+        return []
+
+    def fechar(self):
+        pass
+
+
+class ColetorCache:
+    """
+    Modo offline (`--offline`/`--replay`): usa só as páginas de busca guardadas no cache, mesmo
+    expiradas, sem abrir o navegador nem acessar a rede. Termos sem página em cache são pulados.
+    """
+
+    def __init__(self, cache, base_url=root_url, formato='html', parser_html='html.parser', janela=None):
+        self.cache = cache
+        self.janela = janela
+        self.base_url = base_url.rstrip('/')
+        self.formato = formato
+        self.parser_html = parser_html
+
+    def coletar(self, palavra):
+        link = montar_url_busca(palavra, self.base_url, self.formato, self.janela)
+        conteudo = pagina_em_cache(self.cache, link, ignorar_ttl=True)
+        if conteudo is None:
+            print(f" Nenhuma página em cache para '{palavra}' ({link}). Pulando.")
+            return []
+        if self.formato == 'rss':
+            return extrair_itens_rss(conteudo, self.base_url)
+        return extrair_itens_html(conteudo.decode('utf-8', errors='replace'), self.base_url, self.parser_html)
+
+    def fechar(self):
+        pass
+
+
+def criar_coletor(backend='selenium', base_url=root_url, diretorio_fixtures=None, max_scrolls=20, tempo_limite=None,
+                  parser_html='html.parser', cache=None, offline=False, max_consultas_navegador=50,
+                  memoria_max_navegador=None, bloquear_recursos=True, tentativas=2, janela=None):
+    """
+    Cria o coletor correspondente ao backend escolhido na linha de comando.
+    Com `offline`, devolve um ColetorCache que lê as páginas que o backend guardou em `cache`.
+    `janela` (JanelaDatas) restringe as buscas ao período; as páginas salvas do backend 'arquivos' são lidas como estão.
+    """
+    verificar_parser_html(parser_html)
+    if offline:
+        if cache is None:
+            raise ValueError("O modo offline exige o cache de páginas (--cache).")
+        return ColetorCache(cache, base_url, formato='rss' if backend == 'rss' else 'html', parser_html=parser_html,
+                            janela=janela)
+    if backend == 'selenium':
+        return ColetorSelenium(base_url, max_scrolls=max_scrolls, tempo_limite=tempo_limite, parser_html=parser_html,
+                               cache=cache, max_consultas_navegador=max_consultas_navegador,
+                               memoria_max_navegador=memoria_max_navegador, bloquear_recursos=bloquear_recursos,
+                               tentativas=tentativas, janela=janela)
+    if backend == 'http':
+        return ColetorHttp(base_url, formato='html', parser_html=parser_html, cache=cache, janela=janela)
+    if backend == 'rss':
+        return ColetorHttp(base_url, formato='rss', cache=cache, janela=janela)
+    if backend == 'arquivos':
+        if not diretorio_fixtures:
+            raise ValueError("O backend 'arquivos' exige o diretório das páginas salvas (--fixtures).")
+        return ColetorArquivos(diretorio_fixtures, base_url, parser_html=parser_html)
+    raise ValueError(f"Backend de coleta desconhecido: {backend}")
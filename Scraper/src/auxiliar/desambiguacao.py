@@ -0,0 +1,167 @@
+"""
+Desambiguação dos municípios encontrados nos títulos das notícias.
+As tabelas de consulta, o índice componente -> municípios compostos e as expressões regulares de
+contexto geográfico são montados uma única vez em `DesambiguadorMunicipios`; cada notícia é
+pré-processada uma vez e resolvida em uma única passada pelos candidatos.
+Com municípios de várias UFs, nomes repetidos (homônimos) são resolvidos pelas UFs citadas na notícia
+(ver `ufs_citadas`).
+"""
+import functools
+import re
+import unicodedata
+
+from auxiliar.municipios import UFS, Municipio
+
+# Siglas de todas as UFs (ex.: "Lagarto (SE)", "Itabuna - BA"); só em maiúsculas, para "- se" ou ", pa"
+# no meio da frase não serem confundidos com siglas
+_SIGLAS_UF = '|'.join(UFS)
+_RE_SUFIXO_PARENTESES = re.compile(r'\s*\((?:' + _SIGLAS_UF + r')\)\s*')
+_RE_SUFIXO_HIFEN = re.compile(r'\s*-\s*(?:' + _SIGLAS_UF + r')\b\s*')
+_RE_SUFIXO_VIRGULA = re.compile(r',\s*(?:' + _SIGLAS_UF + r')\b')
+
+
+def normalize_text(text):
+    """Normaliza o texto removendo acentos e convertendo para minúsculas."""
+    if not isinstance(text, str):
+        return ""
+    try:
+        nfkd_form = unicodedata.normalize('NFKD', text.lower())
+        return "".join([c for c in nfkd_form if not unicodedata.combining(c)])
+    except Exception:
+
+        return text.lower()
+
+
+def pre_process_text_for_municipality_detection(text):
+    """Remove as siglas de UF depois dos nomes, como (BA), - SE ou , PE, do texto."""
+    if not isinstance(text, str):
+        return ""
+    # Com um espaço no lugar, a sigla no meio do título não cola as palavras ("Lagarto (SE) recebe")
+    text = _RE_SUFIXO_PARENTESES.sub(' ', text)
+    text = _RE_SUFIXO_HIFEN.sub(' ', text)
+    text = _RE_SUFIXO_VIRGULA.sub('', text)
+    return text.strip()
+
+
+_RE_SIGLA_UF = re.compile(r'(?:\(\s*|-\s*|/\s*|,\s*)(' + _SIGLAS_UF + r')\b')
+# "Pará" normalizado é a preposição "para": só conta pela sigla
+_NOMES_ESTADOS = {normalize_text(nome): uf for uf, nome in UFS.items() if normalize_text(nome) != 'para'}
+_RE_NOME_ESTADO = re.compile(
+    r'\b(' + '|'.join(sorted(map(re.escape, _NOMES_ESTADOS), key=len, reverse=True)) + r')\b'
+)
+
+
+def ufs_citadas(text):
+    """
+    Siglas das UFs mencionadas no texto original (antes do pré-processamento): siglas depois de
+    "(", "-", "/" ou "," (ex.: "Itabuna (BA)", "Palmas-TO") e nomes dos estados.
+    """
+    if not isinstance(text, str):
+        return set()
+    ufs = set(_RE_SIGLA_UF.findall(text))
+    ufs.update(_NOMES_ESTADOS[nome] for nome in _RE_NOME_ESTADO.findall(normalize_text(text)))
+    return ufs
+
+
+@functools.lru_cache(maxsize=1024)
+def compilar_padrao_geografico(normalized_name):
+    """
+    Compila, em uma única alternância, os padrões que indicam que o nome (já normalizado) é usado
+    como lugar: "prefeitura de X", "em X", "X prefeitura" etc.
+    """
+    nome = re.escape(normalized_name)
+    return re.compile(
+        rf"\b(prefeitura|município|cidade|câmara)\s+(?:de|do|da|d[oa]s?)\s+{nome}\b"
+        rf"|\b(?:em|na|no|de|do|da|para|às?)\s+{nome}\b"
+        rf"|\b{nome}\s+(?:prefeitura|município|cidade)\b",
+        re.IGNORECASE
+    )
+
+
+class DesambiguadorMunicipios:
+    """
+    Filtra os candidatos a município de uma notícia.
+
+    Args:
+        municipios (dict | iterable): {nome do município: código} ou `Municipio`s (ver
+            `auxiliar.municipios`), que podem ser de várias UFs.
+        palavras_ambiguas (set): nomes (normalizados) que só contam como município em contexto geográfico.
+    """
+
+    def __init__(self, municipios, palavras_ambiguas):
+        if isinstance(municipios, dict):
+            municipios = [Municipio(None, codigo, nome) for nome, codigo in municipios.items()]
+        # Nome normalizado -> municípios com esse nome (mais de um quando há homônimos em outras UFs)
+        self.municipios_por_nome = {}
+        for municipio in municipios:
+            self.municipios_por_nome.setdefault(normalize_text(municipio.nome), []).append(municipio)
+        self.municipio_lookup = {
+            nome: f"{entradas[0].nome}-{entradas[0].codigo}" for nome, entradas in self.municipios_por_nome.items()
+        }
+        self.nomes_normalizados = set(self.municipio_lookup)
+        self.homonimos = {nome for nome, entradas in self.municipios_por_nome.items() if len(entradas) > 1}
+
+        # Nomes de estado só contam como município ("São Paulo") em contexto geográfico
+        self.nomes_estados = {normalize_text(nome) for nome in UFS.values()}
+        self.palavras_ambiguas = set(palavras_ambiguas) | (self.nomes_estados & self.nomes_normalizados)
+
+        # Índice invertido: componente (que também é município) -> municípios compostos que o contêm
+        self.compostos_por_componente = {}
+        for nome_original in {municipio.nome for municipio in municipios}:
+            if ' ' in nome_original:
+                normalized_name = normalize_text(nome_original)
+                for comp in normalized_name.split():
+                    if comp in self.nomes_normalizados:
+                        self.compostos_por_componente.setdefault(comp, set()).add(normalized_name)
+
+        self.padroes_geograficos = {
+            palavra: compilar_padrao_geografico(palavra) for palavra in self.palavras_ambiguas
+        }
+
+    def em_contexto_geografico(self, normalized_name, processed_text):
+        """Indica se o nome aparece como lugar no texto já pré-processado."""
+        padrao = self.padroes_geograficos.get(normalized_name) or compilar_padrao_geografico(normalized_name)
+        return padrao.search(processed_text) is not None
+
+    def resolver(self, normalized_name, ufs_citadas=None):
+        """
+        "Nome-Codigo" do(s) município(s) com o nome. Homônimos ficam só com os das UFs citadas na
+        notícia; sem nenhuma UF que os diferencie, todos são mantidos.
+        """
+        entradas = self.municipios_por_nome[normalized_name]
+        if len(entradas) == 1:
+            return [self.municipio_lookup[normalized_name]]
+        if ufs_citadas:
+            entradas = [m for m in entradas if m.uf in ufs_citadas] or entradas
+        return [f"{m.nome}-{m.codigo}" for m in entradas]
+
+    def filtrar(self, potential_municipios_raw, context_text, ufs_citadas=None):
+        """
+        Retorna os municípios ("Nome-Codigo") citados entre os candidatos `potential_municipios_raw`.
+        `context_text` é o texto (já pré-processado) usado para decidir os nomes ambíguos.
+        Componentes de um município composto também detectado (ex.: "Santana" em "Riacho de Santana")
+        são descartados. `ufs_citadas` (ver `ufs_citadas`) decide entre municípios homônimos.
+        """
+        normalizados = [
+            (nome_raw, normalize_text(nome_raw)) for nome_raw in potential_municipios_raw if isinstance(nome_raw, str)
+        ]
+        potential_normalized_set = {normalized_name for _, normalized_name in normalizados}
+
+        # Na ordem em que aparecem no título (um set mudaria a ordem de um processo para outro)
+        filtered_municipios_normalized = {}
+        for nome_raw, normalized_name in normalizados:
+            if not nome_raw.strip():
+                continue
+            if normalized_name not in self.nomes_normalizados:
+                continue
+            if normalized_name in self.palavras_ambiguas and not self.em_contexto_geografico(normalized_name, context_text):
+                continue
+            compostos = self.compostos_por_componente.get(normalized_name)
+            if compostos and not compostos.isdisjoint(potential_normalized_set):
+                continue
+            filtered_municipios_normalized[normalized_name] = None
+
+        mapped_list = [
+            municipio for nome in filtered_municipios_normalized for municipio in self.resolver(nome, ufs_citadas)
+        ]
+        return list(dict.fromkeys(mapped_list))
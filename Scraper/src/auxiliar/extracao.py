@@ -0,0 +1,279 @@
+"""
+Extração dos itens de notícia a partir das páginas de busca do Google News.
+Recebe o HTML da página de resultados (Selenium ou HTTP) ou o XML do feed RSS e devolve
+uma lista de notícias (`registros.Noticia`) com os mesmos campos em ambos os casos.
+"""
+import functools
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+from bs4 import BeautifulSoup
+
+from auxiliar.instrumentacao import metricas
+from auxiliar.registros import Noticia
+
+logger = logging.getLogger(__name__)
+
+
+def parse_data_publicacao(datetime_string):
+    """
+    Converte o atributo datetime (ISO 8601) da tag <time> em 'dd/mm/aaaa'.
+    Retorna a tupla (data_publicacao, ano). Em caso de erro retorna a string original e ano None.
+    """
+    try:
+        if datetime_string.endswith('Z'):
+             datetime_string = datetime_string[:-1] + '+00:00'
+        elif '+' not in datetime_string and '-' not in datetime_string[10:]:
+             datetime_string += '+00:00'
+
+        datetime_obj = datetime.fromisoformat(datetime_string)
+        data_publicacao = datetime_obj.strftime('%d/%m/%Y')
+        logger.debug(" Data de publicação parseada: %s", data_publicacao)
+        return data_publicacao, int(datetime_obj.strftime('%Y'))
+    except ValueError as ve:
+        logger.warning(" Erro ao parsear data '%s': %s", datetime_string, ve)
+        return datetime_string, None
+    except Exception as ex:
+         logger.warning(" Erro inesperado ao processar data '%s': %s", datetime_string, ex)
+         return datetime_string, None
+
+
+def montar_link(href, base_url):
+    """Transforma o href relativo do Google News em um link absoluto."""
+    if href.startswith('./articles/'):
+        return f"{base_url}{href[1:]}"
+    elif href.startswith('http'):
+        return href
+    else:
+        return f"{base_url}/{href.lstrip('/')}"
+
+
+def montar_item(base_url, href, titulo, conteudo, fonte, data_iso, img_srcset, img_src):
+    """
+    Monta a notícia (`Noticia`) a partir dos valores brutos lidos do HTML (strings ou None),
+    do mesmo jeito para todos os parsers. Retorna None se a notícia não tiver link.
+    """
+    if not href:
+        return None
+    item_link = montar_link(href, base_url)
+
+    data_publicacao = 'Data não encontrada'
+    ano_filtro = None
+    if data_iso:
+        data_publicacao, ano_filtro = parse_data_publicacao(data_iso)
+
+    img_url_final = img_srcset.split()[0] if img_srcset else (img_src if img_src else 'Imagem não encontrada')
+
+    return Noticia(
+        titulo=titulo.strip() if titulo is not None else 'Título não encontrado',
+        conteudo=conteudo.strip() if conteudo is not None else 'Conteúdo não encontrado',
+        fonte=fonte.strip() if fonte is not None else 'Fonte não encontrada',
+        datetime=data_publicacao,
+        link=item_link,
+        img_url=base_url + img_url_final,
+        ano_filtro=ano_filtro,
+    )
+
+
+def _itens_html_parser(html, base_url):
+    """Extração com BeautifulSoup + html.parser (parser padrão, sem dependências extras)."""
+    soup = BeautifulSoup(html, 'html.parser')
+    news_items = soup.select('div.UW0SDc, article')
+    print(f"Total de elementos de notícias encontrados após scroll: {len(news_items)}")
+
+    itens = []
+    for item in news_items:
+        try:
+            title_tag = item.select_one('a.JtKRv, h3 a, h4 a')
+            content_tag = item.select_one('div.GI74Re.nDgy9d, p')
+            link_tag = item.select_one("a[href]")
+            publisher_tag = item.select_one('div.vr1PYe, div.wsLqz')
+            img_tag = item.find('img', class_='Quavad vwBmvb') or item.find('img')
+            date_tag = item.select_one('time.hvbAAd, time')
+
+            noticia = montar_item(
+                base_url,
+                link_tag.get('href') if link_tag else None,
+                title_tag.text if title_tag else None,
+                content_tag.text if content_tag else None,
+                publisher_tag.text if publisher_tag else None,
+                date_tag.get('datetime') if date_tag else None,
+                img_tag.get('srcset') if img_tag else None,
+                img_tag.get('src') if img_tag else None,
+            )
+            if noticia is not None:
+                itens.append(noticia)
+        except Exception as e:
+            logger.warning("Erro ao processar item: %s", e)
+            continue
+
+    return itens
+
+
+def _classe(nome):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {nome} ')"
+
+
+@functools.lru_cache()
+def _xpaths_lxml():
+    """
+    Expressões XPath (compiladas uma vez) equivalentes aos seletores CSS do parser padrão.
+    As uniões devolvem os nós na ordem do documento, como o `select_one` do BeautifulSoup.
+    """
+    from lxml import etree
+
+    return {
+        'itens': etree.XPath(f"//div[{_classe('UW0SDc')}] | //article"),
+        'titulo': etree.XPath(f"(.//a[{_classe('JtKRv')}] | .//h3//a | .//h4//a)[1]"),
+        'conteudo': etree.XPath(f"(.//div[{_classe('GI74Re')} and {_classe('nDgy9d')}] | .//p)[1]"),
+        'link': etree.XPath("(.//a[@href])[1]/@href"),
+        'fonte': etree.XPath(f"(.//div[{_classe('vr1PYe')}] | .//div[{_classe('wsLqz')}])[1]"),
+        'imagem_classe': etree.XPath("(.//img[normalize-space(@class) = 'Quavad vwBmvb'])[1]"),
+        'imagem': etree.XPath("(.//img)[1]"),
+        'data': etree.XPath("(.//time)[1]/@datetime"),
+    }
+
+
+def _itens_lxml(html, base_url):
+    """Extração com lxml: um único parse em C e XPaths pré-compiladas por item."""
+    import lxml.html
+
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    if not html.strip():
+        print("Total de elementos de notícias encontrados após scroll: 0")
+        return []
+    documento = lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding='utf-8'))
+
+    xpaths = _xpaths_lxml()
+    news_items = xpaths['itens'](documento)
+    print(f"Total de elementos de notícias encontrados após scroll: {len(news_items)}")
+
+    def primeiro(resultado):
+        return resultado[0] if resultado else None
+
+    itens = []
+    for item in news_items:
+        try:
+            title_tag = primeiro(xpaths['titulo'](item))
+            content_tag = primeiro(xpaths['conteudo'](item))
+            publisher_tag = primeiro(xpaths['fonte'](item))
+            img_tag = primeiro(xpaths['imagem_classe'](item))
+            if img_tag is None:
+                img_tag = primeiro(xpaths['imagem'](item))
+
+            noticia = montar_item(
+                base_url,
+                primeiro(xpaths['link'](item)),
+                title_tag.text_content() if title_tag is not None else None,
+                content_tag.text_content() if content_tag is not None else None,
+                publisher_tag.text_content() if publisher_tag is not None else None,
+                primeiro(xpaths['data'](item)),
+                img_tag.get('srcset') if img_tag is not None else None,
+                img_tag.get('src') if img_tag is not None else None,
+            )
+            if noticia is not None:
+                itens.append(noticia)
+        except Exception as e:
+            logger.warning("Erro ao processar item: %s", e)
+            continue
+
+    return itens
+
+
+PARSERS_HTML = {
+    'html.parser': _itens_html_parser,
+    'lxml': _itens_lxml,
+}
+
+
+def verificar_parser_html(parser):
+    """Confere se o parser existe e se a dependência dele está instalada."""
+    if parser not in PARSERS_HTML:
+        raise ValueError(f"Parser HTML desconhecido: {parser}")
+    if parser == 'lxml':
+        try:
+            import lxml.html  # noqa: F401
+        except ImportError:
+            raise ValueError("O parser 'lxml' exige o pacote lxml (pip install lxml).")
+
+
+def extrair_itens_html(html, base_url, parser='html.parser'):
+    """
+    Extrai as notícias da página de resultados do Google News.
+    Retorna uma lista de notícias (`registros.Noticia`, somente leitura) com 'titulo', 'conteudo',
+    'fonte', 'datetime', 'link', 'img_url' e 'ano_filtro', na ordem em que aparecem na página.
+    `parser` escolhe a implementação (ver PARSERS_HTML); 'lxml' é bem mais rápido em páginas grandes.
+    """
+    with metricas.etapa('parse_html'):
+        return PARSERS_HTML[parser](html, base_url)
+
+
+def extrair_itens_rss(xml, base_url):
+    """
+    Extrai as notícias do feed RSS de busca do Google News (/rss/search).
+    O título do feed vem no formato "Título - Fonte"; o sufixo da fonte é removido.
+    Retorna notícias (`registros.Noticia`) com os mesmos campos de `extrair_itens_html`.
+    """
+    with metricas.etapa('parse_rss'):
+        return _extrair_itens_rss(xml, base_url)
+
+
+def _extrair_itens_rss(xml, base_url):
+    try:
+        root = ET.fromstring(xml)
+    except ET.ParseError as e:
+        print(f" Erro ao interpretar o feed RSS: {e}")
+        return []
+
+    rss_items = root.findall('./channel/item')
+    print(f"Total de elementos de notícias encontrados no feed: {len(rss_items)}")
+
+    itens = []
+    for item in rss_items:
+        try:
+            item_link = (item.findtext('link') or '').strip()
+            if not item_link:
+                continue
+            item_link = montar_link(item_link, base_url)
+
+            publisher = (item.findtext('source') or '').strip() or 'Fonte não encontrada'
+            title = (item.findtext('title') or '').strip()
+            if publisher != 'Fonte não encontrada' and title.endswith(f" - {publisher}"):
+                title = title[:-len(f" - {publisher}")].strip()
+            title = title or 'Título não encontrado'
+
+            # A descrição do feed normalmente repete título e fonte; só vira conteúdo se trouxer algo a mais.
+            descricao = BeautifulSoup(item.findtext('description') or '', 'html.parser').get_text(" ").strip()
+            for repetido in (title, publisher):
+                descricao = descricao.replace(repetido, '')
+            content = descricao.strip(" \u00a0-") or 'Conteúdo não encontrado'
+
+            data_publicacao = 'Data não encontrada'
+            ano_filtro = None
+            pub_date = (item.findtext('pubDate') or '').strip()
+            if pub_date:
+                try:
+                    datetime_obj = parsedate_to_datetime(pub_date)
+                    data_publicacao = datetime_obj.strftime('%d/%m/%Y')
+                    ano_filtro = datetime_obj.year
+                except (TypeError, ValueError) as ve:
+                    logger.warning(" Erro ao parsear data '%s': %s", pub_date, ve)
+                    data_publicacao = pub_date
+
+            itens.append(Noticia(
+                titulo=title,
+                conteudo=content,
+                fonte=publisher,
+                datetime=data_publicacao,
+                link=item_link,
+                img_url=base_url + 'Imagem não encontrada',
+                ano_filtro=ano_filtro,
+            ))
+        except Exception as e:
+            logger.warning("Erro ao processar item: %s", e)
+            continue
+
+    return itens
@@ -0,0 +1,108 @@
+"""
+Instrumentação da execução: tempo gasto em cada etapa (carregar a página, scroll, parsing do HTML,
+spaCy, gravação da saída...) e contadores (itens vistos, duplicados, fora da janela de datas, municípios
+encontrados), no total e por termo de busca. No fim da execução os números são gravados em um
+relatório JSON.
+
+Os coletores rodam em threads (ver `--workers`), então todas as operações usam um lock.
+Uso: `with metricas.etapa('parse_html'): ...` e `metricas.contar('itens_vistos', 10, termo=palavra)`.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class Instrumentacao:
+    """Acumula tempos por etapa e contadores, no total e por termo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._lock:
+            self.inicio = time.time()
+            self.etapas = {}
+            self.contadores = {}
+            self.por_termo = {}
+
+    def _termo(self, termo):
+        return self.por_termo.setdefault(termo, {'etapas': {}, 'contadores': {}})
+
+    @staticmethod
+    def _somar_etapa(etapas, nome, segundos):
+        etapa = etapas.setdefault(nome, {'chamadas': 0, 'segundos': 0.0})
+        etapa['chamadas'] += 1
+        etapa['segundos'] += segundos
+
+    def registrar_tempo(self, nome, segundos, termo=None):
+        with self._lock:
+            self._somar_etapa(self.etapas, nome, segundos)
+            if termo is not None:
+                self._somar_etapa(self._termo(termo)['etapas'], nome, segundos)
+
+    def somar_etapas(self, etapas, termo=None):
+        """Soma os tempos de `etapas` (o atributo `etapas` de outra instância, ex.: de um processo de NLP)."""
+        with self._lock:
+            for nome, etapa in etapas.items():
+                for destino in (self.etapas, self._termo(termo)['etapas']) if termo is not None else (self.etapas,):
+                    acumulado = destino.setdefault(nome, {'chamadas': 0, 'segundos': 0.0})
+                    acumulado['chamadas'] += etapa['chamadas']
+                    acumulado['segundos'] += etapa['segundos']
+
+    @contextmanager
+    def etapa(self, nome, termo=None):
+        """Mede o tempo do bloco e o soma à etapa `nome` (e ao termo, se informado)."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_tempo(nome, time.perf_counter() - inicio, termo)
+
+    def contar(self, nome, quantidade=1, termo=None):
+        with self._lock:
+            self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+            if termo is not None:
+                contadores = self._termo(termo)['contadores']
+                contadores[nome] = contadores.get(nome, 0) + quantidade
+
+    def relatorio(self, **extras):
+        """Monta o relatório da execução como um dicionário serializável em JSON."""
+        def arredondar(etapas):
+            return {nome: {'chamadas': e['chamadas'], 'segundos': round(e['segundos'], 4)} for nome, e in etapas.items()}
+
+        with self._lock:
+            fim = time.time()
+            relatorio = {
+                'inicio': datetime.fromtimestamp(self.inicio).isoformat(timespec='seconds'),
+                'fim': datetime.fromtimestamp(fim).isoformat(timespec='seconds'),
+                'duracao_segundos': round(fim - self.inicio, 3),
+                'etapas': arredondar(self.etapas),
+                'contadores': dict(self.contadores),
+                'por_termo': {
+                    termo: {'etapas': arredondar(dados['etapas']), 'contadores': dict(dados['contadores'])}
+                    for termo, dados in self.por_termo.items()
+                },
+            }
+        relatorio.update(extras)
+        return relatorio
+
+    def salvar_relatorio(self, caminho, **extras):
+        relatorio = self.relatorio(**extras)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        return relatorio
+
+    def resumo(self):
+        """Texto curto com as etapas ordenadas pelo tempo gasto, para o console."""
+        with self._lock:
+            etapas = sorted(self.etapas.items(), key=lambda item: item[1]['segundos'], reverse=True)
+        return "\n".join(
+            f"  {nome:<22} {e['segundos']:9.2f}s  ({e['chamadas']} chamadas)" for nome, e in etapas
+        )
+
+
+# Instância usada por toda a execução
+metricas = Instrumentacao()
@@ -0,0 +1,113 @@
+"""
+Janela de datas das notícias (`--desde`/`--ate`). Ela é usada em três pontos, do mais barato para o
+mais caro, para notícias fora da janela não custarem páginas, parse nem extração de municípios:
+
+1. Na busca: a janela vira operadores do Google News na consulta (`when:7d`, ou `after:`/`before:`),
+   então a página já vem quase só com notícias do período.
+2. No scroll (backend 'selenium'): para de rolar quando um scroll só traz notícias anteriores à janela.
+3. Nos itens coletados: as notícias fora da janela são descartadas pela data, antes da deduplicação,
+   do download dos textos e da identificação dos municípios (ver `main.preparar_itens`).
+
+O Google trata os operadores como aproximados, então a consulta pede um dia a mais em cada ponta e o
+filtro dos itens é o que vale. Notícias sem data reconhecida são mantidas.
+Uma janela relativa ('7d': os últimos 7 dias) é recalculada a cada uso, então no modo serviço ela
+acompanha o dia corrente.
+"""
+import functools
+import re
+from datetime import date, datetime, timedelta
+
+# Janela padrão: notícias a partir de 2023, o filtro de ano que o script sempre aplicou
+DESDE_PADRAO = date(2023, 1, 1)
+
+_RELATIVA = re.compile(r'^\s*(\d+)\s*d\s*$', re.IGNORECASE)
+
+
+def ler_data(texto):
+    """'aaaa-mm-dd' ou 'dd/mm/aaaa' -> date. ValueError se não for uma data nesses formatos."""
+    texto = texto.strip()
+    for formato in ('%Y-%m-%d', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(texto, formato).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Data inválida: '{texto}' (use aaaa-mm-dd, dd/mm/aaaa ou, em --desde, Nd para os últimos N dias).")
+
+
+@functools.lru_cache(maxsize=4096)
+def data_publicacao(texto):
+    """Data da coluna 'datetime' dos itens ('dd/mm/aaaa') como date, ou None se não for uma data."""
+    try:
+        return datetime.strptime(texto, '%d/%m/%Y').date()
+    except (TypeError, ValueError):
+        return None
+
+
+class JanelaDatas:
+    """
+    Período de publicação aceito: de `desde` a `ate` (datas, inclusive; None deixa a ponta aberta) ou,
+    com `ultimos_dias`, os últimos N dias até hoje. `hoje` é a função que dá a data corrente.
+    """
+
+    def __init__(self, desde=None, ate=None, ultimos_dias=None, hoje=date.today):
+        if ultimos_dias is not None and ultimos_dias < 1:
+            raise ValueError("A janela relativa deve ter ao menos 1 dia.")
+        self.desde = desde
+        self.ate = ate
+        self.ultimos_dias = ultimos_dias
+        self.hoje = hoje
+        inicio, fim = self.limites()
+        if inicio is not None and fim is not None and inicio > fim:
+            raise ValueError(f"Janela de datas vazia: {inicio.isoformat()} é depois de {fim.isoformat()}.")
+
+    @classmethod
+    def da_linha_de_comando(cls, desde=None, ate=None):
+        """Janela de `--desde` (data ou 'Nd') e `--ate` (data)."""
+        relativa = _RELATIVA.match(desde) if desde else None
+        return cls(
+            desde=ler_data(desde) if desde and not relativa else None,
+            ate=ler_data(ate) if ate else None,
+            ultimos_dias=int(relativa.group(1)) if relativa else None,
+        )
+
+    def limites(self):
+        """(primeiro dia, último dia) da janela hoje; None na ponta aberta."""
+        if self.ultimos_dias is not None:
+            return self.hoje() - timedelta(days=self.ultimos_dias - 1), self.ate
+        return self.desde, self.ate
+
+    def contem(self, data):
+        """Se a data (date) está na janela; datas desconhecidas (None) são aceitas."""
+        if data is None:
+            return True
+        desde, ate = self.limites()
+        return (desde is None or data >= desde) and (ate is None or data <= ate)
+
+    def contem_item(self, item):
+        """Se a notícia (item coletado ou `Noticia`) foi publicada dentro da janela."""
+        return self.contem(data_publicacao(item.get('datetime')))
+
+    def operadores_busca(self):
+        """Operadores do Google News que restringem a busca à janela ('' se ela for aberta)."""
+        if self.ultimos_dias is not None and self.ate is None:
+            return f"when:{self.ultimos_dias}d"
+        desde, ate = self.limites()
+        operadores = []
+        if desde is not None:
+            operadores.append(f"after:{(desde - timedelta(days=1)).isoformat()}")
+        if ate is not None:
+            operadores.append(f"before:{(ate + timedelta(days=1)).isoformat()}")
+        return " ".join(operadores)
+
+    def descricao(self):
+        """Texto da janela para as mensagens e o relatório."""
+        if self.ultimos_dias is not None and self.ate is None:
+            return f"últimos {self.ultimos_dias} dias"
+        desde, ate = self.limites()
+        return f"{desde.isoformat() if desde else '...'} a {ate.isoformat() if ate else '...'}"
+
+    def __repr__(self):
+        return f"JanelaDatas({self.descricao()})"
+
+
+JANELA_PADRAO = JanelaDatas(desde=DESDE_PADRAO)
@@ -0,0 +1,272 @@
+"""
+Links canônicos das notícias. As páginas de busca apontam para links intermediários do Google News
+('news.google.com/articles/<id>', ou '/rss/articles/' no feed), e a mesma notícia ganha um id diferente
+em cada termo e em cada execução. Assim a deduplicação por link (`seen_links`, a base do modo
+incremental e o acervo) não reconhece a notícia repetida.
+
+`ResolvedorLinks` troca cada link intermediário pelo endereço da notícia no site que a publicou:
+
+1. Sem rede, quando o id é do formato antigo, que traz a URL codificada em base64.
+2. Senão, seguindo o redirecionamento do Google: as requisições de uma página de resultados rodam em
+   paralelo, limitadas, reaproveitando as conexões de uma `requests.Session` (como em `auxiliar.artigos`).
+
+O endereço final é normalizado (`normalizar_url`): sem parâmetros de rastreamento e sem as variantes
+AMP. Os links resolvidos ficam em um cache SQLite (e em memória) com validade (TTL), então um link já
+visto em uma execução anterior não gera nova requisição, e no modo serviço um link expirado é resolvido de novo. Links que não puderam ser resolvidos continuam como vieram
+e são tentados de novo na próxima execução.
+"""
+import asyncio
+import base64
+import binascii
+import re
+import sqlite3
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from auxiliar.coletores import USER_AGENT, root_url
+from auxiliar.instrumentacao import metricas
+
+# Parâmetros que só identificam a campanha ou a origem do clique
+PARAMETROS_RASTREAMENTO = frozenset((
+    'gclid', 'dclid', 'gbraid', 'wbraid', 'fbclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid', 'ocid', 'cmpid',
+    'ncid', 'xtor', 'ito', 'spm', 'ref_src', 'ref_url', '_ga', '__twitter_impression', 'amp', 'amp_js_v', 'usqp',
+))
+PREFIXOS_RASTREAMENTO = ('utm_', 'at_')
+# Prefixos do caminho das versões AMP (o do g1 é '/google/amp/')
+PREFIXOS_AMP = ('/google/amp/', '/amp/')
+HOST_CACHE_AMP = '.cdn.ampproject.org'
+
+CAMINHOS_GOOGLE = ('/articles/', '/rss/articles/', '/read/')
+
+# Onde a página intermediária do Google informa o destino, quando não redireciona
+_PADROES_DESTINO = (
+    re.compile(r'data-n-au="(https?://[^"]+)"'),
+    re.compile(r'<meta[^>]+http-equiv="refresh"[^>]+url=([^"\'>]+)', re.IGNORECASE),
+    re.compile(r'<link[^>]+rel="canonical"[^>]+href="(https?://[^"]+)"', re.IGNORECASE),
+)
+
+
+def _parametro_rastreamento(nome, valor):
+    nome = nome.lower()
+    return (
+        nome in PARAMETROS_RASTREAMENTO or nome.startswith(PREFIXOS_RASTREAMENTO)
+        or (nome == 'outputtype' and valor.lower() == 'amp')
+    )
+
+
+def normalizar_url(url):
+    """
+    Forma canônica de uma URL de notícia: esquema e host em minúsculas, sem porta padrão, fragmento,
+    parâmetros de rastreamento (utm_*, fbclid...) e variantes AMP (cache do ampproject.org, host 'amp.',
+    caminho '/amp/' ou terminado em '/amp', '?amp=1', '?outputType=amp'). URLs inválidas voltam como estão.
+    """
+    try:
+        partes = urlsplit(url.strip())
+        esquema, host, caminho = partes.scheme.lower(), (partes.hostname or ''), partes.path
+        porta = partes.port
+    except ValueError:
+        return url
+    if esquema not in ('http', 'https') or not host:
+        return url
+
+    # 'site-com.cdn.ampproject.org/c/s/site.com/noticia' -> 'https://site.com/noticia'
+    if host.endswith(HOST_CACHE_AMP):
+        original = re.match(r'^/[cvi]/(s/)?([^/]+)(/.*)?$', caminho)
+        if original:
+            esquema = 'https' if original.group(1) else 'http'
+            host, porta = original.group(2).lower(), None
+            caminho = original.group(3) or '/'
+    if host.startswith('amp.'):
+        host = host[4:]
+    for prefixo in PREFIXOS_AMP:
+        if caminho.startswith(prefixo):
+            caminho = '/' + caminho[len(prefixo):]
+            break
+    if caminho.endswith('/amp') or caminho.endswith('/amp/'):
+        caminho = caminho[:caminho.rindex('/amp')] or '/'
+    if caminho.endswith('.amp.html'):
+        caminho = caminho[:-len('.amp.html')] + '.html'
+    elif caminho.endswith('.amp'):
+        caminho = caminho[:-len('.amp')]
+
+    parametros = parse_qsl(partes.query, keep_blank_values=True)
+    mantidos = [(nome, valor) for nome, valor in parametros if not _parametro_rastreamento(nome, valor)]
+    # Sem parâmetros removidos, a query fica como veio (sem recodificar)
+    query = partes.query if len(mantidos) == len(parametros) else urlencode(mantidos)
+    netloc = host if porta is None or (esquema, porta) in (('http', 80), ('https', 443)) else f"{host}:{porta}"
+    return urlunsplit((esquema, netloc, caminho or '/', query, ''))
+
+
+def decodificar_link_google(link):
+    """
+    URL da notícia codificada no id de um link do Google News, sem acessar a rede. Só os ids do
+    formato antigo ('CBMi...') trazem a URL; para os demais, devolve None.
+    """
+    identificador = urlsplit(link).path.rstrip('/').rsplit('/', 1)[-1]
+    try:
+        dados = base64.urlsafe_b64decode(identificador + '=' * (-len(identificador) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    # Protobuf: campo 1 (0x08 0x13) e campo 4 (0x22), com o tamanho da URL em varint
+    if not dados.startswith(b'\x08\x13"'):
+        return None
+    tamanho, deslocamento, posicao = 0, 0, 3
+    while posicao < len(dados):
+        byte = dados[posicao]
+        tamanho |= (byte & 0x7f) << deslocamento
+        posicao += 1
+        if not byte & 0x80:
+            break
+        deslocamento += 7
+    try:
+        url = dados[posicao:posicao + tamanho].decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    return url if url.startswith(('http://', 'https://')) else None
+
+
+class ResolvedorLinks:
+    """
+    Resolve os links intermediários do Google News para os links canônicos das notícias.
+
+    Args:
+        caminho_cache (str | None): arquivo SQLite com os links já resolvidos (None: só em memória).
+        ttl (float | None): validade dos links resolvidos, em segundos (None: não expiram).
+        base_url (str): URL base do Google News; com um servidor local (stub), os links dele é que são resolvidos.
+        concorrencia (int): requisições simultâneas.
+        timeout (float): tempo máximo (s) de cada requisição.
+        offline (bool): não acessa a rede; usa o cache (mesmo expirado) e a decodificação dos ids.
+        relogio: função que dá o horário atual, em segundos.
+    """
+
+    def __init__(self, caminho_cache=None, ttl=30 * 24 * 3600, base_url=root_url, concorrencia=8, timeout=10,
+                 offline=False, relogio=time.time):
+        self.caminho_cache = caminho_cache
+        self.ttl = ttl
+        self.host_google = urlsplit(base_url).netloc.lower()
+        self.concorrencia = concorrencia
+        self.timeout = timeout
+        self.offline = offline
+        self.relogio = relogio
+        # {link: (canônico, resolvido_em)}: a mesma validade do cache SQLite, para o modo serviço
+        self.cache = {}
+
+        self.conexao = sqlite3.connect(caminho_cache or ':memory:')
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute(
+            "CREATE TABLE IF NOT EXISTS links (link TEXT PRIMARY KEY, canonico TEXT NOT NULL, resolvido_em REAL NOT NULL)"
+        )
+        self.conexao.commit()
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Language': 'pt-BR,pt;q=0.9',
+        })
+        adapter = HTTPAdapter(pool_connections=concorrencia, pool_maxsize=concorrencia, max_retries=1)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def link_google(self, link):
+        """Se o link é um intermediário do Google News (que precisa ser resolvido)."""
+        partes = urlsplit(link)
+        return partes.netloc.lower() == self.host_google and partes.path.startswith(CAMINHOS_GOOGLE)
+
+    def _ler_cache(self, links):
+        """{link: canônico} dos links no cache e dentro da validade (ou todos, offline)."""
+        limite = None if self.offline or self.ttl is None else self.relogio() - self.ttl
+        encontrados = {}
+        for link in links:
+            if link in self.cache:
+                canonico, resolvido_em = self.cache[link]
+                if limite is None or resolvido_em >= limite:
+                    encontrados[link] = canonico
+                else:
+                    del self.cache[link]
+        faltando = [link for link in links if link not in encontrados]
+        # Em blocos, abaixo do limite de parâmetros do SQLite
+        for inicio in range(0, len(faltando), 500):
+            bloco = faltando[inicio:inicio + 500]
+            cursor = self.conexao.execute(
+                f"SELECT link, canonico, resolvido_em FROM links WHERE link IN ({','.join('?' * len(bloco))})", bloco
+            )
+            for link, canonico, resolvido_em in cursor:
+                if limite is None or resolvido_em >= limite:
+                    encontrados[link] = canonico
+                    self.cache[link] = (canonico, resolvido_em)
+        return encontrados
+
+    def _destino(self, link):
+        """URL para onde o link do Google leva, ou None se não foi possível descobrir."""
+        try:
+            # Sem baixar o corpo da notícia: quando o Google redireciona, basta o endereço final
+            with self.session.get(link, timeout=self.timeout, allow_redirects=True, stream=True) as resposta:
+                resposta.raise_for_status()
+                if urlsplit(resposta.url).netloc.lower() != self.host_google:
+                    return resposta.url
+                pagina = resposta.text
+        except requests.RequestException as e:
+            print(f" Erro ao resolver o link '{link}': {e}")
+            return None
+        for padrao in _PADROES_DESTINO:
+            encontrado = padrao.search(pagina)
+            if encontrado and urlsplit(encontrado.group(1)).netloc.lower() != self.host_google:
+                return encontrado.group(1).replace('&amp;', '&')
+        return None
+
+    async def _resolver_todos(self, links):
+        limite = asyncio.Semaphore(self.concorrencia)
+
+        async def resolver(link):
+            async with limite:
+                return link, await asyncio.to_thread(self._destino, link)
+
+        return await asyncio.gather(*(resolver(link) for link in links))
+
+    def resolver(self, links):
+        """
+        Retorna {link: link canônico} para os links informados. Links que não são do Google só são
+        normalizados; os do Google que não puderam ser resolvidos voltam como estão.
+        """
+        links = list(dict.fromkeys(links))
+        canonicos = {link: normalizar_url(link) for link in links if not self.link_google(link)}
+        do_google = [link for link in links if link not in canonicos]
+        em_cache = self._ler_cache(do_google)
+        canonicos.update(em_cache)
+        metricas.contar('links_em_cache', len(em_cache))
+
+        resolvidos = {}
+        pendentes = []
+        for link in do_google:
+            if link in em_cache:
+                continue
+            decodificado = decodificar_link_google(link)
+            if decodificado is not None:
+                resolvidos[link] = normalizar_url(decodificado)
+                metricas.contar('links_decodificados')
+            else:
+                pendentes.append(link)
+        if pendentes and not self.offline:
+            for link, destino in asyncio.run(self._resolver_todos(pendentes)):
+                if destino is not None:
+                    resolvidos[link] = normalizar_url(destino)
+                    metricas.contar('links_resolvidos')
+        metricas.contar('links_nao_resolvidos', len(do_google) - len(em_cache) - len(resolvidos))
+
+        if resolvidos:
+            agora = self.relogio()
+            self.cache.update((link, (canonico, agora)) for link, canonico in resolvidos.items())
+            with self.conexao:
+                self.conexao.executemany(
+                    "INSERT OR REPLACE INTO links (link, canonico, resolvido_em) VALUES (?, ?, ?)",
+                    ((link, canonico, agora) for link, canonico in resolvidos.items())
+                )
+        canonicos.update(resolvidos)
+        return {link: canonicos.get(link, link) for link in links}
+
+    def fechar(self):
+        self.session.close()
+        self.conexao.close()
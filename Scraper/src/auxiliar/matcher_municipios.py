@@ -0,0 +1,89 @@
+"""
+Busca dos nomes de municípios em um texto com uma trie de palavras normalizadas (minúsculas e sem
+acentos), sem depender do spaCy.
+
+O texto é quebrado em palavras uma única vez; a partir de cada palavra a trie é percorrida enquanto
+houver continuação e fica o nome mais longo encontrado ("Riacho de Santana" e não "Santana"). Como
+a profundidade da trie é o número de palavras do maior nome, a busca é linear no tamanho do texto,
+não importa quantos municípios o gazetteer tenha.
+"""
+import functools
+import re
+import unicodedata
+
+from auxiliar.municipios import UFS_PADRAO, get_municipios
+
+RE_PALAVRA = re.compile(r'\w+')
+_FIM = None
+
+
+def normalizar_ascii(texto):
+    """Minúsculas e sem acentos, só com caracteres ASCII."""
+    return unicodedata.normalize('NFKD', texto.lower()).encode('ascii', 'ignore').decode('ascii')
+
+
+def palavras_normalizadas(texto):
+    """Lista de (palavra normalizada, início, fim) do texto; apóstrofos e hífens separam palavras."""
+    palavras = []
+    for m in RE_PALAVRA.finditer(texto):
+        palavra = normalizar_ascii(m.group())
+        if palavra:
+            palavras.append((palavra, m.start(), m.end()))
+    return palavras
+
+
+class MatcherMunicipios:
+    """
+    Trie com os nomes dos municípios.
+
+    Args:
+        nomes (iterable): nomes como aparecem no gazetteer; cada ocorrência encontrada é devolvida
+            com o nome do gazetteer (ex.: "Ilheus" no texto -> "Ilhéus").
+    """
+
+    def __init__(self, nomes):
+        self.raiz = {}
+        self.profundidade = 0
+        for nome in nomes:
+            chave = [palavra for palavra, _, _ in palavras_normalizadas(nome)]
+            if not chave:
+                continue
+            no = self.raiz
+            for palavra in chave:
+                no = no.setdefault(palavra, {})
+            no.setdefault(_FIM, nome)
+            self.profundidade = max(self.profundidade, len(chave))
+
+    def ocorrencias(self, texto):
+        """Lista de (nome do gazetteer, início, fim) das ocorrências, sem sobreposição, da esquerda para a direita."""
+        palavras = palavras_normalizadas(texto)
+        encontrados = []
+        i = 0
+        while i < len(palavras):
+            no = self.raiz
+            melhor = None
+            j = i
+            while j < len(palavras):
+                no = no.get(palavras[j][0])
+                if no is None:
+                    break
+                j += 1
+                if _FIM in no:
+                    melhor = (no[_FIM], j)
+            if melhor is None:
+                i += 1
+                continue
+            nome, fim = melhor
+            encontrados.append((nome, palavras[i][1], palavras[fim - 1][2]))
+            i = fim
+        return encontrados
+
+    def encontrar(self, texto):
+        """Nomes dos municípios citados no texto, na ordem em que aparecem."""
+        return [nome for nome, _, _ in self.ocorrencias(texto)]
+
+
+@functools.lru_cache()
+def get_matcher_trie(ufs=UFS_PADRAO):
+    """Monta, no primeiro uso, a trie com os municípios das UFs (tupla de siglas)."""
+    return MatcherMunicipios(municipio.nome for municipio in get_municipios(ufs))
@@ -1,13 +1,65 @@
-import pandas as pd
+"""
+Gazetteer dos municípios: uma única fonte, `data/municipios.csv`, com a UF, o código IBGE e o nome
+oficial de cada município. Tanto a busca dos nomes nos títulos (ver `auxiliar.matcher_municipios` e
+`auxiliar.spacy_extract`) quanto os códigos da saída vêm daqui, então não há listas para manter em
+sincronia. Para monitorar outros estados basta acrescentar as linhas deles ao CSV (a lista completa
+está no site do IBGE) e escolher as UFs com `--ufs`.
+"""
+import csv
 import functools
+import os
+from collections import namedtuple
 
-df = pd.read_excel('.\data\\municipios_metadata.xlsx', sheet_name='municipios_bahia')
+DIRETORIO_DADOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+CAMINHO_MUNICIPIOS = os.path.join(DIRETORIO_DADOS, 'municipios.csv')
+
+UFS = {
+    'AC': 'Acre', 'AL': 'Alagoas', 'AP': 'Amapá', 'AM': 'Amazonas', 'BA': 'Bahia', 'CE': 'Ceará',
+    'DF': 'Distrito Federal', 'ES': 'Espírito Santo', 'GO': 'Goiás', 'MA': 'Maranhão', 'MT': 'Mato Grosso',
+    'MS': 'Mato Grosso do Sul', 'MG': 'Minas Gerais', 'PA': 'Pará', 'PB': 'Paraíba', 'PR': 'Paraná',
+    'PE': 'Pernambuco', 'PI': 'Piauí', 'RJ': 'Rio de Janeiro', 'RN': 'Rio Grande do Norte',
+    'RS': 'Rio Grande do Sul', 'RO': 'Rondônia', 'RR': 'Roraima', 'SC': 'Santa Catarina', 'SP': 'São Paulo',
+    'SE': 'Sergipe', 'TO': 'Tocantins',
+}
+UFS_PADRAO = ('BA',)
+
+Municipio = namedtuple('Municipio', ['uf', 'codigo', 'nome'])
+
+
+def normalizar_ufs(ufs):
+    """Converte 'ba, se' ou ['BA', 'SE'] na tupla ordenada ('BA', 'SE'), validando as siglas."""
+    if isinstance(ufs, str):
+        ufs = ufs.split(',')
+    siglas = sorted({uf.strip().upper() for uf in ufs if uf.strip()})
+    desconhecidas = [uf for uf in siglas if uf not in UFS]
+    if desconhecidas or not siglas:
+        raise ValueError(f"UF inválida: {', '.join(desconhecidas) or '(nenhuma)'}.")
+    return tuple(siglas)
+
+
+def carregar_municipios(caminho=CAMINHO_MUNICIPIOS, ufs=None):
+    """Lê o CSV do gazetteer e retorna a lista de `Municipio` das UFs informadas (todas, se None)."""
+    with open(caminho, 'r', encoding='utf-8', newline='') as f:
+        municipios = [
+            Municipio(linha['uf'].strip().upper(), int(linha['codigo_ibge']), linha['nome'].strip())
+            for linha in csv.DictReader(f)
+        ]
+    if ufs is None:
+        return municipios
+    ufs = set(ufs)
+    selecionados = [municipio for municipio in municipios if municipio.uf in ufs]
+    sem_municipios = ufs - {municipio.uf for municipio in selecionados}
+    if sem_municipios:
+        print(f" Aviso: nenhum município de {', '.join(sorted(sem_municipios))} em '{caminho}'.")
+    return selecionados
 
-codigos_municipios = df['Município'].tolist()
-municipios = df['Nome_Município'].tolist()
 
 @functools.lru_cache()
-def get_municipios_metadata():
-    return {municipio: codigo for municipio, codigo in zip(municipios, codigos_municipios)}
+def get_municipios(ufs=UFS_PADRAO):
+    """Municípios das UFs (tupla de siglas), lidos uma única vez por combinação de UFs."""
+    return tuple(carregar_municipios(ufs=ufs))
+
 
-#print(get_municipios_metadata())
\ No newline at end of file
+def get_municipios_metadata(ufs=UFS_PADRAO):
+    """{nome do município: código IBGE} das UFs. Nomes repetidos em UFs diferentes ficam com o último código."""
+    return {municipio.nome: municipio.codigo for municipio in get_municipios(ufs)}
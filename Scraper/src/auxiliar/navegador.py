@@ -0,0 +1,169 @@
+"""
+Gerência do Chrome usado pelo ColetorSelenium em execuções longas.
+
+A memória do Chrome cresce a cada página de resultados com dezenas de scrolls, então o navegador é
+reiniciado depois de `max_consultas` buscas ou quando a memória dos seus processos passa de
+`memoria_max_mb` (medida com `psutil`, opcional), e também depois de qualquer erro do WebDriver.
+Imagens, fontes e mídia não são baixadas: os endereços das imagens usados na saída vêm dos
+atributos do HTML, não do download.
+
+Para cada navegador são guardados o número de consultas e de falhas, a latência das consultas, o
+pico de memória e o motivo do reinício (ver `resumo()`), que vão para o relatório da execução.
+"""
+import functools
+
+from auxiliar.instrumentacao import metricas
+
+# Bloqueadas via CDP (Network.setBlockedURLs); as imagens também são desligadas nas preferências
+URLS_BLOQUEADAS = [
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.m4a', '*.mp3', '*.ogg',
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.ico',
+]
+
+
+def criar_driver(bloquear_recursos=True):
+    """Abre o Chrome headless (Selenium só é importado aqui, para não pesar na inicialização)."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    from auxiliar.coletores import USER_AGENT
+
+    # Configuração das opções do Chrome para rodar em modo headless (sem interface gráfica)
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    if bloquear_recursos:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    driver = webdriver.Chrome(options=chrome_options)
+
+    if bloquear_recursos:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': URLS_BLOQUEADAS})
+        except Exception as e:
+            print(f" Não foi possível bloquear fontes e mídia no Chrome: {e}")
+    return driver
+
+
+def memoria_processos_mb(pid):
+    """Memória residente (MB) do processo e de todos os seus descendentes, ou None sem `psutil`."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        processo = psutil.Process(pid)
+        processos = [processo] + processo.children(recursive=True)
+    except psutil.Error:
+        return None
+    total = 0
+    for p in processos:
+        try:
+            total += p.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+class GerenciadorNavegador:
+    """
+    Cria o Chrome sob demanda e o recicla.
+
+    Args:
+        max_consultas (int | None): buscas por navegador antes de reiniciá-lo (None: sem limite).
+        memoria_max_mb (float | None): memória do chromedriver e dos processos do Chrome acima da qual o
+            navegador é reiniciado; requer `psutil`.
+        bloquear_recursos (bool): não baixa imagens, fontes e mídia.
+        fabrica_driver (callable | None): cria o WebDriver (padrão: `criar_driver`).
+    """
+
+    def __init__(self, max_consultas=50, memoria_max_mb=None, bloquear_recursos=True, fabrica_driver=None):
+        self.max_consultas = max_consultas
+        self.memoria_max_mb = memoria_max_mb
+        self.fabrica_driver = fabrica_driver or functools.partial(criar_driver, bloquear_recursos)
+        self.driver = None
+        self.estatisticas = []
+        self._atual = None
+        if memoria_max_mb:
+            try:
+                import psutil  # noqa: F401
+            except ImportError:
+                print(" Aviso: o limite de memória do navegador requer `pip install psutil`; usando só o limite de consultas.")
+
+    def obter(self):
+        """Devolve o navegador atual, abrindo um novo se necessário."""
+        if self.driver is None:
+            with metricas.etapa('iniciar_navegador'):
+                self.driver = self.fabrica_driver()
+            self._atual = {
+                'navegador': len(self.estatisticas) + 1, 'consultas': 0, 'falhas': 0,
+                'latencias': [], 'memoria_mb_max': None, 'motivo_reinicio': None,
+            }
+            self.estatisticas.append(self._atual)
+        return self.driver
+
+    def memoria_mb(self):
+        processo = getattr(getattr(self.driver, 'service', None), 'process', None)
+        if processo is None:
+            return None
+        return memoria_processos_mb(processo.pid)
+
+    def registrar_consulta(self, segundos):
+        """Registra uma busca concluída e recicla o navegador se ele atingiu algum dos limites."""
+        atual = self._atual
+        atual['consultas'] += 1
+        atual['latencias'].append(segundos)
+        memoria = self.memoria_mb()
+        if memoria is not None:
+            atual['memoria_mb_max'] = max(memoria, atual['memoria_mb_max'] or 0)
+
+        if self.max_consultas and atual['consultas'] >= self.max_consultas:
+            self.reiniciar(f"{atual['consultas']} consultas")
+        elif self.memoria_max_mb and memoria is not None and memoria > self.memoria_max_mb:
+            self.reiniciar(f"memória em {memoria:.0f} MB")
+
+    def registrar_falha(self, erro, reiniciar=True):
+        """Registra uma busca que falhou; erros do WebDriver descartam o navegador (pode ter caído)."""
+        if self._atual is not None:
+            self._atual['falhas'] += 1
+        if reiniciar:
+            self.reiniciar(f"erro: {type(erro).__name__}")
+
+    def reiniciar(self, motivo):
+        """Fecha o navegador atual; o próximo `obter()` abre um novo."""
+        if self.driver is None:
+            return
+        print(f"Reiniciando o navegador ({motivo}).")
+        self._atual['motivo_reinicio'] = motivo
+        metricas.contar('navegadores_reiniciados')
+        self.fechar()
+
+    def fechar(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                print(f" Erro ao encerrar o navegador: {e}")
+            self.driver = None
+
+    def resumo(self):
+        """Estatísticas por navegador aberto: consultas, falhas, latência, pico de memória e motivo do reinício."""
+        resumo = []
+        for estatistica in self.estatisticas:
+            latencias = estatistica['latencias']
+            memoria = estatistica['memoria_mb_max']
+            resumo.append({
+                'navegador': estatistica['navegador'],
+                'consultas': estatistica['consultas'],
+                'falhas': estatistica['falhas'],
+                'latencia_media_s': round(sum(latencias) / len(latencias), 3) if latencias else None,
+                'latencia_max_s': round(max(latencias), 3) if latencias else None,
+                'memoria_mb_max': round(memoria, 1) if memoria is not None else None,
+                'motivo_reinicio': estatistica['motivo_reinicio'],
+            })
+        return resumo
@@ -0,0 +1,89 @@
+"""
+Pipeline produtor/consumidor da execução (ver `main.main`), para a espera pelo navegador e a
+identificação dos municípios (que usa CPU) não bloquearem uma à outra:
+
+1. Coleta (`ColetaEmSegundoPlano`): `workers` threads, cada uma com o seu coletor, buscam os termos
+   e deixam os itens em uma fila limitada, enquanto os termos anteriores são processados.
+2. Identificação dos municípios: opcionalmente em um pool de processos (`criar_pool_nlp`), cada um
+   com o matcher (e o modelo do spaCy) e as tabelas de municípios carregados uma única vez.
+3. Gravação: a thread principal consome os resultados na ordem dos termos e grava a saída, a base e
+   o checkpoint, então o resultado é o mesmo de uma execução serial.
+
+A pressão de volta vem dos limites: a coleta não se adianta mais que `tamanho_fila` termos além dos
+que estão sendo buscados, e a thread principal não deixa mais que dois lotes por processo no pool.
+"""
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from auxiliar.instrumentacao import metricas
+
+
+class ColetaEmSegundoPlano:
+    """
+    Itera sobre `(palavra, itens)` na ordem de `termos`, com as buscas rodando em `workers` threads.
+    No máximo `workers + tamanho_fila` termos ficam em busca ou esperando o consumidor.
+    Os coletores criados ficam em `coletores` (para as estatísticas e para encerrá-los no fim).
+    """
+
+    def __init__(self, termos, fabrica_coletor, workers=1, tamanho_fila=2):
+        self.termos = list(termos)
+        self.fabrica_coletor = fabrica_coletor
+        self.workers = max(1, workers)
+        self.tamanho_fila = max(0, tamanho_fila)
+        self.coletores = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _coletar(self, palavra):
+        coletor = getattr(self._local, 'coletor', None)
+        if coletor is None:
+            coletor = self.fabrica_coletor()
+            self._local.coletor = coletor
+            with self._lock:
+                self.coletores.append(coletor)
+        print(f"\n--- Buscando notícias para: {palavra} ---")
+        with metricas.etapa('coleta', termo=palavra):
+            return coletor.coletar(palavra)
+
+    def __iter__(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='coleta')
+        proximos = iter(self.termos)
+        fila = deque(
+            (palavra, self._executor.submit(self._coletar, palavra))
+            for palavra in itertools.islice(proximos, self.workers + self.tamanho_fila)
+        )
+        while fila:
+            palavra, futuro = fila.popleft()
+            itens = futuro.result()
+            # A vaga liberada vai para o próximo termo, buscado enquanto este é processado
+            for proximo in itertools.islice(proximos, 1):
+                fila.append((proximo, self._executor.submit(self._coletar, proximo)))
+            yield palavra, itens
+
+    def fechar(self):
+        """Descarta as buscas que ainda não começaram e espera as que estão em andamento."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def criar_pool_nlp(processos, inicializador, argumentos):
+    """
+    Pool de processos para a identificação dos municípios. `inicializador(*argumentos)` roda uma vez
+    em cada processo, para carregar o matcher e as tabelas antes do primeiro lote.
+    Os processos são criados com 'spawn' (o padrão do Windows) também no Linux: com as threads da
+    coleta já rodando, um fork poderia copiar locks presos. Os processos começam a subir já aqui, em
+    paralelo com as primeiras buscas, em vez de só quando chega o primeiro lote.
+    """
+    pool = ProcessPoolExecutor(
+        max_workers=processos, mp_context=multiprocessing.get_context('spawn'),
+        initializer=inicializador, initargs=argumentos
+    )
+    for _ in range(processos):
+        pool.submit(os.getpid)
+    return pool
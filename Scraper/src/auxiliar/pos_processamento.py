@@ -1,3 +1,5 @@
+import sys
+
 import pandas as pd
 
 def processar_linhas(df):
@@ -19,49 +21,38 @@ def processar_linhas(df):
                       separadas para nome e código do município.
     """
 
-    novas_linhas_etapa1 = []
-
-    for index, row in df.iterrows():
-        municipios_original_str = row.get('municipios_citados', '')
-
-        if isinstance(municipios_original_str, str) and ',' in municipios_original_str:
-            municipio_code_pairs = [pair.strip() for pair in municipios_original_str.split(',')]
-
-            for pair_str in municipio_code_pairs:
-                nova_linha = row.copy()
-                nova_linha['municipios_citados_temp'] = pair_str
-                novas_linhas_etapa1.append(nova_linha)
-        else:
-            nova_linha = row.copy()
-            nova_linha['municipios_citados_temp'] = municipios_original_str
-            novas_linhas_etapa1.append(nova_linha)
-
-    if not novas_linhas_etapa1:
+    if len(df) == 0:
         expected_cols = df.columns.tolist()
         if 'codigo_municipio' not in expected_cols:
             expected_cols.append('codigo_municipio')
         return pd.DataFrame(columns=expected_cols)
 
-    df_etapa1_concluida = pd.DataFrame(novas_linhas_etapa1).reset_index(drop=True)
-
-    nomes_finais = []
-    codigos_finais = []
-
-    for _, row_etapa1 in df_etapa1_concluida.iterrows():
-        municipio_code_str = row_etapa1.get('municipios_citados_temp', '')
-
-        if isinstance(municipio_code_str, str) and '-' in municipio_code_str:
-            partes = municipio_code_str.split('-', 1)
-            nome = partes[0].strip()
-            codigo = partes[1].strip() if len(partes) > 1 else ""
-            nomes_finais.append(nome)
-            codigos_finais.append(codigo)
-        else:
-            nomes_finais.append(str(municipio_code_str).strip())
-            codigos_finais.append("")
-
-    df_etapa1_concluida['municipios_citados_final'] = nomes_finais
-    df_etapa1_concluida['codigo_municipio_final'] = codigos_finais
+    # Etapa 1: uma linha por par "Nome-Codigo". Só strings com vírgula são separadas (e cada parte
+    # tem os espaços removidos); os demais valores seguem como estão.
+    if 'municipios_citados' in df.columns:
+        municipios_original = df['municipios_citados'].astype(object)
+    else:
+        municipios_original = pd.Series('', index=df.index, dtype=object)
+
+    textos = _apenas_strings(municipios_original)
+    tem_virgula = textos.str.contains(',', regex=False, na=False)
+    pares = textos.str.split(',').map(lambda partes: [p.strip() for p in partes], na_action='ignore')
+    df_etapa1_concluida = (
+        df.assign(municipios_citados_temp=municipios_original.where(~tem_virgula, pares))
+        .explode('municipios_citados_temp')
+        .reset_index(drop=True)
+    )
+
+    # Etapa 2: separa "Nome-Codigo" no primeiro hífen; valores sem hífen viram só o nome.
+    municipio_code_str = df_etapa1_concluida['municipios_citados_temp'].astype(object)
+    textos = _apenas_strings(municipio_code_str)
+    tem_hifen = textos.str.contains('-', regex=False, na=False)
+    partes = textos.str.split('-', n=1, expand=True).reindex(columns=[0, 1]).astype(object)
+
+    df_etapa1_concluida['municipios_citados_final'] = partes[0].str.strip().where(
+        tem_hifen, municipio_code_str.map(str).str.strip()
+    )
+    df_etapa1_concluida['codigo_municipio_final'] = partes[1].str.strip().where(tem_hifen, '')
 
     colunas_para_remover = ['municipios_citados_temp']
     if 'municipios_citados' in df_etapa1_concluida.columns:
@@ -79,7 +70,36 @@ def processar_linhas(df):
         final_cols_order = original_cols_base + ['municipios_citados', 'codigo_municipio']
         final_cols_order_existing = [col for col in final_cols_order if col in df_final.columns]
         df_final = df_final[final_cols_order_existing] if final_cols_order_existing else df_final
-    elif 'municipios_citados' not in df_final.columns and 'codigo_municipio' in df_final.columns:
-        pass
 
     return df_final
+
+
+def _apenas_strings(serie):
+    """Troca por NaN os valores que não são strings, para que o acessor `.str` os ignore."""
+    return serie.where(serie.map(lambda valor: isinstance(valor, str)))
+
+
+def explodir_noticia(noticia):
+    """
+    Versão de `processar_linhas` para uma única notícia (`registros.Noticia` ou dicionário), usada na
+    exportação em streaming.
+    Retorna uma lista de dicionários, um por município citado, com as mesmas colunas e valores
+    que `processar_linhas` produziria para essa linha.
+    """
+    municipios_original = noticia.get('municipios_citados', '')
+    if isinstance(municipios_original, str) and ',' in municipios_original:
+        pares = [pair.strip() for pair in municipios_original.split(',')]
+    else:
+        pares = [municipios_original]
+
+    base = {coluna: valor for coluna, valor in noticia.items() if coluna != 'municipios_citados'}
+    linhas = []
+    for par in pares:
+        if isinstance(par, str) and '-' in par:
+            nome, codigo = par.split('-', 1)
+            # Os mesmos municípios se repetem em milhares de linhas
+            nome, codigo = sys.intern(nome.strip()), sys.intern(codigo.strip())
+        else:
+            nome, codigo = str(par).strip(), ""
+        linhas.append(dict(base, municipios_citados=nome, codigo_municipio=codigo))
+    return linhas
@@ -0,0 +1,108 @@
+"""
+Registro compacto de uma notícia (`Noticia`), usado no lugar de um dicionário por notícia nas listas
+que ficam em memória: itens das páginas de busca, notícias processadas e as lidas da base e do
+checkpoint (exportação completa, retomada, modo serviço).
+
+- `__slots__`: sem o dicionário de atributos de cada instância.
+- Campos que se repetem entre milhares de notícias (fonte, termo, data, municípios e os textos padrão
+  como 'Conteúdo não encontrado') são internados: todas as notícias apontam para a mesma string em
+  vez de uma cópia por notícia.
+
+`Noticia` se comporta como um dicionário somente leitura (`noticia['titulo']`, `.get`, `.items()`,
+`dict(noticia)`), com as chaves na mesma ordem dos dicionários que substitui, então as saídas não
+mudam. Campos não informados não aparecem entre as chaves (ex.: 'cluster_id' sem agrupamento de
+duplicatas). `noticias_para_dataframe` monta um DataFrame com os campos repetidos como categorias
+(usado na exportação do acervo em Parquet, ver `acervo.AcervoNoticias.exportar_parquet`).
+O ganho de memória é medido por `benchmarks/memoria_noticias.py`.
+"""
+import sys
+from collections.abc import Mapping
+
+# Na ordem das colunas das saídas; 'ano_filtro' só existe nos itens das páginas, antes do processamento
+CAMPOS = (
+    'titulo', 'conteudo', 'fonte', 'datetime', 'link', 'img_url', 'ano_filtro', 'palavra_chave',
+    'municipios_citados', 'cluster_id'
+)
+CAMPOS_INTERNADOS = frozenset(('fonte', 'datetime', 'palavra_chave', 'municipios_citados'))
+# Valores usados quando a página não tem o campo (o da imagem vem depois da URL base)
+TEXTOS_PADRAO = (
+    'Título não encontrado', 'Conteúdo não encontrado', 'Fonte não encontrada', 'Data não encontrada',
+    'Imagem não encontrada'
+)
+# Colunas das saídas, com uma linha por município (ver `pos_processamento.explodir_noticia`);
+# as opcionais só entram quando a execução as produz ('cluster_id': agrupamento de quase duplicatas)
+COLUNAS_SAIDA = (
+    'titulo', 'conteudo', 'fonte', 'datetime', 'link', 'img_url', 'palavra_chave', 'cluster_id',
+    'municipios_citados', 'codigo_municipio'
+)
+COLUNAS_OPCIONAIS = frozenset(('cluster_id',))
+COLUNAS_CATEGORICAS = ('fonte', 'datetime', 'palavra_chave', 'municipios_citados', 'codigo_municipio')
+
+_CAMPOS = frozenset(CAMPOS)
+
+
+def internar(valor):
+    """A instância única (`sys.intern`) de uma string; outros valores voltam como estão."""
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+class Noticia(Mapping):
+    """Uma notícia; os campos são os de CAMPOS, passados por nome (`Noticia(**dicionario)`)."""
+
+    __slots__ = CAMPOS
+
+    def __init__(self, **campos):
+        for campo, valor in campos.items():
+            if campo not in _CAMPOS:
+                raise TypeError(f"Campo de notícia desconhecido: {campo}")
+            if isinstance(valor, str) and (campo in CAMPOS_INTERNADOS or valor.endswith(TEXTOS_PADRAO)):
+                valor = sys.intern(valor)
+            setattr(self, campo, valor)
+
+    def __getitem__(self, campo):
+        if campo in _CAMPOS:
+            try:
+                return getattr(self, campo)
+            except AttributeError:
+                pass
+        raise KeyError(campo)
+
+    def __iter__(self):
+        return (campo for campo in CAMPOS if hasattr(self, campo))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Noticia({dict(self)!r})"
+
+    def com(self, **campos):
+        """Cópia da notícia com os campos informados trocados ou acrescentados."""
+        return Noticia(**{**self, **campos})
+
+
+def colunas_saida(opcionais=()):
+    """Colunas das saídas, na ordem, incluindo as colunas opcionais listadas em `opcionais`."""
+    return [coluna for coluna in COLUNAS_SAIDA if coluna not in COLUNAS_OPCIONAIS or coluna in opcionais]
+
+
+def noticias_para_dataframe(noticias, colunas_categoricas=COLUNAS_CATEGORICAS, colunas=None):
+    """
+    DataFrame com uma linha por notícia (registros `Noticia` ou dicionários), com as colunas de
+    `colunas_categoricas` como `category`: cada valor repetido é guardado uma vez só. Com `colunas`,
+    as notícias são lidas uma vez só, sem guardar a lista (ex.: direto de um cursor).
+    """
+    import pandas as pd
+
+    if colunas is None:
+        noticias = list(noticias)
+        colunas = list(dict.fromkeys(campo for noticia in noticias for campo in noticia))
+    valores = {coluna: [] for coluna in colunas}
+    for noticia in noticias:
+        for coluna, lista in valores.items():
+            lista.append(noticia.get(coluna))
+    df = pd.DataFrame(valores, columns=list(colunas))
+    for coluna in colunas_categoricas:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype('category')
+    return df
@@ -0,0 +1,98 @@
+"""
+Scroll adaptativo da página de resultados do Google News.
+Em vez de dormir um tempo fixo a cada scroll, espera o número de itens de notícia no DOM aumentar
+e para assim que um scroll não traz nenhum link novo, quando o limite de scrolls é atingido,
+quando o orçamento de tempo do termo acaba ou, com `data_minima`, quando um scroll só traz notícias
+publicadas antes dela (a página já passou da janela de datas, ver `auxiliar.janela_datas`).
+"""
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+SELETOR_ITENS = 'div.UW0SDc, article'
+
+# Devolve a quantidade de itens no DOM e os hrefs e datas (atributo datetime da tag <time>) dos itens
+# a partir do índice informado, para que cada chamada só transfira o que foi adicionado desde a anterior.
+JS_ITENS = f"""
+const nodes = document.querySelectorAll('{SELETOR_ITENS}');
+const links = [];
+const datas = [];
+for (let i = arguments[0]; i < nodes.length; i++) {{
+    const a = nodes[i].querySelector('a[href]');
+    if (!a) continue;
+    const tempo = nodes[i].querySelector('time[datetime]');
+    links.push(a.getAttribute('href'));
+    datas.push(tempo ? tempo.getAttribute('datetime') : null);
+}}
+return [nodes.length, links, datas];
+"""
+
+
+def anteriores_a(datas, data_minima):
+    """Se há datas (ISO 8601, None quando o item não tem) e todas são de antes de `data_minima` (date)."""
+    dias = [data[:10] for data in datas if data]
+    return bool(dias) and all(dia < data_minima.isoformat() for dia in dias)
+
+
+def rolar_ate_saturar(driver, max_scrolls=20, espera_max=4.0, tempo_limite=None, intervalo_poll=0.1, data_minima=None):
+    """
+    Faz scroll até a página parar de trazer notícias novas.
+
+    Args:
+        driver: sessão do Selenium já com a página de busca carregada.
+        max_scrolls (int): limite de scrolls.
+        espera_max (float): tempo máximo (s) esperando novos itens aparecerem após cada scroll.
+        tempo_limite (float | None): orçamento de tempo (s) para o termo inteiro.
+        intervalo_poll (float): intervalo (s) entre as verificações do DOM.
+        data_minima (date | None): início da janela de datas; o scroll para quando os itens novos
+            de um scroll são todos anteriores a ela.
+
+    Returns:
+        dict: estatísticas com 'scrolls', 'itens_por_scroll' (links novos a cada scroll),
+              'total_links', 'tempo' (s) e 'motivo' da parada.
+    """
+    inicio = time.monotonic()
+    quantidade, links, _ = driver.execute_script(JS_ITENS, 0)
+    vistos = set(links)
+    ganhos = []
+    motivo = 'limite de scrolls'
+
+    while len(ganhos) < max_scrolls:
+        if tempo_limite is not None and time.monotonic() - inicio >= tempo_limite:
+            motivo = 'tempo esgotado'
+            break
+
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        espera = espera_max
+        if tempo_limite is not None:
+            espera = max(0.0, min(espera_max, tempo_limite - (time.monotonic() - inicio)))
+        try:
+            WebDriverWait(driver, espera, poll_frequency=intervalo_poll).until(
+                lambda d: d.execute_script(f"return document.querySelectorAll('{SELETOR_ITENS}').length;") > quantidade
+            )
+        except TimeoutException:
+            ganhos.append(0)
+            motivo = 'nenhum item novo no DOM'
+            break
+
+        nova_quantidade, novos_links, novas_datas = driver.execute_script(JS_ITENS, quantidade)
+        quantidade = nova_quantidade
+        links_ineditos = [href for href in novos_links if href not in vistos]
+        vistos.update(links_ineditos)
+        ganhos.append(len(links_ineditos))
+        print(f"Scroll {len(ganhos)}/{max_scrolls}: {len(links_ineditos)} links novos ({quantidade} itens na página).")
+        if not links_ineditos:
+            motivo = 'nenhum link novo'
+            break
+        if data_minima is not None and anteriores_a(novas_datas, data_minima):
+            motivo = 'notícias anteriores à janela de datas'
+            break
+
+    return {
+        'scrolls': len(ganhos),
+        'itens_por_scroll': ganhos,
+        'total_links': len(vistos),
+        'tempo': round(time.monotonic() - inicio, 3),
+        'motivo': motivo,
+    }
@@ -0,0 +1,205 @@
+"""
+Saídas em streaming: cada notícia processada é gravada assim que fica pronta, já separada em uma
+linha por município (ver `pos_processamento.explodir_noticia`), em vez de acumular tudo em memória
+e exportar só no fim da execução.
+Todas expõem `escrever(noticia)` e `fechar()`. As linhas são gravadas em lotes, a cada
+`linhas_por_lote` linhas ou `intervalo_flush` segundos, sempre em registros completos.
+As colunas são fixas (`registros.colunas_saida`, mais as opcionais ligadas na execução), e não as
+da primeira notícia: um campo que só aparece em notícias posteriores não some do arquivo.
+
+- SaidaCsv / SaidaJsonl: acrescentam os lotes ao fim do arquivo, que é válido a cada lote gravado.
+- SaidaParquet: cada lote vira um arquivo `parte-NNNNN.parquet` dentro de um diretório, que é lido
+  como um único dataset (`pd.read_parquet(diretorio)`). Requer `pyarrow`. Como os outros formatos,
+  que recomeçam o arquivo no primeiro lote, as partes de uma gravação anterior no mesmo diretório
+  (ex.: a execução interrompida, na retomada) são apagadas no primeiro lote.
+- SaidaXlsx: um .xlsx só é válido depois de salvo, então os lotes são acrescentados a um spool JSONL
+  ('<arquivo>.xlsx.parcial.jsonl') e o `fechar()` monta a planilha a partir dele, no modo write-only
+  do openpyxl (memória constante), grava com outro nome e renomeia; o caminho final nunca contém um
+  arquivo pela metade. Se o processo morrer antes do `fechar()`, o spool fica com todas as linhas
+  já gravadas (e pode ser importado no acervo, ver `consultar_acervo.py importar`).
+"""
+import csv
+import glob
+import io
+import json
+import os
+import time
+
+from auxiliar.pos_processamento import explodir_noticia
+from auxiliar.registros import colunas_saida
+
+FORMATOS = ('xlsx', 'csv', 'jsonl', 'parquet')
+
+
+class _SaidaEmLotes:
+    """Base das saídas: acumula as linhas e as grava em lotes com `_gravar_lote`."""
+
+    extensao = ''
+
+    def __init__(self, caminho, linhas_por_lote=200, intervalo_flush=5.0, colunas=None):
+        self.caminho = caminho
+        self.linhas_por_lote = linhas_por_lote
+        self.intervalo_flush = intervalo_flush
+        self.colunas = list(colunas) if colunas is not None else colunas_saida()
+        self.noticias = 0
+        self.linhas = 0
+        self.lotes = 0
+        self._pendentes = []
+        self._ultimo_flush = time.monotonic()
+
+    def escrever(self, noticia):
+        linhas = explodir_noticia(noticia)
+        self._pendentes.extend(linhas)
+        self.noticias += 1
+        self.linhas += len(linhas)
+        if (len(self._pendentes) >= self.linhas_por_lote
+                or time.monotonic() - self._ultimo_flush >= self.intervalo_flush):
+            self.flush()
+
+    def flush(self):
+        if self._pendentes:
+            self._gravar_lote(self._pendentes)
+            self.lotes += 1
+            self._pendentes = []
+        self._ultimo_flush = time.monotonic()
+
+    def fechar(self):
+        self.flush()
+
+    def _gravar_lote(self, linhas):
+        raise NotImplementedError
+
+
+class SaidaCsv(_SaidaEmLotes):
+    extensao = '.csv'
+
+    def _gravar_lote(self, linhas):
+        buffer = io.StringIO()
+        escritor = csv.DictWriter(buffer, fieldnames=self.colunas, extrasaction='ignore')
+        novo = self.lotes == 0
+        if novo:
+            escritor.writeheader()
+        escritor.writerows(linhas)
+        # utf-8-sig para o Excel reconhecer os acentos ao abrir o CSV
+        with open(self.caminho, 'w' if novo else 'a', encoding='utf-8-sig' if novo else 'utf-8', newline='') as f:
+            f.write(buffer.getvalue())
+
+
+def _gravar_jsonl(caminho, linhas, novo):
+    bloco = "".join(json.dumps(linha, ensure_ascii=False) + "\n" for linha in linhas)
+    with open(caminho, 'w' if novo else 'a', encoding='utf-8') as f:
+        f.write(bloco)
+
+
+class SaidaJsonl(_SaidaEmLotes):
+    extensao = '.jsonl'
+
+    def _gravar_lote(self, linhas):
+        _gravar_jsonl(self.caminho, linhas, novo=self.lotes == 0)
+
+
+class SaidaParquet(_SaidaEmLotes):
+    extensao = '.parquet'
+
+    def __init__(self, caminho, linhas_por_lote=5000, intervalo_flush=30.0, colunas=None):
+        super().__init__(caminho, linhas_por_lote, intervalo_flush, colunas)
+
+    def _gravar_lote(self, linhas):
+        import pandas as pd
+
+        os.makedirs(self.caminho, exist_ok=True)
+        if self.lotes == 0:
+            for antigo in glob.glob(os.path.join(self.caminho, 'parte-*.parquet*')):
+                os.remove(antigo)
+        arquivo = os.path.join(self.caminho, f"parte-{self.lotes:05d}.parquet")
+        temporario = arquivo + '.tmp'
+        pd.DataFrame(linhas, columns=self.colunas).astype("string").to_parquet(temporario, index=False)
+        os.replace(temporario, arquivo)
+
+
+class SaidaXlsx(_SaidaEmLotes):
+    extensao = '.xlsx'
+
+    def __init__(self, caminho, linhas_por_lote=200, intervalo_flush=5.0, colunas=None):
+        super().__init__(caminho, linhas_por_lote, intervalo_flush, colunas)
+        self.caminho_spool = caminho + '.parcial.jsonl'
+
+    def _gravar_lote(self, linhas):
+        _gravar_jsonl(self.caminho_spool, linhas, novo=self.lotes == 0)
+
+    def fechar(self):
+        super().fechar()
+        if self.lotes == 0 or not os.path.exists(self.caminho_spool):
+            return
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        planilha = workbook.create_sheet()
+        planilha.append(self.colunas)
+        with open(self.caminho_spool, 'r', encoding='utf-8') as f:
+            for linha in f:
+                linha = json.loads(linha)
+                planilha.append([linha.get(coluna) for coluna in self.colunas])
+        temporario = self.caminho + '.parcial'
+        workbook.save(temporario)
+        os.replace(temporario, self.caminho)
+        os.remove(self.caminho_spool)
+
+
+SAIDAS = {
+    'xlsx': SaidaXlsx,
+    'csv': SaidaCsv,
+    'jsonl': SaidaJsonl,
+    'parquet': SaidaParquet,
+}
+
+
+def criar_saida(formato, prefixo, colunas=None):
+    """
+    Cria a saída do formato escolhido, gravando em '<prefixo><extensão>', com as `colunas` informadas
+    (padrão: `registros.colunas_saida()`, sem as opcionais).
+    """
+    if formato not in SAIDAS:
+        raise ValueError(f"Formato de saída desconhecido: {formato}")
+    classe = SAIDAS[formato]
+    if not prefixo.lower().endswith(classe.extensao):
+        prefixo += classe.extensao
+    return classe(prefixo, colunas=colunas)
+
+
+class SaidaMultipla:
+    """
+    Grava cada notícia em várias saídas (por exemplo, o arquivo da execução e o acervo, ver
+    `auxiliar.acervo`). `caminho` e os contadores são os da saída principal.
+    """
+
+    def __init__(self, principal, *extras):
+        self.principal = principal
+        self.saidas = [principal, *extras]
+
+    @property
+    def caminho(self):
+        return self.principal.caminho
+
+    @property
+    def noticias(self):
+        return self.principal.noticias
+
+    @property
+    def linhas(self):
+        return self.principal.linhas
+
+    def escrever(self, noticia):
+        for saida in self.saidas:
+            saida.escrever(noticia)
+
+    def fechar(self):
+        # Fecha todas, mesmo que uma falhe, e repassa o primeiro erro
+        erro = None
+        for saida in self.saidas:
+            try:
+                saida.fechar()
+            except Exception as e:
+                erro = erro or e
+        if erro is not None:
+            raise erro
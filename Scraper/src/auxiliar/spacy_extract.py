@@ -1,94 +1,67 @@
-import spacy
-from spacy.matcher import PhraseMatcher
-from unidecode import unidecode
+"""
+Extração dos candidatos a município dos títulos. Dois mecanismos, com os nomes do gazetteer
+(`auxiliar.municipios`):
 
-# Carrega o modelo de português
-nlp = spacy.load("pt_core_news_lg") # python -m spacy download pt_core_news_lg ou pt_core_news_sm para um tamanho menor
+- 'trie' (padrão): trie de palavras normalizadas (ver `auxiliar.matcher_municipios`), sem spaCy;
+  ignora acentos e maiúsculas e fica com o nome mais longo.
+- 'spacy': PhraseMatcher do spaCy em LOWER (comportamento original; requer o modelo do spaCy).
+"""
+import functools
 
-municipios_bahia = [
-    "Abaíra", "Abaré", "Acajutiba", "Adustina", "Água Fria", "Aiquara", "Alagoinhas", "Alcobaça",
-    "Almadina", "Amargosa", "Amélia Rodrigues", "América Dourada", "Anagé", "Andaraí", "Andorinha",
-    "Angical", "Anguera", "Antas", "Antônio Cardoso", "Antônio Gonçalves", "Aporá", "Apuarema",
-    "Araças", "Aracatu", "Araci", "Aramari", "Arataca", "Aratuípe", "Aurelino Leal", "Baianópolis",
-    "Baixa Grande", "Banzaê", "Barra", "Barra da Estiva", "Barra do Choça", "Barra do Mendes",
-    "Barra do Rocha", "Barreiras", "Barro Alto", "Barro Preto", "Barrocas", "Belmonte", "Belo Campo",
-    "Biritinga", "Boa Nova", "Boa Vista do Tupim", "Bom Jesus da Lapa", "Bom Jesus da Serra",
-    "Boninal", "Bonito", "Boquira", "Botuporã", "Brejões", "Brejolândia", "Brotas de Macaúbas",
-    "Brumado", "Buerarema", "Buritirama", "Caatiba", "Cabaceiras do Paraguaçu", "Cachoeira",
-    "Caculé", "Caém", "Caetanos", "Caetité", "Cafarnaum", "Cairu", "Caldeirão Grande", "Camacan",
-    "Camaçari", "Camamu", "Campo Alegre de Lourdes", "Campo Formoso", "Canápolis", "Canarana",
-    "Canavieiras", "Candeal", "Candeias", "Candiba", "Cândido Sales", "Cansanção", "Canudos",
-    "Capela do Alto Alegre", "Capim Grosso", "Caraíbas", "Caravelas", "Cardeal da Silva", "Carinhanha",
-    "Casa Nova", "Castro Alves", "Catolândia", "Catu", "Caturama", "Central", "Chorrochó",
-    "Cícero Dantas", "Cipó", "Coaraci", "Cocos", "Conceição da Feira", "Conceição do Almeida",
-    "Conceição do Coité", "Conceição do Jacuípe", "Conde", "Condeúba", "Contendas do Sincorá",
-    "Coração de Maria", "Cordeiros", "Coribe", "Coronel João Sá", "Correntina", "Cotegipe", "Cravolândia",
-    "Crisópolis", "Cristópolis", "Cruz das Almas", "Curaçá", "Dário Meira", "Dias d'Ávila", "Dom Basílio",
-    "Dom Macedo Costa", "Elísio Medrado", "Encruzilhada", "Entre Rios", "Érico Cardoso", "Esplanada",
-    "Euclides da Cunha", "Eunápolis", "Fátima", "Feira da Mata", "Feira de Santana", "Filadélfia",
-    "Firmino Alves", "Floresta Azul", "Formosa do Rio Preto", "Gandu", "Gavião", "Gentio do Ouro",
-    "Glória", "Gongogi", "Governador Mangabeira", "Guajeru", "Guanambi", "Guaratinga", "Heliópolis",
-    "Iaçu", "Ibiassucê", "Ibicaraí", "Ibicoara", "Ibicuí", "Ibipeba", "Ibipitanga", "Ibiquera", "Ibirapitanga",
-    "Ibirapuã", "Ibirataia", "Ibitiara", "Ibititá", "Ibotirama", "Ichu", "Igaporã", "Igrapiúna", "Iguaí",
-    "Ilhéus", "Inhambupe", "Ipecaetá", "Ipiaú", "Ipirá", "Ipupiara", "Irajuba", "Iramaia", "Iraquara",
-    "Irará", "Irecê", "Itabela", "Itaberaba", "Itabuna", "Itacaré", "Itaeté", "Itagi", "Itagibá", "Itagimirim",
-    "Itaguaçu da Bahia", "Itaju do Colônia", "Itajuípe", "Itamaraju", "Itamari", "Itambé", "Itanagra",
-    "Itanhém", "Itaparica", "Itapé", "Itapebi", "Itapetinga", "Itapicuru", "Itapitanga", "Itaquara",
-    "Itarantim", "Itatim", "Itiruçu", "Itiúba", "Itororó", "Ituaçu", "Ituberá", "Iuiú", "Jaborandi",
-    "Jacaraci", "Jacobina", "Jaguaquara", "Jaguarari", "Jaguaripe", "Jandaíra", "Jequié", "Jeremoabo",
-    "Jiquiriçá", "Jitaúna", "João Dourado", "Juazeiro", "Jucuruçu", "Jussara", "Jussari", "Jussiape",
-    "Lafaiete Coutinho", "Lagoa Real", "Laje", "Lajedão", "Lajedinho", "Lajedo do Tabocal", "Lamarão",
-    "Lapão", "Lauro de Freitas", "Lençóis", "Licínio de Almeida", "Livramento de Nossa Senhora",
-    "Luís Eduardo Magalhães", "Macajuba", "Macarani", "Macaúbas", "Macururé", "Madre de Deus",
-    "Maetinga", "Maiquinique", "Mairi", "Malhada", "Malhada de Pedras", "Manoel Vitorino", "Mansidão",
-    "Maracás", "Maragogipe", "Maraú", "Marcionílio Souza", "Mascote", "Mata de São João", "Matina",
-    "Medeiros Neto", "Miguel Calmon", "Milagres", "Mirangaba", "Mirante", "Monte Santo", "Morpará",
-    "Morro do Chapéu", "Mortugaba", "Mucugê", "Mucuri", "Mulungu do Morro", "Mundo Novo", "Muniz Ferreira",
-    "Muquém de São Francisco", "Muritiba", "Mutuípe", "Nazaré", "Nilo Peçanha", "Nordestina", "Nova Canaã",
-    "Nova Fátima", "Nova Ibiá", "Nova Itarana", "Nova Redenção", "Nova Soure", "Nova Viçosa", "Novo Horizonte",
-    "Novo Triunfo", "Olindina", "Oliveira dos Brejinhos", "Ouriçangas", "Ourolândia", "Palmas de Monte Alto",
-    "Palmeiras", "Paramirim", "Paratinga", "Paripiranga", "Pau Brasil", "Paulo Afonso", "Pé de Serra",
-    "Pedrão", "Pedro Alexandre", "Piatã", "Pilão Arcado", "Pindaí", "Pindobaçu", "Pintadas", "Piraí do Norte",
-    "Piripá", "Piritiba", "Planaltino", "Planalto", "Poções", "Pojuca", "Ponto Novo", "Porto Seguro",
-    "Potiraguá", "Prado", "Presidente Dutra", "Presidente Jânio Quadros", "Presidente Tancredo Neves",
-    "Queimadas", "Quijingue", "Quixabeira", "Rafael Jambeiro", "Remanso", "Retirolândia", "Riachão das Neves",
-    "Riachão do Jacuípe", "Riacho de Santana", "Ribeira do Amparo", "Ribeira do Pombal", "Ribeirão do Largo",
-    "Rio de Contas", "Rio do Antônio", "Rio do Pires", "Rio Real", "Rodelas", "Ruy Barbosa", "Salinas da Margarida",
-    "Salvador", "Santa Bárbara", "Santa Brígida", "Santa Cruz Cabrália", "Santa Cruz da Vitória",
-    "Santa Inês", "Santa Luzia", "Santa Maria da Vitória", "Santa Rita de Cássia", "Santa Teresinha",
-    "Santaluz", "Santana", "Santanópolis", "Santo Amaro", "Santo Antônio de Jesus", "Santo Estêvão",
-    "São Desidério", "São Domingos", "São Felipe", "São Félix", "São Félix do Coribe", "São Francisco do Conde",
-    "São Gabriel", "São Gonçalo dos Campos", "São José da Vitória", "São José do Jacuípe", "São Miguel das Matas",
-    "São Sebastião do Passé", "Sapeaçu", "Sátiro Dias", "Saubara", "Saúde", "Seabra", "Sebastião Laranjeiras",
-    "Senhor do Bonfim", "Sento Sé", "Serra do Ramalho", "Serra Dourada", "Serra Preta", "Serrinha", "Serrolândia",
-    "Simões Filho", "Sítio do Mato", "Sítio do Quinto", "Sobradinho", "Souto Soares", "Tabocas do Brejo Velho",
-    "Tanhaçu", "Tanque Novo", "Tanquinho", "Taperoá", "Tapiramutá", "Teixeira de Freitas", "Teodoro Sampaio",
-    "Teofilândia", "Teolândia", "Terra Nova", "Tremedal", "Tucano", "Uauá", "Ubaíra", "Ubaitaba", "Ubatã",
-    "Uibaí", "Umburanas", "Una", "Urandi", "Uruçuca", "Utinga", "Valença", "Valente", "Várzea da Roça",
-    "Várzea do Poço", "Várzea Nova", "Varzedo", "Vera Cruz", "Vereda", "Vitória da Conquista", "Wagner",
-    "Wanderley", "Wenceslau Guimarães", "Xique-Xique"
-]
+from auxiliar.matcher_municipios import get_matcher_trie
+from auxiliar.municipios import UFS_PADRAO, get_municipios
 
+MATCHERS = ('trie', 'spacy')
 
-matcher = PhraseMatcher(nlp.vocab, attr="LOWER")  # ignora maiúsculas/minúsculas
+# Modelo de português (python -m spacy download pt_core_news_lg ou pt_core_news_sm para um tamanho menor)
+MODELO_SPACY = "pt_core_news_lg"
+# Componentes do pipeline que o PhraseMatcher em LOWER não usa: só a tokenização é necessária
+COMPONENTES_NAO_USADOS = ["tok2vec", "morphologizer", "parser", "lemmatizer", "attribute_ruler", "ner", "senter"]
 
-# Cria padrões com base nos nomes dos municipios
-patterns = [nlp(municipio) for municipio in municipios_bahia]
-matcher.add("MUNICIPIO", patterns)
+@functools.lru_cache()
+def get_nlp():
+    """Carrega o modelo do spaCy no primeiro uso, sem os componentes listados em COMPONENTES_NAO_USADOS."""
+    import spacy
 
-def extrair_municipios(texto):
-    doc = nlp(texto)
-    matches = matcher(doc)
-    encontrados = [doc[start:end].text for match_id, start, end in matches]
-    return encontrados
+    return spacy.load(MODELO_SPACY, exclude=COMPONENTES_NAO_USADOS)
 
-def remover_municipios(texto):
-    doc = nlp(texto)
-    matches = matcher(doc)
-    spans = [doc[start:end] for _, start, end in matches]
-    spans = spacy.util.filter_spans(spans)
-    texto_limpo = texto
-    for span in spans:
-        texto_limpo = texto_limpo.replace(span.text, "")
-    return texto_limpo.strip()
 
+@functools.lru_cache()
+def get_matcher(ufs=UFS_PADRAO):
+    """Cria, no primeiro uso, o PhraseMatcher com os nomes dos municípios (ignora maiúsculas/minúsculas)."""
+    from spacy.matcher import PhraseMatcher
+
+    nlp = get_nlp()
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    nomes = [municipio.nome for municipio in get_municipios(ufs)]
+    matcher.add("MUNICIPIO", list(nlp.tokenizer.pipe(nomes)))
+    return matcher
+
+def _municipios_no_doc(doc, ufs=UFS_PADRAO):
+    return [doc[start:end].text for match_id, start, end in get_matcher(ufs)(doc)]
+
+def extrair_municipios(texto, ufs=UFS_PADRAO, matcher='trie'):
+    if matcher == 'trie':
+        return get_matcher_trie(ufs).encontrar(texto)
+    return _municipios_no_doc(get_nlp().make_doc(texto), ufs)
+
+def extrair_municipios_batch(textos, batch_size=256, ufs=UFS_PADRAO, matcher='trie'):
+    """
+    Versão em lote de `extrair_municipios`. Com o spaCy, tokeniza todos os textos de uma vez com `nlp.tokenizer.pipe`.
+    Retorna uma lista com os municípios encontrados em cada texto, na mesma ordem de `textos`.
+    """
+    if matcher == 'trie':
+        trie = get_matcher_trie(ufs)
+        return [trie.encontrar(texto) for texto in textos]
+    return [_municipios_no_doc(doc, ufs) for doc in get_nlp().tokenizer.pipe(textos, batch_size=batch_size)]
+
+def remover_municipios(texto, ufs=UFS_PADRAO):
+    """Remove do texto os nomes de municípios encontrados."""
+    ocorrencias = get_matcher_trie(ufs).ocorrencias(texto)
+    partes = []
+    inicio = 0
+    for _, comeco, fim in ocorrencias:
+        partes.append(texto[inicio:comeco])
+        inicio = fim
+    partes.append(texto[inicio:])
+    return "".join(partes).strip()
@@ -0,0 +1,107 @@
+"""
+Consultas ao acervo consolidado (ver `auxiliar.acervo`), que acumula as linhas exportadas por todas
+as execuções do main.py, e importação das planilhas de execuções antigas.
+
+Exemplos:
+    python .\src\consultar_acervo.py importar saida_*.xlsx src\saida_*.xlsx
+    python .\src\consultar_acervo.py consultar --por municipio mes --de 2025-01
+    python .\src\consultar_acervo.py consultar --por palavra_chave --municipio "Feira de Santana"
+    python .\src\consultar_acervo.py noticias --municipio 2910800 --de 2025-10-01
+    python .\src\consultar_acervo.py resumo
+"""
+import argparse
+import glob
+import sys
+import time
+
+from auxiliar.acervo import DIMENSOES, AcervoNoticias
+
+
+def adicionar_filtros(parser):
+    parser.add_argument("--municipio", help="Código IBGE ou nome do município.")
+    parser.add_argument("--palavra-chave", help="Termo de busca exato.")
+    parser.add_argument("--fonte", help="Fonte exata (ex.: G1).")
+    parser.add_argument("--de", help="Data inicial, 'aaaa-mm-dd' (ou 'aaaa-mm', 'aaaa').")
+    parser.add_argument("--ate", help="Data final, 'aaaa-mm-dd' (ou 'aaaa-mm', 'aaaa', incluindo o período inteiro).")
+    parser.add_argument("--limite", type=int, help="Quantidade máxima de linhas no resultado.")
+    parser.add_argument("--csv", help="Grava o resultado neste arquivo CSV em vez de mostrá-lo.")
+
+
+def filtros(args):
+    return dict(municipio=args.municipio, palavra_chave=args.palavra_chave, fonte=args.fonte, de=args.de, ate=args.ate)
+
+
+def mostrar(linhas, caminho_csv, duracao):
+    import pandas as pd
+
+    df = pd.DataFrame(linhas, dtype=object)
+    if caminho_csv:
+        df.to_csv(caminho_csv, index=False, encoding='utf-8-sig')
+        print(f"{len(df)} linhas gravadas em '{caminho_csv}'.")
+    elif df.empty:
+        print("Nenhum resultado.")
+    else:
+        with pd.option_context('display.max_rows', None, 'display.max_colwidth', 80, 'display.width', 200):
+            print(df.to_string(index=False))
+    print(f"({len(df)} linhas em {duracao * 1000:.1f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consulta o acervo de notícias acumulado pelas execuções do main.py.")
+    parser.add_argument("--acervo", default="acervo.sqlite3", help="Arquivo do acervo (padrão: acervo.sqlite3).")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    importar = comandos.add_parser("importar", help="Importa saídas antigas (.xlsx, .csv, .jsonl ou diretórios .parquet).")
+    importar.add_argument("arquivos", nargs="+", help="Arquivos ou padrões (ex.: saida_*.xlsx).")
+    importar.add_argument("--forcar", action="store_true", help="Lê de novo arquivos já importados e sem alteração.")
+
+    consultar = comandos.add_parser("consultar", help="Quantidade de notícias por município, termo, fonte e/ou período.")
+    consultar.add_argument(
+        "--por", nargs="+", choices=list(DIMENSOES), default=["municipio", "codigo_municipio"],
+        help="Agrupamentos (padrão: municipio codigo_municipio)."
+    )
+    adicionar_filtros(consultar)
+
+    noticias = comandos.add_parser("noticias", help="Lista as notícias que atendem aos filtros.")
+    adicionar_filtros(noticias)
+    noticias.set_defaults(limite=100)
+
+    comandos.add_parser("resumo", help="Totais do acervo.")
+
+    exportar = comandos.add_parser("exportar-parquet", help="Grava o acervo em Parquet particionado por ano e mês.")
+    exportar.add_argument("diretorio", help="Diretório de destino.")
+
+    args = parser.parse_args()
+    acervo = AcervoNoticias(args.acervo)
+    try:
+        if args.comando == "importar":
+            caminhos = [caminho for padrao in args.arquivos for caminho in sorted(glob.glob(padrao)) or [padrao]]
+            for caminho in caminhos:
+                try:
+                    novas = acervo.importar_arquivo(caminho, forcar=args.forcar)
+                except (OSError, ValueError) as e:
+                    print(f" Erro ao importar '{caminho}': {e}")
+                    continue
+                if novas is None:
+                    print(f"'{caminho}' já importado, sem alterações.")
+                else:
+                    print(f"'{caminho}': {novas} linhas novas.")
+        elif args.comando == "consultar":
+            inicio = time.perf_counter()
+            linhas = acervo.consultar(args.por, limite=args.limite, **filtros(args))
+            mostrar(linhas, args.csv, time.perf_counter() - inicio)
+        elif args.comando == "noticias":
+            inicio = time.perf_counter()
+            linhas = acervo.noticias(limite=args.limite, **filtros(args))
+            mostrar(linhas, args.csv, time.perf_counter() - inicio)
+        elif args.comando == "resumo":
+            for chave, valor in acervo.resumo().items():
+                print(f"{chave}: {valor}")
+        elif args.comando == "exportar-parquet":
+            print(f"{acervo.exportar_parquet(args.diretorio)} linhas gravadas em '{args.diretorio}'.")
+    finally:
+        acervo.fechar()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,28 +5,37 @@ processar os resultados e salvar em excel.
 O script utiliza Selenium para automação do navegador, BeautifulSoup para parsing do HTML,
 e pandas para exportação dos dados para Excel.
 """
-import time
-import unicodedata
-import re 
+import os
 import sys
 import argparse
+import logging
+import functools
+import signal
+import time
+from collections import deque, namedtuple
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from bs4 import BeautifulSoup
-import pandas as pd
 from datetime import datetime
 
-from auxiliar.municipios import get_municipios_metadata 
-from auxiliar.spacy_extract import extrair_municipios 
-from auxiliar import pos_processamento
-
-# URL raiz do Google News
-root_url = 'https://news.google.com'
+from auxiliar.municipios import UFS_PADRAO, get_municipios, normalizar_ufs
+from auxiliar.spacy_extract import MATCHERS, extrair_municipios, extrair_municipios_batch
+from auxiliar.coletores import BACKENDS, criar_coletor, root_url
+from auxiliar.extracao import PARSERS_HTML
+from auxiliar.armazenamento import BaseNoticias
+from auxiliar.acervo import AcervoNoticias
+from auxiliar.saidas import FORMATOS, SaidaMultipla, criar_saida
+from auxiliar.instrumentacao import metricas
+from auxiliar.registros import Noticia, colunas_saida
+from auxiliar.janela_datas import JANELA_PADRAO, JanelaDatas
+from auxiliar.pipeline import ColetaEmSegundoPlano, criar_pool_nlp
+from auxiliar.artigos import BuscadorArtigos
+from auxiliar.links_canonicos import ResolvedorLinks
+from auxiliar.cache_paginas import CachePaginas
+from auxiliar.duplicatas import AgrupadorDuplicatas
+from auxiliar.checkpoints import CheckpointExecucao, caminho_checkpoint, novo_run_id
+from auxiliar.agendador import (
+    PRIORIDADE_PADRAO, Agendador, LimitadorTaxa, TermoAgendado, carregar_agenda, ler_termos
+)
+from auxiliar.desambiguacao import DesambiguadorMunicipios, pre_process_text_for_municipality_detection, ufs_citadas
 
 ## Lista de termos de busca relacionados a fraudes e corrupção na Bahia
 #search_terms = [
@@ -52,6 +61,8 @@ root_url = 'https://news.google.com'
 #    "PF corrupção fraude prefeitura bahia"
 #]
 
+logger = logging.getLogger(__name__)
+
 # Lista para armazenar as notícias coletadas
 news = []
 seen_links = set()
@@ -63,316 +74,600 @@ PALAVRAS_AMBIGUAS = {
     "santana", "wagner", "Wagner"
 }
 
-def normalize_text(text):
-    """Normaliza o texto removendo acentos e convertendo para minúsculas."""
-    if not isinstance(text, str):
-        return ""
-    try:
-        nfkd_form = unicodedata.normalize('NFKD', text.lower())
-        return "".join([c for c in nfkd_form if not unicodedata.combining(c)])
-    except Exception:
-
-        return text.lower()
-
+# UFs monitoradas (ver `auxiliar.municipios`) e mecanismo de busca dos nomes nos títulos (ver `auxiliar.spacy_extract`)
+ufs_monitoradas = UFS_PADRAO
+matcher_municipios = 'trie'
 
-ALL_BAHIA_MUNICIPIOS_DATA = get_municipios_metadata() 
-MUNICIPIO_LOOKUP = {
-    normalize_text(nome_original): f"{nome_original}-{codigo}"
-    for nome_original, codigo in ALL_BAHIA_MUNICIPIOS_DATA.items()
-}
+@functools.lru_cache()
+def get_desambiguador(ufs=UFS_PADRAO):
+    """Monta, no primeiro uso, o desambiguador com as tabelas de municípios das UFs e as palavras ambíguas."""
+    return DesambiguadorMunicipios(get_municipios(ufs), PALAVRAS_AMBIGUAS)
 
 
-NORMALIZED_MUNICIPIO_NAMES = set(MUNICIPIO_LOOKUP.keys())
-
-MULTI_WORD_MUNICIPIOS = {}
-for name_original in ALL_BAHIA_MUNICIPIOS_DATA.keys():
-    if ' ' in name_original:
-        normalized_name = normalize_text(name_original)
-        components = normalized_name.split()
-        for comp in components:
-            if comp in NORMALIZED_MUNICIPIO_NAMES: 
-                 if normalized_name not in MULTI_WORD_MUNICIPIOS:
-                     MULTI_WORD_MUNICIPIOS[normalized_name] = []
-                 if comp not in MULTI_WORD_MUNICIPIOS[normalized_name]:
-                    MULTI_WORD_MUNICIPIOS[normalized_name].append(comp)
-                    
-
-def pre_process_text_for_municipality_detection(text):
-    """Remove sufixos comuns como (BA), - BA, etc., do texto."""
-    if not isinstance(text, str):
-        return ""
-    text = re.sub(r'\s*\(BA\)\s*', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\s*-\s*BA\s*', '', text, flags=re.IGNORECASE)
-    text = re.sub(r',\s*BA\b', '', text, flags=re.IGNORECASE) 
-    return text.strip()
-
-
-def is_geographical_context(name, text):
+def get_municipios_from_title(title, text_content, potential_municipios_raw=None):
     """
-    Verifica se um nome aparece em um contexto que sugere ser um nome geográfico.
-    Aplica pre-processamento no texto antes de verificar.
+    Extrai e filtra municipios usando o modelo do spacy e o contexto.
+    Aplica pre-processamento no texto antes de extrair e filtrar.
+    Aplica pos processamento no texto para tratar municipios com mais de uma palavra.
+    Prioriza o contexto ao máximo.
+    `potential_municipios_raw` permite informar os candidatos já extraídos do título pré-processado
+    (ver `extrair_municipios_batch`); se omitido, são extraídos aqui.
     """
-    if not isinstance(name, str) or not isinstance(text, str):
-        return False
+    if not title and not text_content:
+        return []
 
-    processed_text = pre_process_text_for_municipality_detection(text)
+    processed_title = pre_process_text_for_municipality_detection(title)
+    processed_text_content = pre_process_text_for_municipality_detection(text_content)
 
-    normalized_name_escaped = re.escape(normalize_text(name))
+    context_text = processed_text_content if processed_text_content and processed_text_content.strip() else processed_title
 
-    padroes_geograficos = [
-        rf"\b(prefeitura|município|cidade|câmara)\s+(?:de|do|da|d[oa]s?)\s+{normalized_name_escaped}\b",
-        rf"\b(?:em|na|no|de|do|da|para|às?)\s+{normalized_name_escaped}\b",
-        rf"\b{normalized_name_escaped}\s+(?:prefeitura|município|cidade)\b" 
-    ]
+    if potential_municipios_raw is None:
+        potential_municipios_raw = extrair_municipios(processed_title, ufs_monitoradas, matcher_municipios)
 
-    for pattern in padroes_geograficos:
-        if re.search(pattern, processed_text, re.IGNORECASE):
-            return True
+    desambiguador = get_desambiguador(ufs_monitoradas)
+    ufs = None
+    if desambiguador.homonimos:
+        # As siglas ("Bonito (MS)") são procuradas no texto original, antes do pré-processamento
+        ufs = ufs_citadas(f"{title or ''}\n{text_content or ''}")
+    return desambiguador.filtrar(potential_municipios_raw, context_text, ufs)
 
-    return False
 
+# `duplicatas`: as quase duplicatas do termo, gravadas na base e no checkpoint só em `concluir_itens`
+LoteTermo = namedtuple('LoteTermo', ['palavra', 'itens', 'novos', 'contextos', 'clusters', 'duplicatas'])
 
-def should_ignore_municipality(name, text):
+
+def preparar_itens(palavra, itens, buscador_artigos=None, agrupador=None, janela=JANELA_PADRAO, resolvedor_links=None):
     """
-    Determina se um nome deve ser ignorado com logica extra para verificação de palavras ambiguas.
+    Primeira etapa de `processar_itens`: filtro da janela de datas, resolução dos links canônicos,
+    deduplicação por link, agrupamento das quase duplicatas e download dos textos completos. Depende do
+    estado da execução (links vistos, agrupador), então roda na thread principal, na ordem dos termos.
+    Não grava nada na base nem no checkpoint: com `--processos-nlp`, os termos seguintes são preparados
+    antes de os anteriores terminarem, e cada termo deve ser gravado por inteiro em `concluir_itens`.
+    Retorna um `LoteTermo`, ou None se a coleta falhou.
     """
-    if not isinstance(name, str):
-        return True 
-    normalized_name = normalize_text(name)
-
-  
-    if normalized_name == 'bahia':
-        return True
+    if itens is None:
+        metricas.contar('termos_com_falha', termo=palavra)
+        return None
+    metricas.contar('itens_vistos', len(itens), termo=palavra)
+    # Filtro barato, antes de tudo o que custa: notícias fora da janela não são marcadas como vistas nem
+    # gravadas na base, então uma execução com outra janela ainda pode aceitá-las
+    na_janela = []
+    for item in itens:
+        if janela is not None and not janela.contem_item(item):
+            logger.info(" Ignorando notícia de %s (fora da janela %s).", item.get('datetime'), janela.descricao())
+            metricas.contar('itens_fora_janela', termo=palavra)
+            continue
+        na_janela.append(item)
+
+    if resolvedor_links is not None and na_janela:
+        # A deduplicação passa a comparar o endereço da notícia, igual em todos os termos e execuções
+        with metricas.etapa('links', termo=palavra):
+            canonicos = resolvedor_links.resolver([item['link'] for item in na_janela if 'link' in item])
+        for indice, item in enumerate(na_janela):
+            canonico = canonicos.get(item.get('link'))
+            if canonico is not None and canonico != item['link']:
+                na_janela[indice] = item.com(link=canonico)
+
+    novos = []
+    for item in na_janela:
+        try:
+            item_link = item['link']
+            if item_link in seen_links:
+                metricas.contar('itens_duplicados', termo=palavra)
+                continue
 
-    
-    if normalized_name in PALAVRAS_AMBIGUAS:
-        return not is_geographical_context(name, text)
+            seen_links.add(item_link)
+            novos.append(item)
+        except Exception as e:
+            logger.warning("Erro ao processar item: %s", e)
+            continue
 
-    return False
+    clusters = {}
+    duplicatas = []
+    if agrupador is not None:
+        canonicos = []
+        with metricas.etapa('duplicatas', termo=palavra):
+            for item in novos:
+                cluster_id, canonica = agrupador.agrupar(item, palavra)
+                if canonica:
+                    clusters[item['link']] = cluster_id
+                    canonicos.append(item)
+                    continue
+                metricas.contar('itens_quase_duplicados', termo=palavra)
+                duplicatas.append(dict(item, palavra_chave=palavra, municipios_citados=''))
+        novos = canonicos
+
+    textos_artigos = {}
+    if buscador_artigos is not None and novos:
+        with metricas.etapa('artigos', termo=palavra):
+            textos_artigos = buscador_artigos.buscar_textos([item['link'] for item in novos])
+    contextos = [
+        f"{item['conteudo']}\n{textos_artigos[item['link']]}" if textos_artigos.get(item['link']) else item['conteudo']
+        for item in novos
+    ]
+    return LoteTermo(palavra, na_janela, novos, contextos, clusters, duplicatas)
 
 
-def get_municipios_from_title(title, text_content):
+def identificar_municipios(titulos, contextos, palavra=None):
     """
-    Extrai e filtra municipios usando o modelo do spacy e o contexto.
-    Aplica pre-processamento no texto antes de extrair e filtrar.
-    Aplica pos processamento no texto para tratar municipios com mais de uma palavra.
-    Prioriza o contexto ao máximo.
+    Segunda etapa de `processar_itens`: extrai em lote os candidatos dos títulos e os desambigua com o
+    contexto de cada notícia. Só depende das UFs e do matcher configurados, então também roda nos
+    processos de NLP (ver `identificar_municipios_processo`). Notícias com erro ficam com None.
     """
-    if not title and not text_content:
-        return []
+    titulos_processados = [pre_process_text_for_municipality_detection(titulo) for titulo in titulos]
+    with metricas.etapa('spacy', termo=palavra):
+        candidatos_por_item = extrair_municipios_batch(titulos_processados, ufs=ufs_monitoradas, matcher=matcher_municipios)
 
-    processed_title = pre_process_text_for_municipality_detection(title)
-    processed_text_content = pre_process_text_for_municipality_detection(text_content)
-
-    context_text = processed_text_content if processed_text_content and processed_text_content.strip() else processed_title
+    municipios_por_item = []
+    for titulo, contexto, candidatos in zip(titulos, contextos, candidatos_por_item):
+        try:
+            with metricas.etapa('desambiguacao', termo=palavra):
+                municipios_por_item.append(get_municipios_from_title(titulo, contexto, candidatos))
+        except Exception as e:
+            logger.warning("Erro ao processar item: %s", e)
+            municipios_por_item.append(None)
+    return municipios_por_item
 
-    potential_municipios_raw = extrair_municipios(processed_title)
 
-    potential_normalized_set = {normalize_text(name) for name in potential_municipios_raw if isinstance(name, str)}
+def configurar_processo_nlp(ufs, matcher):
+    """
+    Inicializador dos processos de NLP: configura as UFs e o matcher e os carrega uma única vez.
+    O Ctrl-C é tratado só pelo processo principal, que decide quais lotes terminar (ver `main`).
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    global ufs_monitoradas, matcher_municipios
+    ufs_monitoradas = ufs
+    matcher_municipios = matcher
+    extrair_municipios("", ufs, matcher)
+    get_desambiguador(ufs)
 
-    filtered_municipios_normalized = set()
 
-    for nome_raw in potential_municipios_raw:
-        if not isinstance(nome_raw, str) or not nome_raw.strip():
-            continue
+def identificar_municipios_processo(titulos, contextos):
+    """
+    `identificar_municipios` em um processo de NLP. Devolve também os tempos das etapas medidos no
+    processo, para serem somados às métricas da execução.
+    """
+    metricas.reiniciar()
+    municipios_por_item = identificar_municipios(titulos, contextos)
+    return municipios_por_item, metricas.etapas
 
-        normalized_name = normalize_text(nome_raw)
 
-        if normalized_name in NORMALIZED_MUNICIPIO_NAMES and normalized_name != 'bahia':
-            if not should_ignore_municipality(nome_raw, context_text):
-                is_component_of_detected_multi_word = False
-                for multi_word_normalized, components_normalized in MULTI_WORD_MUNICIPIOS.items():
-                    if normalized_name in components_normalized:
-                         if multi_word_normalized in potential_normalized_set:
-                            is_component_of_detected_multi_word = True
-                            break #
+def concluir_itens(lote, municipios_por_item, base=None, saida=None, checkpoint=None):
+    """
+    Última etapa de `processar_itens`: grava as notícias do lote na saída, na base e no checkpoint, que
+    marca o termo como concluído. Retorna a quantidade de notícias aceitas.
+    """
+    palavra = lote.palavra
+    aceitas = 0
+    for duplicata in lote.duplicatas:
+        if base is not None:
+            # Registrada como descartada para não voltar a ser processada no modo incremental
+            base.registrar(duplicata, descartada=True)
+        if checkpoint is not None:
+            checkpoint.registrar(palavra, duplicata, 'duplicata')
+    for item, municipios_potential in zip(lote.novos, municipios_por_item):
+        if municipios_potential is None:
+            continue
+        try:
+            item_link = item['link']
+            municipios_string = ",".join(municipios_potential) if municipios_potential else ""
+
+            campos_extras = {'cluster_id': lote.clusters[item_link]} if lote.clusters else {}
+            item_dict = Noticia(
+                titulo=item['titulo'],
+                conteudo=item['conteudo'],
+                fonte=item['fonte'],
+                datetime=item['datetime'],
+                link=item_link,
+                img_url=item['img_url'],
+                palavra_chave=palavra,
+                municipios_citados=municipios_string,
+                **campos_extras
+            )
+
+            if saida is not None:
+                with metricas.etapa('saida', termo=palavra):
+                    saida.escrever(item_dict)
+            else:
+                news.append(item_dict)
+            aceitas += 1
+            metricas.contar('noticias_aceitas', termo=palavra)
+            metricas.contar('municipios_encontrados', len(municipios_potential), termo=palavra)
+            if base is not None:
+                base.registrar(item_dict)
+            if checkpoint is not None:
+                checkpoint.registrar(palavra, item_dict)
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "\n============================================== NOTÍCIA ===================================================\n"
+                    f"TÍTULO: {item_dict['titulo']}\n"
+                    f"CONTEÚDO: {item_dict['conteudo'][:200]}...\n"
+                    f"MUNICÍPIOS CITADOS ({len(municipios_potential)}): {item_dict['municipios_citados']}\n"
+                    f"FONTE: {item_dict['fonte']}\n"
+                    f"DATA: {item_dict['datetime']}\n"
+                    f"LINK: {item_dict['link']}\n"
+                    f"IMAGEM: {item_dict['img_url']}\n"
+                    f"PALAVRA-CHAVE: {item_dict['palavra_chave']}"
+                )
+        except Exception as e:
+            logger.warning("Erro ao processar item: %s", e)
+            continue
 
-                if not is_component_of_detected_multi_word:
-                    filtered_municipios_normalized.add(normalized_name)
+    if checkpoint is not None:
+        with metricas.etapa('checkpoint', termo=palavra):
+            checkpoint.concluir_termo(palavra, [item['link'] for item in lote.itens if 'link' in item])
+    if base is not None:
+        with metricas.etapa('base_incremental', termo=palavra):
+            base.salvar()
+    return aceitas
 
 
+def concluir_lote_processado(lote, futuro, base=None, saida=None, checkpoint=None):
+    """Espera o resultado do pool de NLP para o lote (ver `identificar_municipios_processo`) e o grava."""
+    with metricas.etapa('espera_nlp', termo=lote.palavra):
+        municipios_por_item, etapas = futuro.result()
+    metricas.somar_etapas(etapas, termo=lote.palavra)
+    with metricas.etapa('processamento', termo=lote.palavra):
+        return concluir_itens(lote, municipios_por_item, base, saida, checkpoint)
 
 
-    mapped_list = []
-    for normalized_filtered_name in filtered_municipios_normalized:
+def processar_itens(palavra, itens, base=None, saida=None, buscador_artigos=None, agrupador=None, checkpoint=None,
+                    janela=JANELA_PADRAO, resolvedor_links=None):
+    """
+    Aplica o filtro da janela de datas, a deduplicação por link e a extração de municípios aos itens
+    coletados para um termo. Cada notícia aceita é gravada em `saida` (ver `auxiliar.saidas`)
+    ou, sem saída, acumulada em `news`. Retorna a quantidade de notícias aceitas.
+    Deve ser chamada na ordem dos termos para que a saída seja igual à de uma execução serial.
+    Se `base` (BaseNoticias) for informada, cada notícia processada é registrada nela.
+    Os candidatos a município de todos os itens novos da página são extraídos em um único lote.
+    Com `buscador_artigos` (ver `auxiliar.artigos`), o texto completo das notícias novas é baixado em
+    paralelo e usado, junto com o trecho da busca, como contexto para desambiguar os municípios.
+    Com `agrupador` (ver `auxiliar.duplicatas`), notícias quase iguais a uma já vista (mesma matéria em
+    outro site ou outro termo) não passam pela extração: ficam registradas como fonte alternativa do
+    grupo, e as notícias aceitas ganham a coluna 'cluster_id'.
+    Com `checkpoint` (ver `auxiliar.checkpoints`), o termo é marcado como concluído, junto com as suas
+    notícias e links, ao fim do processamento. Termos cuja coleta falhou (`itens` None) não são marcados,
+    para serem refeitos em uma retomada.
+    `janela` (ver `auxiliar.janela_datas`; padrão: a partir de 2023) descarta as notícias publicadas fora
+    dela antes de qualquer outra etapa; None aceita todas.
+    Com `resolvedor_links` (ver `auxiliar.links_canonicos`), os links do Google News são trocados pelos
+    endereços canônicos das notícias antes da deduplicação, que passa a reconhecer a mesma notícia
+    vinda de outro termo ou de outra execução.
+    São as três etapas `preparar_itens`, `identificar_municipios` e `concluir_itens` em sequência; com
+    `--processos-nlp`, o `main` roda a do meio em um pool de processos.
+    """
+    lote = preparar_itens(palavra, itens, buscador_artigos, agrupador, janela, resolvedor_links)
+    if lote is None:
+        return 0
+    municipios_por_item = identificar_municipios([item['titulo'] for item in lote.novos], lote.contextos, palavra)
+    return concluir_itens(lote, municipios_por_item, base, saida, checkpoint)
+
+
+def carregar_historico(base, agrupador=None):
+    """Marca os links da base como vistos e, com `agrupador`, indexa as notícias dela (modo incremental)."""
+    if base is None:
+        return
+    seen_links.update(base.links_processados())
+    print(f"Modo incremental: {len(seen_links)} links já processados em execuções anteriores.")
+    if agrupador is not None:
+        # As notícias da base entram no índice para que as republicações de hoje caiam nos grupos delas
+        with metricas.etapa('duplicatas'):
+            for noticia in base.todas_noticias():
+                agrupador.agrupar(noticia)
+
+
+def main(search_terms, output_file, workers=1, fabrica_coletor=criar_coletor, base=None, exportar='delta',
+         formato='xlsx', caminho_relatorio=None, buscador_artigos=None, agrupador=None, checkpoint=None,
+         ufs=UFS_PADRAO, matcher='trie', acervo=None, processos_nlp=0, tamanho_fila=2, janela=JANELA_PADRAO,
+         resolvedor_links=None):
+    """
+    Busca os termos, processa as notícias e exporta o resultado.
+    `fabrica_coletor` cria um coletor novo (ver `auxiliar.coletores`); com mais de um worker,
+    cada thread usa o seu.
+    As notícias são gravadas em '<output_file>_<timestamp>' no `formato` escolhido à medida que são
+    processadas (ver `auxiliar.saidas`), então uma interrupção não perde o que já foi coletado.
+    Com `base` (modo incremental), links já presentes na base são ignorados e as notícias novas são
+    gravadas nela; `exportar` escolhe entre exportar só as novas ('delta') ou a base inteira ('completo').
+    No fim é gravado um relatório JSON com tempos por etapa e contadores (ver `auxiliar.instrumentacao`)
+    em `caminho_relatorio` (padrão: '<output_file>_<timestamp>.relatorio.json').
+    `buscador_artigos` ativa o download do texto completo das notícias (ver `processar_itens`).
+    `agrupador` ativa o agrupamento de notícias quase duplicadas; as fontes alternativas de cada grupo
+    são gravadas em '<output_file>_<timestamp>.duplicatas.csv'.
+    Com `checkpoint` (ver `auxiliar.checkpoints`), cada termo concluído é salvo; se o checkpoint já tiver
+    termos concluídos (retomada), eles são pulados e as suas notícias são regravadas na mesma saída da
+    execução original antes de continuar com os termos restantes.
+    `ufs` escolhe os estados cujos municípios são procurados (ver `auxiliar.municipios`) e `matcher`, o
+    mecanismo de busca dos nomes: 'trie' (padrão) ou 'spacy' (ver `auxiliar.spacy_extract`).
+    Com `acervo` (ver `auxiliar.acervo`), as linhas exportadas também são acrescentadas ao acervo consolidado.
+    A coleta roda em segundo plano, até `tamanho_fila` termos à frente do processamento, e, com
+    `processos_nlp` > 0, a identificação dos municípios roda em um pool de processos (ver `auxiliar.pipeline`).
+    Notícias publicadas fora de `janela` são descartadas antes da deduplicação e da identificação dos
+    municípios (ver `processar_itens`); para a busca e o scroll também usarem a janela, ela deve ser
+    passada ao coletor (ver `auxiliar.coletores.criar_coletor`).
+    `resolvedor_links` ativa a troca dos links do Google News pelos links canônicos (ver `processar_itens`).
+    """
+    global ufs_monitoradas, matcher_municipios
+    ufs_monitoradas = normalizar_ufs(ufs)
+    matcher_municipios = matcher
+    metricas.reiniciar()
+    carregar_historico(base, agrupador)
+
+    prefixo_saida = f"{output_file}_{datetime.now().strftime('%Y-%m-%d_%H%M')}"
+    termos_concluidos = set()
+    if checkpoint is not None:
+        # Na retomada, a saída continua no mesmo arquivo da execução original
+        prefixo_saida = checkpoint.obter('prefixo_saida', prefixo_saida)
+        checkpoint.definir('prefixo_saida', prefixo_saida)
+        checkpoint.definir('formato', formato)
+        termos_concluidos = checkpoint.termos_concluidos()
+    exportar_base = base is not None and exportar == 'completo'
+    # A base não guarda o cluster_id, então a exportação da base completa não tem essa coluna
+    colunas = colunas_saida(('cluster_id',) if agrupador is not None and not exportar_base else ())
+    saida, saida_acervo = criar_saida_com_acervo(formato, prefixo_saida, acervo, colunas)
+    if caminho_relatorio is None:
+        caminho_relatorio = f"{prefixo_saida}.relatorio.json"
+    # Exportando a base completa, as notícias novas já ficam na base e a saída é gerada só no fim
+    saida_durante_coleta = None if exportar_base else saida
+    total_noticias = 0
+
+    termos_pendentes = [palavra for palavra in search_terms if palavra not in termos_concluidos]
+    if termos_concluidos:
+        print(f"Retomando a execução {checkpoint.run_id}: {len(search_terms) - len(termos_pendentes)} termos já "
+              f"concluídos, {len(termos_pendentes)} restantes.")
+        with metricas.etapa('retomada'):
+            seen_links.update(checkpoint.links())
+            for palavra, situacao, noticia in checkpoint.itens():
+                if agrupador is not None:
+                    agrupador.agrupar(noticia, palavra)
+                if base is not None:
+                    # Idempotente: refaz o que a base possa ter perdido se a execução caiu antes de salvá-la
+                    base.registrar(noticia, descartada=situacao != 'aceita')
+                if situacao != 'aceita':
+                    continue
+                if saida_durante_coleta is not None:
+                    saida_durante_coleta.escrever(noticia)
+                else:
+                    news.append(noticia)
+                total_noticias += 1
+
+    # Os termos são buscados em segundo plano enquanto os anteriores são processados (ver `auxiliar.pipeline`)
+    coleta = ColetaEmSegundoPlano(termos_pendentes, fabrica_coletor, workers, tamanho_fila)
+    coletores = coleta.coletores
+    pool_nlp = None
+    if processos_nlp > 0:
+        pool_nlp = criar_pool_nlp(processos_nlp, configurar_processo_nlp, (ufs_monitoradas, matcher_municipios))
+    pendentes = deque()
+    try:
+        for palavra, itens in coleta:
+            with metricas.etapa('processamento', termo=palavra):
+                lote = preparar_itens(palavra, itens, buscador_artigos, agrupador, janela, resolvedor_links)
+                if lote is not None and pool_nlp is None:
+                    municipios_por_item = identificar_municipios(
+                        [item['titulo'] for item in lote.novos], lote.contextos, palavra
+                    )
+                    total_noticias += concluir_itens(lote, municipios_por_item, base, saida_durante_coleta, checkpoint)
+            if lote is not None and pool_nlp is not None:
+                futuro = pool_nlp.submit(
+                    identificar_municipios_processo, [item['titulo'] for item in lote.novos], lote.contextos
+                )
+                pendentes.append((lote, futuro))
+                # Com lotes demais no pool, grava o mais antigo antes de consumir outro termo da coleta
+                while len(pendentes) > max(1, 2 * processos_nlp):
+                    total_noticias += concluir_lote_processado(
+                        *pendentes.popleft(), base, saida_durante_coleta, checkpoint
+                    )
+        while pendentes:
+            total_noticias += concluir_lote_processado(*pendentes.popleft(), base, saida_durante_coleta, checkpoint)
 
-        if normalized_filtered_name in MUNICIPIO_LOOKUP:
-             mapped_list.append(MUNICIPIO_LOOKUP[normalized_filtered_name])
+        print(f"Quantidade total de notícias encontradas: {total_noticias}")
 
-    return list(dict.fromkeys(mapped_list)) 
 
-# Configuração das opções do Chrome para rodar em modo headless (sem interface gráfica)
-chrome_options = Options()
-chrome_options.add_argument("--headless")
-chrome_options.add_argument("--no-sandbox")
-chrome_options.add_argument("--disable-dev-shm-usage")
-chrome_options.add_argument("--disable-gpu")
-chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        print(f"Quantidade total de notícias únicas encontradas e processadas: {total_noticias}")
 
-# Inicialização do driver do Chrome
-driver = webdriver.Chrome(options=chrome_options)
+        if saida_durante_coleta is None:
+            noticias_base = base.todas_noticias()
+            print(f"Exportando a base completa: {len(noticias_base)} notícias.")
+            for noticia in noticias_base:
+                saida.escrever(noticia)
 
-def main(search_terms, output_file):
-    try:
-        # Loop sobre cada termo de busca
-        for palavra in search_terms:
-            print(f"\n--- Buscando notícias para: {palavra} ---")
-            query_text = palavra.replace(' ', '+')
-            link = f"{root_url}/search?q={query_text}&hl=pt-BR&gl=BR&ceid=BR%3Apt-419"
+    finally:
+        if pool_nlp is not None:
+            # Numa interrupção, os lotes que ainda não começaram são cancelados (os seus termos não foram
+            # marcados como concluídos e são refeitos na retomada); os que já estavam rodando terminam, e
+            # todos os lotes prontos são gravados, na ordem dos termos
+            pool_nlp.shutdown(wait=True, cancel_futures=True)
+            for lote, futuro in pendentes:
+                if futuro.cancelled():
+                    continue
+                try:
+                    concluir_lote_processado(lote, futuro, base, saida_durante_coleta, checkpoint)
+                except Exception as e:
+                    print(f" Erro ao gravar as notícias de '{lote.palavra}': {e}")
+        coleta.fechar()
+        # Encerra os navegadores e conexões abertas
+        for coletor in coletores:
+            try:
+                coletor.fechar()
+            except Exception as e:
+                print(f" Erro ao encerrar o coletor: {e}")
+        if base is not None:
+            base.salvar()
+        # Grava o que ainda estiver pendente, mesmo se a execução foi interrompida
+        try:
+            with metricas.etapa('saida_fechar'):
+                saida.fechar()
+            if saida.noticias:
+                print(f"✅ Dados exportados para '{saida.caminho}' ({saida.noticias} notícias, {saida.linhas} linhas).")
+        except Exception as e:
+            print(f" Erro ao exportar dados para '{saida.caminho}': {e}")
 
-            print(f"Acessando: {link}")
+        if agrupador is not None and agrupador.alternativas:
+            caminho_duplicatas = f"{prefixo_saida}.duplicatas.csv"
             try:
-                driver.get(link)
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.UW0SDc, article"))
-                )
-                print("Página carregada e elementos de notícias encontrados.")
-            except TimeoutException:
-                print(f" Timeout ao carregar a página de busca para: {palavra}. Pulando.")
-                continue
+                quantidade = agrupador.salvar_alternativas(caminho_duplicatas)
+                print(f"Fontes alternativas de {len(agrupador.alternativas)} notícias ({quantidade} quase duplicatas) "
+                      f"gravadas em '{caminho_duplicatas}'.")
             except Exception as e:
-                print(f" Erro ao acessar ou carregar a página de busca para '{palavra}': {e}. Pulando.")
-                continue
+                print(f" Erro ao gravar as quase duplicatas em '{caminho_duplicatas}': {e}")
 
-            last_height = driver.execute_script("return document.body.scrollHeight")
-            scroll_count = 0
-            max_scrolls = 20
-            scroll_pause_time = 2
-
-            print(f"Iniciando scroll para carregar mais notícias (max {max_scrolls} scrolls)...")
-            while scroll_count < max_scrolls:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                scroll_count += 1
-                time.sleep(scroll_pause_time)
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    print(
-                        f"Scroll {scroll_count}/{max_scrolls}: Altura da página não mudou. Fim do conteúdo ou limite atingido.")
-                    break
-                last_height = new_height
-                print(f"Scroll {scroll_count}/{max_scrolls}: Nova altura da página {new_height}.")
-            print("Scroll concluído.")
-
-            html = driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
-            news_items = soup.select('div.UW0SDc, article')
-            print(f"Total de elementos de notícias encontrados após scroll: {len(news_items)}")
-
-            if not news_items:
-                print(f" Nenhum item de notícia encontrado para a busca '{palavra}' após scrolling. Pulando para a próxima palavra.")
-                continue
-            
-            for i, item in enumerate(news_items):
-                item_link = None
-                try:
-                    title_tag = item.select_one('a.JtKRv, h3 a, h4 a')
-                    content_tag = item.select_one('div.GI74Re.nDgy9d, p')
-                    link_tag = item.select_one("a[href]")
-                    publisher_tag = item.select_one('div.vr1PYe, div.wsLqz')
-                    img_tag = item.find('img', class_='Quavad vwBmvb') or item.find('img')
-                    date_tag = item.select_one('time.hvbAAd, time')
-
-                    if link_tag and link_tag.get('href'):
-                        href = link_tag['href']
-                        if href.startswith('./articles/'):
-                            item_link = f"{root_url}{href[1:]}"
-                        elif href.startswith('http'):
-                            item_link = href
-                        else:
-                            item_link = f"{root_url}/{href.lstrip('/')}"
-
-                    if not item_link or item_link in seen_links:
-                        continue
-
-                    seen_links.add(item_link)
-
-                    title = title_tag.text.strip() if title_tag else 'Título não encontrado'
-                    content = content_tag.text.strip() if content_tag else 'Conteúdo não encontrado'
-                    publisher = publisher_tag.text.strip() if publisher_tag else 'Fonte não encontrada'
-                    data_publicacao = 'Data não encontrada'
-                    ano_filtro = None
-                    if date_tag and date_tag.get('datetime'):
-                        try:
-                            datetime_string = date_tag['datetime']
-                            if datetime_string.endswith('Z'):
-                                 datetime_string = datetime_string[:-1] + '+00:00'
-                            elif '+' not in datetime_string and '-' not in datetime_string[10:]:
-                                 datetime_string += '+00:00' 
-
-                            datetime_obj = datetime.fromisoformat(datetime_string)
-                            data_publicacao = datetime_obj.strftime('%d/%m/%Y')
-                            ano_filtro = int(datetime_obj.strftime('%Y'))
-                            print(f" Data de publicação parseada: {data_publicacao}")
-                        except ValueError as ve:
-                            print(f" Erro ao parsear data '{datetime_string}': {ve}")
-                            data_publicacao = datetime_string 
-                        except Exception as ex:
-                             print(f" Erro inesperado ao processar data '{datetime_string}': {ex}")
-                             data_publicacao = datetime_string
-
-
-                    img_url_final = img_tag['srcset'].split()[0] if img_tag and img_tag.get('srcset') else (
-                        img_tag['src'] if img_tag and img_tag.get('src') else 'Imagem não encontrada'
-                    )
+        try:
+            metricas.salvar_relatorio(
+                caminho_relatorio, termos=list(search_terms), workers=workers, formato=formato,
+                incremental=base is not None, exportar=exportar, arquivo_saida=saida.caminho,
+                ufs=list(ufs_monitoradas), matcher_municipios=matcher_municipios,
+                janela_datas=janela.descricao() if janela is not None else None,
+                noticias_exportadas=saida.noticias, linhas_exportadas=saida.linhas,
+                acervo=acervo.caminho if acervo is not None else None,
+                linhas_novas_acervo=saida_acervo.novas if saida_acervo is not None else None,
+                scroll=[e for coletor in coletores for e in getattr(coletor, 'estatisticas_scroll', [])],
+                navegadores=[e for coletor in coletores for e in getattr(coletor, 'estatisticas_navegadores', [])],
+            )
+            print(f"Tempo por etapa:\n{metricas.resumo()}")
+            print(f"Relatório da execução gravado em '{caminho_relatorio}'.")
+        except Exception as e:
+            print(f" Erro ao gravar o relatório da execução: {e}")
 
+def criar_saida_com_acervo(formato, prefixo_saida, acervo=None, colunas=None):
+    """Saída da execução e, com `acervo`, a saída que também grava as linhas nele (ou None)."""
+    saida = criar_saida(formato, prefixo_saida, colunas)
+    if acervo is None:
+        return saida, None
+    saida_acervo = acervo.saida(origem=os.path.basename(saida.caminho))
+    return SaidaMultipla(saida, saida_acervo), saida_acervo
 
-                    municipios_potential = get_municipios_from_title(title, content)
-
-                    municipios_string = ",".join(municipios_potential) if municipios_potential else ""
-
-                    item_dict = {
-                        'titulo': title,
-                        'conteudo': content,
-                        'fonte': publisher,
-                        'datetime': data_publicacao,
-                        'link': item_link,
-                        'img_url': root_url + img_url_final,
-                        'palavra_chave': palavra,
-                        'municipios_citados': municipios_string
-                    }
-
-                    if ano_filtro is not None and ano_filtro < 2023:
-                        print(f" Ignorando notícia de ano {ano_filtro} (menor que 2023).")
-                        continue
-
-                    news.append(item_dict)
-
-                    print(
-                        "\n============================================== NOTÍCIA ===================================================")
-                    print(f"TÍTULO: {item_dict['titulo']}")
-                    print(f"CONTEÚDO: {item_dict['conteudo'][:200]}...")
-                    print(f"MUNICÍPIOS CITADOS ({len(municipios_potential)}): {item_dict['municipios_citados']}")
-                    print(f"FONTE: {item_dict['fonte']}")
-                    print(f"DATA: {item_dict['datetime']}")
-                    print(f"LINK: {item_dict['link']}")
-                    print(f"IMAGEM: {item_dict['img_url']}")
-                    print(f"PALAVRA-CHAVE: {item_dict['palavra_chave']}")
-                except Exception as e:
-                    print(f"Erro ao processar item: {e}")
-                    continue
 
+def executar_ciclo(ciclo, termos, agendador, coletor, output_file, formato='xlsx', limitador=None, base=None,
+                   buscador_artigos=None, agrupador=None, acervo=None, janela=JANELA_PADRAO, resolvedor_links=None):
+    """
+    Busca os termos vencidos de um ciclo do modo serviço e grava as notícias novas em
+    '<output_file>_<timestamp>' (nada é gravado se não houver notícias novas), com o relatório e as
+    quase duplicatas do ciclo ao lado. Cada termo é reagendado assim que termina; um erro na busca ou
+    no processamento de um termo é registrado e o termo é reagendado como falha, sem parar o ciclo.
+    """
+    metricas.reiniciar()
+    prefixo_saida = f"{output_file}_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}"
+    colunas = colunas_saida(('cluster_id',) if agrupador is not None else ())
+    saida, saida_acervo = criar_saida_com_acervo(formato, prefixo_saida, acervo, colunas)
+    total_noticias = 0
+    espera_inicial = limitador.espera_total if limitador is not None else 0.0
+    print(f"\n=== Ciclo {ciclo}: {len(termos)} termos ===")
+    try:
+        for termo in termos:
+            palavra = termo.palavra
+            if limitador is not None:
+                with metricas.etapa('limite_taxa', termo=palavra):
+                    limitador.aguardar()
+            print(f"\n--- Buscando notícias para: {palavra} ---")
+            try:
+                with metricas.etapa('coleta', termo=palavra):
+                    itens = coletor.coletar(palavra)
+                with metricas.etapa('processamento', termo=palavra):
+                    total_noticias += processar_itens(
+                        palavra, itens, base, saida, buscador_artigos, agrupador, janela=janela,
+                        resolvedor_links=resolvedor_links
+                    )
+                sucesso = itens is not None
+            except Exception as e:
+                print(f" Erro ao buscar ou processar as notícias de '{palavra}': {e}")
+                metricas.contar('termos_com_erro', termo=palavra)
+                sucesso = False
+            agendador.reagendar(termo, sucesso=sucesso)
     finally:
-        # Encerra o driver do navegador
-        driver.quit()
+        try:
+            with metricas.etapa('saida_fechar'):
+                saida.fechar()
+            if saida.noticias:
+                print(f"✅ Ciclo {ciclo}: {saida.noticias} notícias novas exportadas para '{saida.caminho}'.")
+            else:
+                print(f"Ciclo {ciclo}: nenhuma notícia nova.")
+        except Exception as e:
+            print(f" Erro ao exportar dados para '{saida.caminho}': {e}")
 
-    print(f"Quantidade total de notícias encontradas: {len(news)}")
+        if agrupador is not None and agrupador.alternativas:
+            caminho_duplicatas = f"{prefixo_saida}.duplicatas.csv"
+            try:
+                agrupador.salvar_alternativas(caminho_duplicatas)
+                # O próximo ciclo grava só as quase duplicatas que ele encontrar
+                agrupador.alternativas.clear()
+            except Exception as e:
+                print(f" Erro ao gravar as quase duplicatas em '{caminho_duplicatas}': {e}")
 
+        try:
+            metricas.salvar_relatorio(
+                f"{prefixo_saida}.relatorio.json", ciclo=ciclo, termos=[termo.palavra for termo in termos],
+                formato=formato, incremental=base is not None, arquivo_saida=saida.caminho,
+                noticias_exportadas=saida.noticias, linhas_exportadas=saida.linhas,
+                acervo=acervo.caminho if acervo is not None else None,
+                linhas_novas_acervo=saida_acervo.novas if saida_acervo is not None else None,
+                espera_limite_taxa_s=round(limitador.espera_total - espera_inicial, 3) if limitador is not None else None,
+                ufs=list(ufs_monitoradas), matcher_municipios=matcher_municipios,
+                janela_datas=janela.descricao() if janela is not None else None,
+                navegadores=getattr(coletor, 'estatisticas_navegadores', []),
+            )
+        except Exception as e:
+            print(f" Erro ao gravar o relatório do ciclo: {e}")
+    return total_noticias
 
-    print(f"Quantidade total de notícias únicas encontradas e processadas: {len(news)}")
 
-    if news:
+def servico(agendador, output_file, fabrica_coletor=criar_coletor, formato='xlsx', limitador=None, base=None,
+            buscador_artigos=None, agrupador=None, ufs=UFS_PADRAO, matcher='trie', max_ciclos=None, dormir=time.sleep,
+            acervo=None, janela=JANELA_PADRAO, resolvedor_links=None):
+    """
+    Modo serviço: fica rodando e busca cada termo de novo quando vence o seu intervalo (ver
+    `auxiliar.agendador`). O navegador, o matcher dos municípios e a base ficam carregados entre os
+    ciclos, e os links já vistos (e, com `agrupador`, o índice de quase duplicatas) também, então cada
+    ciclo exporta só as notícias novas (ver `executar_ciclo`). Todas as buscas passam por `limitador`.
+    Termina só com Ctrl-C ou depois de `max_ciclos` ciclos: erros em um termo ou ciclo são registrados
+    e os termos afetados são reagendados como falha. Uma `janela` relativa (últimos N dias) é
+    recalculada a cada ciclo.
+    """
+    global ufs_monitoradas, matcher_municipios
+    ufs_monitoradas = normalizar_ufs(ufs)
+    matcher_municipios = matcher
+    carregar_historico(base, agrupador)
+
+    if not len(agendador):
+        print("Modo serviço: nenhum termo agendado, nada a fazer.")
+        return
+    print(f"Modo serviço: {len(agendador)} termos agendados.")
+    coletor = fabrica_coletor()
+    ciclos = 0
+    try:
+        while max_ciclos is None or ciclos < max_ciclos:
+            proximo = agendador.proximo_horario()
+            if proximo is None:
+                print("Modo serviço: a agenda ficou vazia, encerrando.")
+                break
+            espera = proximo - agendador.relogio()
+            if espera > 0:
+                print(f"Próxima busca em {espera / 60:.1f} min." if espera >= 60 else f"Próxima busca em {espera:.0f} s.")
+                dormir(espera)
+            termos = agendador.vencidos()
+            if not termos:
+                continue
+            ciclos += 1
+            try:
+                executar_ciclo(
+                    ciclos, termos, agendador, coletor, output_file, formato, limitador, base, buscador_artigos,
+                    agrupador, acervo, janela, resolvedor_links
+                )
+            except Exception as e:
+                # Os termos retirados da fila e ainda não reagendados voltam como falha
+                print(f" Erro no ciclo {ciclos}: {e}")
+                for termo in termos:
+                    if termo not in agendador:
+                        agendador.reagendar(termo, sucesso=False)
+    except KeyboardInterrupt:
+        print("\nModo serviço interrompido.")
+    finally:
         try:
-            # Exporta os dados para um arquivo Excel
-            dfGoogle = pd.DataFrame(news)
-            excel_filename = f"{output_file}_{datetime.now().strftime('%Y-%m-%d_%H%M')}"
-            # Garante a extensão .xlsx
-            if not excel_filename.lower().endswith('.xlsx'):
-                excel_filename += '.xlsx'
-            dfProcessado = pos_processamento.processar_linhas(dfGoogle)
-            dfProcessado.to_excel(excel_filename, index=False)
-            print(f"✅ Dados exportados para '{excel_filename}'.")
+            coletor.fechar()
         except Exception as e:
-            print(f" Erro ao exportar dados para Excel: {e}")
+            print(f" Erro ao encerrar o coletor: {e}")
+        if base is not None:
+            base.salvar()
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -383,25 +678,277 @@ if __name__ == "__main__":
     )
     
     parser.add_argument(
-        "-t", "--termos", required=True,
-        help="Caminho para o arquivo .txt contendo um termo por linha"
+        "-t", "--termos", action="append",
+        help=("Caminho para o arquivo .txt contendo um termo por linha (no modo serviço pode ser repetido, "
+              "com todos os termos no intervalo de --intervalo)")
     )
     parser.add_argument(
         "-s", "--saida", required=True,
-        help="Prefixo do nome do arquivo de saída (não adicionar '.xlsx' e timestamp, será adicionado automaticamente)."
+        help="Prefixo do nome do arquivo de saída (não adicionar extensão e timestamp, serão adicionados automaticamente)."
+    )
+    parser.add_argument(
+        "-f", "--formato", choices=FORMATOS, default="xlsx",
+        help=("Formato do arquivo de saída: 'xlsx' (padrão), 'csv', 'jsonl' ou 'parquet' (diretório com um arquivo "
+              "por lote, requer pyarrow). As notícias são gravadas à medida que são processadas; no 'xlsx' elas vão "
+              "para '<arquivo>.xlsx.parcial.jsonl' e a planilha só é montada no fim (ou no Ctrl-C).")
+    )
+    parser.add_argument(
+        "-b", "--backend", choices=BACKENDS, default="selenium",
+        help=("Como obter as páginas de busca: 'selenium' (Chrome headless, padrão), 'http' (HTML via requests), "
+              "'rss' (feed RSS via requests) ou 'arquivos' (páginas salvas em --fixtures).")
+    )
+    parser.add_argument(
+        "--base-url", default=root_url,
+        help="URL base do Google News. Pode apontar para um servidor local em testes offline."
+    )
+    parser.add_argument(
+        "--fixtures",
+        help="Diretório com páginas de busca salvas (<termo>.html ou <termo>.xml), usado pelo backend 'arquivos'."
+    )
+    parser.add_argument(
+        "--parser", choices=list(PARSERS_HTML), default="html.parser",
+        help=("Parser das páginas de busca HTML: 'html.parser' (padrão) ou 'lxml' (bem mais rápido em páginas "
+              "grandes, requer pip install lxml).")
+    )
+    parser.add_argument(
+        "--max-scrolls", type=int, default=20,
+        help="Quantidade máxima de scrolls por termo no backend 'selenium' (padrão: 20)."
+    )
+    parser.add_argument(
+        "--tempo-max-termo", type=float, default=None,
+        help="Orçamento de tempo de scroll por termo, em segundos, no backend 'selenium' (padrão: sem limite)."
+    )
+    parser.add_argument(
+        "--desde",
+        help=("Só notícias publicadas a partir desta data ('aaaa-mm-dd' ou 'dd/mm/aaaa') ou dos últimos N dias "
+              "('7d'). A janela vai para a consulta do Google News e o scroll para ao passar dela "
+              "(padrão: a partir de 2023, só filtrando os itens).")
+    )
+    parser.add_argument(
+        "--ate",
+        help="Só notícias publicadas até esta data, inclusive ('aaaa-mm-dd' ou 'dd/mm/aaaa')."
+    )
+    parser.add_argument(
+        "--ufs", default=",".join(UFS_PADRAO),
+        help=("Siglas dos estados cujos municípios são procurados nas notícias, separadas por vírgula "
+              "(padrão: BA). Os municípios vêm de src/data/municipios.csv.")
+    )
+    parser.add_argument(
+        "--matcher", choices=MATCHERS, default="trie",
+        help=("Como encontrar os nomes dos municípios nos títulos: 'trie' (padrão, ignora acentos, sem spaCy) "
+              "ou 'spacy' (PhraseMatcher, requer o modelo do spaCy).")
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1,
+        help="Quantidade de sessões do Chrome rodando em paralelo, cada uma buscando um termo (padrão: 1)."
+    )
+    parser.add_argument(
+        "--processos-nlp", type=int, default=0, metavar="N",
+        help=("Identifica os municípios em N processos, cada um com o matcher (e o modelo do spaCy) carregado, em "
+              "paralelo com a coleta (padrão: 0, na própria thread principal).")
+    )
+    parser.add_argument(
+        "--fila-coleta", type=int, default=2, metavar="N",
+        help="Termos que a coleta pode buscar à frente do processamento (padrão: 2)."
+    )
+    parser.add_argument(
+        "-i", "--incremental", action="store_true",
+        help="Modo incremental: só processa notícias que ainda não estão na base persistente (--base)."
+    )
+    parser.add_argument(
+        "--base", default="noticias.sqlite3",
+        help="Arquivo SQLite com as notícias já processadas, usado no modo incremental (padrão: noticias.sqlite3)."
+    )
+    parser.add_argument(
+        "--exportar", choices=("delta", "completo"), default="delta",
+        help="No modo incremental, exporta só as notícias novas ('delta', padrão) ou a base inteira ('completo')."
+    )
+    parser.add_argument(
+        "--acervo", default="acervo.sqlite3",
+        help=("Acervo SQLite onde as linhas exportadas de todas as execuções são acumuladas, para consultas com "
+              "src/consultar_acervo.py (padrão: acervo.sqlite3).")
+    )
+    parser.add_argument(
+        "--sem-acervo", action="store_true",
+        help="Não acrescenta as linhas exportadas ao acervo."
+    )
+    parser.add_argument(
+        "--artigos", action="store_true",
+        help=("Baixa o texto completo das notícias novas (em paralelo) e o usa como contexto para identificar "
+              "os municípios citados. Os links do Google News são resolvidos para os sites antes do download "
+              "(ver --cache-links).")
+    )
+    parser.add_argument(
+        "--artigos-concorrencia", type=int, default=16,
+        help="Downloads simultâneos de notícias no total, com --artigos (padrão: 16)."
+    )
+    parser.add_argument(
+        "--artigos-por-host", type=int, default=4,
+        help="Downloads simultâneos de notícias por site, com --artigos (padrão: 4)."
+    )
+    parser.add_argument(
+        "--artigos-timeout", type=float, default=10,
+        help="Tempo máximo de cada download de notícia, em segundos (padrão: 10)."
+    )
+    parser.add_argument(
+        "--cache-artigos",
+        help="Diretório para guardar os textos das notícias já baixadas entre execuções."
+    )
+    parser.add_argument(
+        "--resolver-links", action="store_true",
+        help=("Troca os links do Google News pelos endereços das notícias nos sites (sem parâmetros de rastreamento "
+              "nem versões AMP), para a mesma notícia ser reconhecida em outros termos e execuções.")
+    )
+    parser.add_argument(
+        "--cache-links", default="links.sqlite3",
+        help="Arquivo SQLite com os links já resolvidos, com --resolver-links (padrão: links.sqlite3)."
+    )
+    parser.add_argument(
+        "--cache-links-ttl", type=float, default=30,
+        help="Validade dos links resolvidos, em dias (padrão: 30; 0 para não expirar)."
+    )
+    parser.add_argument(
+        "--links-concorrencia", type=int, default=8,
+        help="Links resolvidos simultaneamente, com --resolver-links (padrão: 8)."
+    )
+    parser.add_argument(
+        "--agrupar-duplicatas", action="store_true",
+        help=("Agrupa notícias quase iguais (a mesma matéria em vários sites ou termos): só a primeira de cada "
+              "grupo é processada e exportada, e as demais vão para '<saida>_<timestamp>.duplicatas.csv'.")
+    )
+    parser.add_argument(
+        "--limiar-duplicatas", type=float, default=0.7,
+        help="Similaridade (0 a 1) do título e conteúdo a partir da qual duas notícias são do mesmo grupo (padrão: 0.7)."
+    )
+    parser.add_argument(
+        "--reiniciar-navegador", type=int, default=50, metavar="N",
+        help="Reinicia o Chrome a cada N buscas, para a memória não crescer em execuções longas (padrão: 50; 0 desliga)."
+    )
+    parser.add_argument(
+        "--memoria-max-navegador", type=float, metavar="MB",
+        help="Reinicia o Chrome quando os seus processos passam deste uso de memória, em MB (requer `pip install psutil`)."
+    )
+    parser.add_argument(
+        "--tentativas", type=int, default=2,
+        help="Novas tentativas, com um navegador novo e espera crescente, quando o Chrome falha em uma busca (padrão: 2)."
+    )
+    parser.add_argument(
+        "--carregar-recursos", action="store_true",
+        help="Deixa o Chrome baixar imagens, fontes e mídia (por padrão são bloqueadas, deixando as páginas mais leves)."
+    )
+    parser.add_argument(
+        "--cache",
+        help=("Diretório do cache de páginas (buscas e notícias baixadas, comprimidas). Páginas válidas no cache "
+              "são usadas no lugar de um novo acesso.")
+    )
+    parser.add_argument(
+        "--cache-ttl", type=float, default=24,
+        help="Validade das páginas no cache, em horas (padrão: 24; 0 para não expirar)."
+    )
+    parser.add_argument(
+        "--cache-max-mb", type=float, default=1024,
+        help="Tamanho máximo do cache; as páginas usadas há mais tempo são removidas (padrão: 1024 MB; 0 sem limite)."
+    )
+    parser.add_argument(
+        "--offline", "--replay", action="store_true",
+        help=("Refaz a execução só com as páginas do --cache (mesmo expiradas), sem navegador nem rede, "
+              "para testar mudanças nas regras de extração.")
+    )
+    parser.add_argument(
+        "--checkpoints", default="checkpoints",
+        help=("Diretório dos checkpoints: cada termo concluído é salvo para que uma execução interrompida possa ser "
+              "retomada (padrão: checkpoints). O checkpoint é apagado quando a execução termina sem erros.")
+    )
+    parser.add_argument(
+        "--resume", metavar="RUN_ID",
+        help="Retoma a execução interrompida RUN_ID (mostrado no início de cada execução), pulando os termos já concluídos."
+    )
+    parser.add_argument(
+        "--servico", action="store_true",
+        help=("Modo serviço: fica rodando com o navegador aberto e busca cada termo de novo quando vence o seu "
+              "intervalo (--agenda ou -t com --intervalo), exportando a cada ciclo só as notícias novas.")
+    )
+    parser.add_argument(
+        "--agenda",
+        help="Agenda JSON do modo serviço, com o intervalo e a prioridade de cada termo ou arquivo de termos."
+    )
+    parser.add_argument(
+        "--intervalo", type=float, default=60,
+        help="No modo serviço, intervalo em minutos dos termos passados com -t (padrão: 60)."
+    )
+    parser.add_argument(
+        "--requisicoes-por-minuto", type=float, default=4,
+        help="No modo serviço, máximo de buscas por minuto somando todos os termos (padrão: 4)."
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=5,
+        help="No modo serviço, espera aleatória de até N segundos antes de cada busca (padrão: 5)."
+    )
+    parser.add_argument(
+        "--max-ciclos", type=int,
+        help="Encerra o modo serviço depois de N ciclos (padrão: roda até Ctrl-C)."
+    )
+    parser.add_argument(
+        "--relatorio",
+        help="Caminho do relatório JSON da execução (padrão: '<saida>_<timestamp>.relatorio.json')."
+    )
+    parser.add_argument(
+        "--profile",
+        help="Grava um perfil do cProfile da execução neste arquivo (abrir com pstats ou snakeviz)."
+    )
+    parser.add_argument(
+        "--log-nivel", choices=("DEBUG", "INFO", "WARNING", "ERROR"), default="INFO",
+        help="Nível das mensagens por notícia: INFO (padrão) mostra cada notícia; WARNING mostra só avisos e erros."
     )
     
     args = parser.parse_args()
     errors = False
+    if not args.termos and not (args.servico and args.agenda):
+        parser.error("informe o arquivo de termos (-t) ou, no modo serviço, a agenda (--agenda).")
+    if not args.servico and (args.agenda or len(args.termos) > 1):
+        parser.error("--agenda e mais de um -t só valem no modo serviço (--servico).")
+    if args.servico and args.resume:
+        parser.error("--resume não vale no modo serviço: use o modo incremental (-i) para não repetir notícias.")
+    if args.servico and args.requisicoes_por_minuto <= 0:
+        parser.error("--requisicoes-por-minuto deve ser positivo.")
+    try:
+        args.ufs = normalizar_ufs(args.ufs)
+    except ValueError as e:
+        parser.error(str(e))
+    janela = JANELA_PADRAO
+    if args.desde or args.ate:
+        try:
+            janela = JanelaDatas.da_linha_de_comando(args.desde or JANELA_PADRAO.desde.isoformat(), args.ate)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.offline and not args.cache:
+        parser.error("--offline/--replay exige o diretório do cache de páginas (--cache).")
+    if args.resume and not os.path.exists(caminho_checkpoint(args.checkpoints, args.resume)):
+        parser.error(f"Checkpoint da execução '{args.resume}' não encontrado em '{args.checkpoints}'.")
 
-    search_terms_txt = args.termos
+    logging.basicConfig(level=args.log_nivel, format='%(message)s')
+
+    search_terms_txt = args.termos[0] if args.termos else args.agenda
     output_file = args.saida
 
     try:
-        with open(search_terms_txt, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f if line.strip()]
-    except FileNotFoundError:
-        print(f"Arquivo de termos não encontrado: {search_terms_txt}")
+        if args.servico:
+            termos_agendados = carregar_agenda(args.agenda) if args.agenda else []
+            agendados = {termo.palavra for termo in termos_agendados}
+            for search_terms_txt in args.termos or []:
+                termos_agendados.extend(
+                    TermoAgendado(palavra, args.intervalo * 60, PRIORIDADE_PADRAO)
+                    for palavra in ler_termos(search_terms_txt) if palavra not in agendados
+                )
+                agendados.update(termo.palavra for termo in termos_agendados)
+            if not termos_agendados:
+                print("Nenhum termo para o modo serviço: a agenda e os arquivos de termos estão vazios.")
+                errors=True
+                sys.exit(1)
+        else:
+            lines = ler_termos(search_terms_txt)
+    except FileNotFoundError as e:
+        print(f"Arquivo de termos não encontrado: {e.filename}")
         errors=True
         sys.exit(1)
     except Exception as e:
@@ -410,4 +957,91 @@ if __name__ == "__main__":
         sys.exit(1)
         
     if not errors:
-        main(lines, output_file)
\ No newline at end of file
+        cache = None
+        if args.cache:
+            cache = CachePaginas(
+                args.cache, ttl=args.cache_ttl * 3600 if args.cache_ttl > 0 else None,
+                tamanho_maximo=int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb > 0 else None
+            )
+        fabrica_coletor = functools.partial(
+            criar_coletor, args.backend, base_url=args.base_url, diretorio_fixtures=args.fixtures,
+            max_scrolls=args.max_scrolls, tempo_limite=args.tempo_max_termo, parser_html=args.parser,
+            cache=cache, offline=args.offline, max_consultas_navegador=args.reiniciar_navegador or None,
+            memoria_max_navegador=args.memoria_max_navegador, bloquear_recursos=not args.carregar_recursos,
+            tentativas=max(0, args.tentativas),
+            # A janela padrão só filtra os itens: a consulta (e a chave do cache de páginas) fica como antes
+            janela=janela if janela is not JANELA_PADRAO else None
+        )
+        base = BaseNoticias(args.base) if args.incremental else None
+        resolvedor_links = None
+        # --artigos também resolve os links, para baixar a notícia no site e não a página do Google
+        if args.resolver_links or args.artigos:
+            resolvedor_links = ResolvedorLinks(
+                args.cache_links, ttl=args.cache_links_ttl * 24 * 3600 if args.cache_links_ttl > 0 else None,
+                base_url=args.base_url, concorrencia=max(1, args.links_concorrencia), offline=args.offline
+            )
+        buscador_artigos = None
+        if args.artigos:
+            buscador_artigos = BuscadorArtigos(
+                concorrencia_total=max(1, args.artigos_concorrencia), concorrencia_por_host=max(1, args.artigos_por_host),
+                timeout=args.artigos_timeout, diretorio_cache=args.cache_artigos,
+                cache_paginas=cache, offline=args.offline, resolvedor_links=resolvedor_links
+            )
+        # Os links das notícias exportadas só são trocados com --resolver-links
+        links_canonicos = resolvedor_links if args.resolver_links else None
+        agrupador = AgrupadorDuplicatas(limiar=args.limiar_duplicatas) if args.agrupar_duplicatas else None
+        acervo = None if args.sem_acervo else AcervoNoticias(args.acervo)
+        if args.servico:
+            try:
+                servico(
+                    Agendador(termos_agendados), output_file, fabrica_coletor=fabrica_coletor, formato=args.formato,
+                    limitador=LimitadorTaxa(args.requisicoes_por_minuto, jitter=max(0, args.jitter)), base=base,
+                    buscador_artigos=buscador_artigos, agrupador=agrupador, ufs=args.ufs, matcher=args.matcher,
+                    max_ciclos=args.max_ciclos, acervo=acervo, janela=janela, resolvedor_links=links_canonicos
+                )
+            finally:
+                if base is not None:
+                    base.fechar()
+                if acervo is not None:
+                    acervo.fechar()
+                if buscador_artigos is not None:
+                    buscador_artigos.fechar()
+                if resolvedor_links is not None:
+                    resolvedor_links.fechar()
+                if cache is not None:
+                    cache.fechar()
+            sys.exit(0)
+        checkpoint = CheckpointExecucao(args.checkpoints, args.resume or novo_run_id())
+        print(f"Execução {checkpoint.run_id} (se for interrompida, retome com --resume {checkpoint.run_id}).")
+        concluida = False
+        profiler = None
+        if args.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            main(lines, output_file, workers=max(1, args.workers), fabrica_coletor=fabrica_coletor,
+                 base=base, exportar=args.exportar, formato=args.formato, caminho_relatorio=args.relatorio,
+                 buscador_artigos=buscador_artigos, agrupador=agrupador, checkpoint=checkpoint,
+                 ufs=args.ufs, matcher=args.matcher, acervo=acervo, processos_nlp=max(0, args.processos_nlp),
+                 tamanho_fila=max(0, args.fila_coleta), janela=janela, resolvedor_links=links_canonicos)
+            concluida = True
+        finally:
+            if concluida:
+                checkpoint.remover()
+            else:
+                checkpoint.fechar()
+            if base is not None:
+                base.fechar()
+            if acervo is not None:
+                acervo.fechar()
+            if buscador_artigos is not None:
+                buscador_artigos.fechar()
+            if resolvedor_links is not None:
+                resolvedor_links.fechar()
+            if cache is not None:
+                cache.fechar()
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(args.profile)
+                print(f"Perfil do cProfile gravado em '{args.profile}'.")
\ No newline at end of file